@@ -9,12 +9,14 @@ import os
 from app.extensions import db, migrate, cors
 
 
-def create_app(config_name=None):
+def create_app(config_name=None, overrides=None):
     """
     Application factory function to create and configure Flask app
     
     Args:
         config_name (str): Configuration name (development, production, testing)
+        overrides (dict): Settings applied on top of the named configuration,
+            for this application only (tests and benchmarks)
         
     Returns:
         Flask: Configured Flask application instance
@@ -27,9 +29,20 @@ def create_app(config_name=None):
     
     from config import config
     app.config.from_object(config[config_name])
+    if overrides:
+        app.config.update(overrides)
     
-    # Initialize extensions with app
+    # orjson-backed JSON encoding with byte-identical stdlib fallback
+    if app.config['FAST_JSON_ENABLED']:
+        from app.serialization import FastJSONProvider
+        app.json = FastJSONProvider(app)
+
+    # Initialize extensions with app; SQLite file databases get the
+    # connection profile (pragmas and pool sizing) from app.sqlite_profile
+    from app.sqlite_profile import init_engine_options, init_sqlite_profile
+    init_engine_options(app)
     db.init_app(app)
+    init_sqlite_profile(app)
     migrate.init_app(app, db)
     
     # Configure CORS with settings from config
@@ -38,11 +51,49 @@ def create_app(config_name=None):
         origins=app.config['CORS_ORIGINS'],
         methods=app.config['CORS_METHODS'],
         allow_headers=app.config['CORS_HEADERS'],
+        expose_headers=app.config['CORS_EXPOSE_HEADERS'],
         supports_credentials=True
     )
     
     # Import models to register them with SQLAlchemy
     from app import models
+
+    # Register write-generation tracking used to invalidate derived data
+    from app import generation  # noqa: F401
+
+    # Per-process cache for the 'cached' task count strategy
+    from app.counting import CountCache
+    app.extensions['task_count_cache'] = CountCache(app.config['TASK_COUNT_CACHE_SIZE'])
+
+    # Per-process cache of task listing responses (TASK_RESULT_CACHE_ENABLED)
+    from app.cache import ResultCache
+    app.extensions['task_result_cache'] = ResultCache(
+        app.config['TASK_RESULT_CACHE_MAX_BYTES']
+    )
+
+    # Tasks spread over SQLALCHEMY_SHARD_URIS by id
+    from app.sharding import init_sharding
+    init_sharding(app)
+
+    # Optional single writer thread with group commit (WRITE_PIPELINE_ENABLED)
+    from app.writer import init_write_pipeline
+    init_write_pipeline(app)
+
+    # Stored responses replayed for repeated Idempotency-Key requests
+    from app.idempotency import init_idempotency
+    init_idempotency(app)
+
+    # Thread pool for async=true bulk requests, resuming unfinished jobs
+    from app.jobs import init_jobs
+    init_jobs(app)
+
+    # Route GET requests to read replicas, pinning writers to the primary
+    from app.replicas import init_replicas
+    init_replicas(app)
+
+    # Negotiated gzip/brotli compression of API responses
+    from app.compression import init_compression
+    init_compression(app)
     
     # Register blueprints
     from app.api import api_bp
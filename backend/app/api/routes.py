@@ -5,12 +5,51 @@ This module implements all the RESTful API endpoints for task management
 according to the API contract specifications in parallel_dev_sync.md
 """
 
-from flask import request, jsonify
+from flask import request, jsonify, current_app, Response, stream_with_context, url_for
 from datetime import datetime
-from sqlalchemy import or_, desc, asc
+from functools import wraps
+from itertools import islice
+from operator import attrgetter
+from sqlalchemy import desc, asc, select
 from app.api import api_bp
-from app.models import Task
+from app.models import Job, Task
 from app.extensions import db
+from app.conditional import (
+    make_etag, task_etag, is_not_modified, set_validators, not_modified_response,
+    precondition_failed
+)
+from app.bulk import (
+    chunked, delete_task_row, delete_tasks, id_in, insert_tasks, iter_id_chunks,
+    new_task_values, task_update_values, update_task_row, update_tasks
+)
+from app.counting import (
+    APPROXIMATE_COUNT_STRATEGIES, COUNT_STRATEGIES, count_exact, count_tasks
+)
+from app.generation import current_generation
+from app.idempotency import (
+    IDEMPOTENCY_HEADER, MAX_KEY_LENGTH, REPLAYED_HEADER, IdempotencyInProgress,
+    IdempotencyKeyReused, request_fingerprint
+)
+from app.export import EXPORT_FORMATS, export_statement, stream_export
+from app.filters import (
+    InvalidFieldsError, parse_task_filters, apply_task_filters, filter_key,
+    parse_task_fields
+)
+from app.pagination import (
+    InvalidCursorError, encode_cursor, decode_cursor, apply_keyset
+)
+from app.reads import select_tasks, fetch_task, task_row_dict
+from app.replicas import read_from_primary
+from app.routing import SHARD_BIND
+from app.search import highlight_tasks
+from app.serialization import is_compact, encode_object, serialize_tasks
+from app.sharding import SHARD_INDEX, merge_sorted, next_task_id, shard_of, sum_counts
+from app.stats import build_task_stats, compute_task_stats, read_counters
+from app.timeseries import (
+    TIMESERIES_BUCKETS, MAX_TIMESERIES_POINTS, compute_timeseries, parse_timestamp,
+    timeseries_range
+)
+from app.writer import run_write
 
 
 @api_bp.route('/health', methods=['GET'])
@@ -25,6 +64,41 @@ def health_check():
     })
 
 
+@api_bp.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """
+    GET /api/cache/stats - Size and hit/miss/eviction counters of this
+    process's task listing result cache
+    """
+    stats = current_app.extensions['task_result_cache'].stats()
+    stats['enabled'] = current_app.config['TASK_RESULT_CACHE_ENABLED']
+    return jsonify({"task_results": stats})
+
+
+@api_bp.route('/replicas/stats', methods=['GET'])
+def replica_stats():
+    """
+    GET /api/replicas/stats - Lag of each read replica behind the primary
+    (seconds and write generations), measured now, and read counters
+    """
+    router = current_app.extensions.get('replica_router')
+    if router is None:
+        return jsonify({"replication": {"enabled": False, "replicas": []}})
+
+    try:
+        router.check()
+        stats = router.stats()
+        stats['enabled'] = True
+        return jsonify({"replication": stats})
+
+    except Exception:
+        return create_error_response(
+            "INTERNAL_ERROR",
+            "An error occurred while measuring replica lag",
+            status_code=500
+        )
+
+
 def create_error_response(code, message, details=None, status_code=400):
     """
     Create standardized error response
@@ -67,6 +141,154 @@ def create_success_response(data, meta=None):
     return response
 
 
+# Endpoints that work with sharded tasks; the others need a single tasks table
+SHARD_AWARE_ENDPOINTS = {
+    'api.health_check', 'api.cache_stats', 'api.replica_stats', 'api.get_tasks',
+    'api.create_task', 'api.get_task', 'api.update_task', 'api.patch_task',
+    'api.delete_task', 'api.get_task_stats', 'api.get_job'
+}
+
+
+@api_bp.before_request
+def reject_unsharded_endpoints():
+    """
+    Answer endpoints that cannot span shards with 501 while tasks are sharded
+    """
+    sharded = 'task_shards' in current_app.extensions
+    if sharded and request.endpoint not in SHARD_AWARE_ENDPOINTS:
+        return create_error_response(
+            "NOT_SUPPORTED_WITH_SHARDING",
+            f"{request.method} {request.path} is not available while tasks are sharded",
+            status_code=501
+        )
+
+
+def on_task_shard(view):
+    """
+    Run a task view against the shard its task lives on when tasks are sharded
+
+    Views taking a task_id run on the shard owning the id (404 if no shard
+    does); task creation runs on the next shard in turn. Every statement the
+    view sends through db.session goes to that shard. Without sharding the
+    view runs unchanged.
+
+    Args:
+        view: View function to wrap
+
+    Returns:
+        function: Wrapped view
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        shards = current_app.extensions.get('task_shards')
+        if shards is None:
+            return view(*args, **kwargs)
+
+        task_id = kwargs.get('task_id')
+        shard = shards.next_shard() if task_id is None else shard_of(task_id)
+        if shard >= len(shards):
+            return create_error_response(
+                "TASK_NOT_FOUND",
+                f"Task with id {task_id} not found",
+                status_code=404
+            )
+
+        db.session.info[SHARD_BIND] = shards.engines[shard]
+        db.session.info[SHARD_INDEX] = shard
+        try:
+            return view(*args, **kwargs)
+        finally:
+            db.session.info.pop(SHARD_BIND, None)
+            db.session.info.pop(SHARD_INDEX, None)
+
+    return wrapper
+
+
+def _tasks_generation():
+    """
+    Write generation of the tasks table, combined over the shards when sharded
+
+    Returns:
+        tuple: (generation, updated_at) as from current_generation
+    """
+    shards = current_app.extensions.get('task_shards')
+    if shards is None:
+        return current_generation(db.session)
+    return shards.generation()
+
+
+def idempotent(view):
+    """
+    Make a write endpoint safe to retry with an Idempotency-Key header
+
+    The first request with a key runs the view and its response (unless
+    5xx) is stored; repeats of the same request get that response back with
+    Idempotent-Replayed: true, waiting for the first one if it is still
+    running. Reusing a key for a different request is a 422.
+
+    Args:
+        view: View function to wrap
+
+    Returns:
+        function: Wrapped view
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return view(*args, **kwargs)
+
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return create_error_response(
+                "INVALID_IDEMPOTENCY_KEY",
+                f"{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters",
+                status_code=400
+            )
+
+        store = current_app.extensions['idempotency_store']
+        scope = f"{request.method} {request.path}"
+        fingerprint = request_fingerprint(request)
+        try:
+            stored = store.claim(db.session, scope, key, fingerprint)
+        except IdempotencyKeyReused:
+            return create_error_response(
+                "IDEMPOTENCY_KEY_REUSED",
+                f"{IDEMPOTENCY_HEADER} was already used for a different request",
+                status_code=422
+            )
+        except IdempotencyInProgress:
+            return create_error_response(
+                "IDEMPOTENCY_IN_PROGRESS",
+                f"A request with this {IDEMPOTENCY_HEADER} is still being processed",
+                status_code=409
+            )
+
+        if stored is not None:
+            response = current_app.response_class(
+                stored.body, status=stored.status_code, headers=stored.headers
+            )
+            response.headers[REPLAYED_HEADER] = 'true'
+            return response
+
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+        except Exception:
+            store.abandon(db.session, scope, key)
+            raise
+
+        if response.status_code >= 500 or response.is_streamed:
+            store.abandon(db.session, scope, key)
+        else:
+            store.complete(db.session, scope, key, fingerprint, response)
+        return response
+
+    return wrapper
+
+
+# Task fields a request may set (version is a precondition, not a value)
+UPDATABLE_FIELDS = ('title', 'description', 'priority', 'completed')
+
+
 def validate_task_data(data, required_fields=None):
     """
     Validate task data according to API contract
@@ -105,6 +327,10 @@ def validate_task_data(data, required_fields=None):
     if 'completed' in data and not isinstance(data['completed'], bool):
         errors['completed'] = "Completed must be a boolean value"
     
+    # Validate version (if present)
+    if 'version' in data and (type(data['version']) is not int or data['version'] < 1):
+        errors['version'] = "Version must be a positive integer"
+
     return len(errors) == 0, errors
 
 
@@ -116,31 +342,68 @@ def get_tasks():
     Query Parameters:
         completed: 'true' or 'false' - Filter by completion status
         priority: 'High', 'Medium', or 'Low' - Filter by priority
-        search: string - Search in title and description
-        sort: 'created_at', 'updated_at', 'title', 'priority' - Sort field
+        search: string - Full-text search in title and description (prefix match)
+        highlight: 'true' - Add title/description snippets when searching, as
+            escaped HTML with matches wrapped in <mark>
+        sort: 'created_at', 'updated_at', 'title', 'priority', 'relevance' - Sort
+            field; 'relevance' requires search and always returns best matches first
         order: 'asc' or 'desc' - Sort order
         limit: int - Max items to return (default: 100)
         offset: int - Pagination offset (default: 0)
+        cursor: string - Opt-in keyset pagination; pass an empty value for the
+            first page, then the previous response's next_cursor
+        count: 'exact', 'estimated', 'cached' or 'none' - How pagination.total
+            is produced (default: 'exact', or 'none' in cursor mode);
+            pagination.count_strategy reports the strategy actually used
+        fields: string - Comma-separated sparse fieldset, e.g. 'id,title,completed';
+            only these columns are loaded and serialized
+
+    Responses carry ETag and Last-Modified derived from the tasks write
+    generation; a matching If-None-Match is answered with 304. The ETag is
+    weak with the estimated and cached counts, whose total and reported
+    strategy can change without a write.
+
+    With sharding every shard is queried in parallel and the pages merged
+    (see _get_tasks_page_from_shards); relevance sort and highlight are not
+    available.
     """
     try:
         # Parse query parameters
-        completed_filter = request.args.get('completed')
-        priority_filter = request.args.get('priority')
-        search_query = request.args.get('search', '').strip()
+        filters = parse_task_filters(request.args)
+        fields = parse_task_fields(request.args.get('fields'))
+        search_query = filters['search']
         sort_field = request.args.get('sort', 'created_at')
         sort_order = request.args.get('order', 'desc')
+        cursor = request.args.get('cursor')
+        highlight = request.args.get('highlight', 'false').lower() == 'true'
+        default_count = 'none' if cursor is not None else 'exact'
+        count_strategy = request.args.get('count', default_count)
         
         # Handle pagination parameters
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', request.args.get('limit', 100)))
         limit = per_page
-        offset = (page - 1) * per_page if page > 0 else 0
         
         # Validate parameters
-        if sort_field not in ['created_at', 'updated_at', 'title', 'priority']:
+        sort_fields = ['created_at', 'updated_at', 'title', 'priority', 'relevance']
+        if sort_field not in sort_fields:
+            return create_error_response(
+                "INVALID_SORT_FIELD",
+                f"Sort field must be one of: {', '.join(sort_fields)}",
+                status_code=400
+            )
+
+        if sort_field == 'relevance' and not search_query:
             return create_error_response(
                 "INVALID_SORT_FIELD",
-                "Sort field must be one of: created_at, updated_at, title, priority",
+                "Relevance sort requires a search query",
+                status_code=400
+            )
+
+        if sort_field == 'relevance' and cursor is not None:
+            return create_error_response(
+                "INVALID_CURSOR",
+                "Cursor pagination is not available for relevance sort",
                 status_code=400
             )
         
@@ -158,65 +421,99 @@ def get_tasks():
                 status_code=400
             )
         
-        # Build query
-        query = Task.query
+        if count_strategy not in COUNT_STRATEGIES:
+            return create_error_response(
+                "INVALID_COUNT_STRATEGY",
+                "Count must be one of: exact, estimated, cached, none",
+                status_code=400
+            )
         
-        # Apply filters
-        if completed_filter is not None:
-            if completed_filter.lower() == 'true':
-                query = query.filter(Task.completed == True)
-            elif completed_filter.lower() == 'false':
-                query = query.filter(Task.completed == False)
+        shards = current_app.extensions.get('task_shards')
+        if shards is not None and (sort_field == 'relevance' or highlight):
+            return create_error_response(
+                "NOT_SUPPORTED_WITH_SHARDING",
+                "Relevance sort and highlights are not available "
+                "while tasks are sharded",
+                status_code=400
+            )
         
-        if priority_filter and priority_filter in ['High', 'Medium', 'Low']:
-            query = query.filter(Task.priority == priority_filter)
+        # Every listing is a function of its parameters and the tasks generation
+        listing_key = (
+            filter_key(filters), tuple(fields) if fields else None, sort_field,
+            sort_order, page, per_page, cursor, highlight, count_strategy
+        )
+        generation, last_modified = _tasks_generation()
+        etag = make_etag('tasks', generation, listing_key)
+        weak = count_strategy in APPROXIMATE_COUNT_STRATEGIES
+        if is_not_modified(etag, last_modified):
+            return not_modified_response(etag, last_modified, weak)
         
-        if search_query:
-            search_pattern = f"%{search_query}%"
-            query = query.filter(or_(
-                Task.title.ilike(search_pattern),
-                Task.description.ilike(search_pattern)
-            ))
+        # Serve repeated listings from the result cache until the next write
+        result_cache = None
+        if current_app.config['TASK_RESULT_CACHE_ENABLED']:
+            result_cache = current_app.extensions['task_result_cache']
+            body = result_cache.get(listing_key, generation)
+            if body is not None:
+                response = current_app.response_class(body, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return set_validators(response, etag, last_modified, weak)
+
+        if shards is not None:
+            response = _get_tasks_page_from_shards(
+                shards, filters, fields, sort_field, sort_order, cursor, page, per_page,
+                count_strategy
+            )
+            if result_cache is not None:
+                result_cache.set(listing_key, generation, response.get_data())
+                response.headers['X-Cache'] = 'MISS'
+            return set_validators(response, etag, last_modified, weak)
+
+        # Build query and apply filters
+        dialect_name = db.session.get_bind().dialect.name
+        # Select only the requested columns (plus the sort key cursors need)
+        sort_key = () if sort_field == 'relevance' else (sort_field,)
+        query, rank_order = apply_task_filters(
+            select_tasks(fields, extra=sort_key), filters, dialect_name,
+            rank=(sort_field == 'relevance')
+        )
+        highlight_query = search_query if highlight else None
         
         # Get total count before pagination
-        total_count = query.count()
+        total_count, count_used = count_tasks(
+            db.session, query, count_strategy, filters,
+            cache=current_app.extensions['task_count_cache'],
+            key=filter_key(filters)
+        )
         
-        # Apply sorting
-        sort_column = getattr(Task, sort_field)
-        if sort_order == 'desc':
-            query = query.order_by(desc(sort_column))
+        if cursor is not None:
+            pinned = sort_field == 'priority' and filters['priority'] is not None
+            response = _get_tasks_page_by_cursor(
+                query, sort_field, sort_order, cursor, limit, pinned, highlight_query,
+                total_count, count_used, fields
+            )
         else:
-            query = query.order_by(asc(sort_column))
-        
-        # Apply pagination
-        query = query.offset(offset).limit(limit)
-        
-        # Execute query
-        tasks = query.all()
-        
-        # Prepare response
-        task_list = [task.to_dict() for task in tasks]
-        
-        # Calculate pagination info
-        current_page = page
-        total_pages = (total_count + per_page - 1) // per_page if per_page > 0 else 1
-        has_next = current_page < total_pages
-        has_prev = current_page > 1
-        
-        response_data = {
-            "tasks": task_list,
-            "pagination": {
-                "total": total_count,
-                "page": current_page,
-                "per_page": per_page,
-                "pages": total_pages,
-                "has_next": has_next,
-                "has_prev": has_prev
-            }
-        }
+            response = _get_tasks_page_by_offset(
+                query, sort_field, sort_order, rank_order, page, per_page,
+                highlight_query, total_count, count_used, fields
+            )
         
-        return jsonify(response_data)
+        if result_cache is not None:
+            result_cache.set(listing_key, generation, response.get_data())
+            response.headers['X-Cache'] = 'MISS'
+        return set_validators(response, etag, last_modified, weak)
         
+    except InvalidCursorError as e:
+        return create_error_response(
+            "INVALID_CURSOR",
+            str(e),
+            status_code=400
+        )
+    except InvalidFieldsError as e:
+        return create_error_response(
+            "INVALID_FIELDS",
+            str(e),
+            status_code=400
+        )
     except ValueError as e:
         return create_error_response(
             "INVALID_PARAMETER",
@@ -232,7 +529,328 @@ def get_tasks():
         )
 
 
+def _serialize_task_page(tasks, highlight_query=None, fields=None):
+    """
+    Convert a page of tasks to dictionaries, optionally with search highlights
+
+    Args:
+        tasks (list): Task rows of the current page
+        highlight_query (str): Search string to highlight, or None
+        fields (list): Sparse fieldset to serialize, or None for every field
+
+    Returns:
+        list: Task dictionaries
+    """
+    task_list = [task_row_dict(task, fields) for task in tasks]
+
+    if highlight_query:
+        dialect_name = db.session.get_bind().dialect.name
+        highlights = highlight_tasks(
+            db.session, [task.id for task in tasks], highlight_query, dialect_name
+        )
+        for task, task_dict in zip(tasks, task_list):
+            task_dict['highlight'] = highlights.get(task.id)
+
+    return task_list
+
+
+def _task_page_response(tasks, pagination, highlight_query=None, fields=None):
+    """
+    Build the JSON response for a page of tasks
+
+    Without highlights, and when the JSON provider writes compact output,
+    tasks are encoded straight from their attributes by serialize_tasks;
+    otherwise they go through task_row_dict and jsonify. Both yield the same bytes.
+
+    Args:
+        tasks (list): Task rows of the current page
+        pagination (dict): Pagination block of the response
+        highlight_query (str): Search string to highlight, or None
+        fields (list): Sparse fieldset to serialize, or None for every field
+
+    Returns:
+        Response: JSON response with tasks and pagination
+    """
+    if highlight_query or not is_compact(current_app.json):
+        return jsonify({
+            "tasks": _serialize_task_page(tasks, highlight_query, fields),
+            "pagination": pagination
+        })
+
+    body = encode_object(current_app.json, {
+        "tasks": serialize_tasks(tasks, fields),
+        "pagination": pagination
+    })
+    return current_app.response_class(body + b'\n', mimetype='application/json')
+
+
+def _get_tasks_page_by_offset(query, sort_field, sort_order, rank_order, page, per_page,
+                              highlight_query=None, total_count=None, count_used='none',
+                              fields=None):
+    """
+    Fetch one page/per_page page of an already filtered task query
+
+    One extra row is fetched to detect a next page without relying on a
+    (possibly estimated or missing) total.
+
+    Args:
+        query: Filtered task select
+        sort_field (str): Validated sort field, or 'relevance'
+        sort_order (str): 'asc' or 'desc'
+        rank_order: Relevance ordering from apply_task_filters, or None
+        page (int): 1-based page number
+        per_page (int): Page size
+        highlight_query (str): Search string to highlight, or None
+        total_count (int): Total produced by the requested count strategy
+        count_used (str): Count strategy that produced total_count
+        fields (list): Sparse fieldset to serialize, or None for every field
+
+    Returns:
+        Response: JSON response with tasks and page pagination info
+    """
+    offset = (page - 1) * per_page if page > 0 else 0
+
+    # Apply sorting
+    if sort_field == 'relevance':
+        # Backends without a full-text index cannot rank; newest first instead
+        if rank_order is not None:
+            query = query.order_by(rank_order, desc(Task.id))
+        else:
+            query = query.order_by(desc(Task.created_at), desc(Task.id))
+    else:
+        sort_column = getattr(Task, sort_field)
+        if sort_order == 'desc':
+            query = query.order_by(desc(sort_column))
+        else:
+            query = query.order_by(asc(sort_column))
+
+    # Execute query
+    tasks = db.session.execute(query.offset(offset).limit(per_page + 1)).all()
+    has_next = len(tasks) > per_page
+    tasks = tasks[:per_page]
+
+    # Calculate pagination info
+    if total_count is None:
+        total_pages = None
+    else:
+        total_pages = (total_count + per_page - 1) // per_page if per_page > 0 else 1
+
+    pagination = {
+        "total": total_count,
+        "count_strategy": count_used,
+        "page": page,
+        "per_page": per_page,
+        "pages": total_pages,
+        "has_next": has_next,
+        "has_prev": page > 1
+    }
+    return _task_page_response(tasks, pagination, highlight_query, fields)
+
+
+def _get_tasks_page_by_cursor(query, sort_field, sort_order, cursor, limit,
+                              pinned=False, highlight_query=None, total_count=None,
+                              count_used='none', fields=None):
+    """
+    Fetch one keyset page of an already filtered task query
+
+    Rows are ordered by (sort_field, id) and one extra row is fetched to
+    detect whether another page exists. By default no total is counted, so
+    the cost of a page does not depend on how deep it is.
+
+    Args:
+        query: Filtered task select
+        sort_field (str): Validated sort field
+        sort_order (str): 'asc' or 'desc'
+        cursor (str): Cursor from a previous page, or '' for the first page
+        limit (int): Page size
+        pinned (bool): Whether a filter fixes the sort field to one value
+        highlight_query (str): Search string to highlight, or None
+        total_count (int): Total produced by the requested count strategy
+        count_used (str): Count strategy that produced total_count
+        fields (list): Sparse fieldset to serialize, or None for every field
+
+    Returns:
+        Response: JSON response with tasks and cursor pagination info
+    """
+    sort_column = getattr(Task, sort_field)
+    position = None
+    if cursor:
+        is_datetime = sort_field in ('created_at', 'updated_at')
+        position = decode_cursor(cursor, sort_field, sort_order, is_datetime)
+
+    query = apply_keyset(query, sort_column, Task.id, sort_order, position, pinned)
+    tasks = db.session.execute(query.limit(limit + 1)).all()
+
+    has_next = len(tasks) > limit
+    tasks = tasks[:limit]
+    next_cursor = encode_cursor(tasks[-1], sort_field, sort_order) if has_next else None
+
+    pagination = {
+        "mode": "cursor",
+        "total": total_count,
+        "count_strategy": count_used,
+        "per_page": limit,
+        "next_cursor": next_cursor,
+        "has_next": has_next,
+        "has_prev": bool(cursor)
+    }
+    return _task_page_response(tasks, pagination, highlight_query, fields)
+
+
+def _get_tasks_page_from_shards(shards, filters, fields, sort_field, sort_order, cursor,
+                                page, per_page, count_strategy):
+    """
+    Fetch one page of tasks from every shard in parallel and merge them
+
+    Each shard returns its rows ordered by (sort_field, id), up to the end
+    of the page plus one row, and a k-way merge of those runs yields the
+    page. Offset pages thus read offset + per_page rows from every shard;
+    cursor pages cost the same at any depth. Totals are summed; the 'cached'
+    strategy keeps one count per shard.
+
+    Args:
+        shards (ShardSet): The task shards
+        filters (dict): Normalized filters
+        fields (list): Sparse fieldset, or None for every field
+        sort_field (str): Validated sort field other than 'relevance'
+        sort_order (str): 'asc' or 'desc'
+        cursor (str): Cursor from a previous page, '' for the first, or
+            None for page/per_page pagination
+        page (int): 1-based page number, without a cursor
+        per_page (int): Page size
+        count_strategy (str): Requested count strategy
+
+    Returns:
+        Response: JSON response with tasks and cursor or page pagination info
+    """
+    sort_column = getattr(Task, sort_field)
+    position = None
+    if cursor:
+        is_datetime = sort_field in ('created_at', 'updated_at')
+        position = decode_cursor(cursor, sort_field, sort_order, is_datetime)
+    offset = (page - 1) * per_page if cursor is None and page > 0 else 0
+    pinned = (
+        cursor is not None and sort_field == 'priority'
+        and filters['priority'] is not None
+    )
+    count_cache = current_app.extensions['task_count_cache']
+
+    def read_shard(session, shard):
+        dialect_name = session.get_bind().dialect.name
+        query, _ = apply_task_filters(
+            select_tasks(fields, extra=(sort_field,)), filters, dialect_name
+        )
+        total, count_used = count_tasks(
+            session, query, count_strategy, filters,
+            cache=count_cache, key=(shard, filter_key(filters))
+        )
+        query = apply_keyset(query, sort_column, Task.id, sort_order, position, pinned)
+        rows = session.execute(query.limit(offset + per_page + 1)).all()
+        return rows, total, count_used
+
+    results = shards.fan_out(read_shard)
+    merged = merge_sorted([rows for rows, _, _ in results], sort_field, sort_order)
+    tasks = list(islice(merged, offset, offset + per_page + 1))
+    has_next = len(tasks) > per_page
+    tasks = tasks[:per_page]
+
+    # One estimate makes the sum an estimate; otherwise it is exact unless
+    # every shard answered from its cached count
+    strategies = {count_used for _, _, count_used in results}
+    count_used = next(
+        (strategy for strategy in ('none', 'estimated', 'exact')
+         if strategy in strategies),
+        'cached'
+    )
+    total_count = None
+    if count_used != 'none':
+        total_count = sum(total for _, total, _ in results)
+
+    if cursor is not None:
+        pagination = {
+            "mode": "cursor",
+            "total": total_count,
+            "count_strategy": count_used,
+            "per_page": per_page,
+            "next_cursor": (
+                encode_cursor(tasks[-1], sort_field, sort_order) if has_next else None
+            ),
+            "has_next": has_next,
+            "has_prev": bool(cursor)
+        }
+    else:
+        pages = None
+        if total_count is not None:
+            pages = (total_count + per_page - 1) // per_page
+        pagination = {
+            "total": total_count,
+            "count_strategy": count_used,
+            "page": page,
+            "per_page": per_page,
+            "pages": pages,
+            "has_next": has_next,
+            "has_prev": page > 1
+        }
+    return _task_page_response(tasks, pagination, fields=fields)
+
+
+@api_bp.route('/tasks/export', methods=['GET'])
+def export_tasks():
+    """
+    GET /api/tasks/export - Stream every matching task as NDJSON or CSV
+
+    Query Parameters:
+        format: 'ndjson' or 'csv' (default: 'ndjson')
+        completed, priority, search: Same filters as GET /api/tasks
+        fields: string - Comma-separated subset of columns to export
+
+    Rows are streamed in id order from a server-side cursor, so memory use
+    stays flat regardless of how many tasks are exported.
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson').lower()
+        if export_format not in EXPORT_FORMATS:
+            return create_error_response(
+                "INVALID_FORMAT",
+                "Format must be one of: ndjson, csv",
+                status_code=400
+            )
+
+        filters = parse_task_filters(request.args)
+        fields = parse_task_fields(request.args.get('fields')) or list(Task.FIELDS)
+
+        dialect_name = db.session.get_bind().dialect.name
+        statement = export_statement(filters, fields, dialect_name)
+        chunks = stream_export(
+            db.session, statement, fields, export_format,
+            batch_size=current_app.config['EXPORT_BATCH_SIZE']
+        )
+
+        response = Response(
+            stream_with_context(chunks),
+            mimetype=EXPORT_FORMATS[export_format]
+        )
+        disposition = f'attachment; filename=tasks.{export_format}'
+        response.headers['Content-Disposition'] = disposition
+        return response
+
+    except InvalidFieldsError as e:
+        return create_error_response(
+            "INVALID_FIELDS",
+            str(e),
+            status_code=400
+        )
+    except Exception:
+        return create_error_response(
+            "INTERNAL_ERROR",
+            "An error occurred while exporting tasks",
+            status_code=500
+        )
+
+
 @api_bp.route('/tasks', methods=['POST'])
+@idempotent
+@on_task_shard
 def create_task():
     """
     POST /api/tasks - Create new task
@@ -241,6 +859,10 @@ def create_task():
         title (required): string - Task title
         description (optional): string - Task description
         priority (optional): string - Task priority (High, Medium, Low)
+
+    Headers:
+        Idempotency-Key: optional; a retry with the same key and body gets
+            the original response instead of creating another task
     """
     try:
         data = request.get_json()
@@ -275,24 +897,25 @@ def create_task():
                 status_code=400
             )
         
-        # Create new task
-        task = Task(
-            title=data['title'].strip(),
-            description=data.get('description', '').strip() or None,
-            priority=data.get('priority', 'Medium'),
-            completed=data.get('completed', False)
-        )
+        # Create new task (completed_at is set if created as completed)
+        values = new_task_values(data)
         
-        # Set completed_at if task is created as completed
-        if data.get('completed', False):
-            task.completed_at = datetime.utcnow()
+        def write(session):
+            task = Task(**values)
+            shard = session.info.get(SHARD_INDEX)
+            if shard is not None:
+                task.id = next_task_id(shard)
+            session.add(task)
+            session.flush()
+            return task.to_dict(), task.updated_at
         
         # Save to database
-        db.session.add(task)
-        db.session.commit()
+        task_data, updated_at = run_write(write)
         
         # Return created task
-        return jsonify({"task": task.to_dict()}), 201
+        response = jsonify({"task": task_data})
+        etag = task_etag(task_data['id'], updated_at)
+        return set_validators(response, etag, updated_at), 201
         
     except Exception as e:
         db.session.rollback()
@@ -303,7 +926,121 @@ def create_task():
         )
 
 
+def _precondition_failed_response(task):
+    """
+    Build the 412 response for a conditional write against a changed task
+
+    Args:
+        task (Task): Current state of the task
+
+    Returns:
+        tuple: (response, status_code) carrying the task's current ETag
+    """
+    response, status_code = create_error_response(
+        "PRECONDITION_FAILED",
+        f"Task with id {task.id} has been modified since it was retrieved",
+        status_code=412
+    )
+    return set_validators(response, task_etag(task.id, task.updated_at)), status_code
+
+
+def _version_conflict_response(task):
+    """
+    Build the 409 response for an update based on an outdated version
+
+    Args:
+        task: Current state of the task, as a row from fetch_task
+
+    Returns:
+        tuple: (response, status_code) carrying the current task and ETag
+    """
+    response, status_code = create_error_response(
+        "VERSION_CONFLICT",
+        f"Task with id {task.id} has been modified; "
+        f"it is now at version {task.version}",
+        {"task": task_row_dict(task)},
+        status_code=409
+    )
+    return set_validators(response, task_etag(task.id, task.updated_at)), status_code
+
+
+def _validate_if_match(session, task_id, if_match):
+    """
+    Check an If-Match header inside a write's transaction
+
+    The ETag is a hash of updated_at, so the task is read to compare it; the
+    write then matches on the updated_at it was validated against, and only
+    applies if nothing changed the task in between.
+
+    Args:
+        session: Session of the write
+        task_id (int): Task id
+        if_match (ETags): The request's parsed If-Match header
+
+    Returns:
+        tuple: (validated updated_at or None, current task row if the
+            precondition failed or the task does not exist)
+    """
+    if not if_match:
+        return None, None
+    current = fetch_task(session, task_id, fields=['updated_at'])
+    if current is None:
+        return None, None
+    if precondition_failed(task_etag(task_id, current.updated_at), if_match):
+        return None, current
+    return current.updated_at, None
+
+
+def _update_task_response(task_id, data):
+    """
+    Apply validated updates to one task with a single UPDATE ... RETURNING
+
+    Both preconditions are predicates of the statement: the version in data
+    (optimistic concurrency) and the updated_at an If-Match header was
+    validated against. If no row comes back, the task is read again in the
+    same transaction to tell a failed If-Match (412) from a version conflict
+    (409) and a missing task (404).
+
+    Args:
+        task_id (int): Task id
+        data (dict): Validated request body
+
+    Returns:
+        Response: The updated task, or the error
+    """
+    values = task_update_values(data)
+    version = data.get('version')
+    if_match = request.if_match
+
+    def write(session):
+        validated, current = _validate_if_match(session, task_id, if_match)
+        if if_match and validated is None:
+            return None, current
+        row = update_task_row(
+            session, task_id, values, version=version, updated_at=validated
+        )
+        if row is None and (version is not None or validated is not None):
+            return None, fetch_task(session, task_id)
+        return row, None
+
+    row, current = run_write(write)
+    if current is not None:
+        if precondition_failed(task_etag(current.id, current.updated_at), if_match):
+            return _precondition_failed_response(current)
+        return _version_conflict_response(current)
+    if row is None:
+        return create_error_response(
+            "TASK_NOT_FOUND",
+            f"Task with id {task_id} not found",
+            status_code=404
+        )
+
+    response = jsonify({"task": task_row_dict(row)})
+    return set_validators(response, task_etag(task_id, row.updated_at), row.updated_at)
+
+
 @api_bp.route('/tasks/<int:task_id>', methods=['PUT'])
+@on_task_shard
 def update_task(task_id):
     """
     PUT /api/tasks/{id} - Update existing task
@@ -313,20 +1050,16 @@ def update_task(task_id):
         description: string - Task description
         priority: string - Task priority (High, Medium, Low)
         completed: boolean - Completion status
+        version: integer - Version the change is based on; the update is
+            rejected with 409 and the current task if it has changed since
+
+    Headers:
+        If-Match: optional ETag; the update is rejected with 412 if the task changed
     """
     try:
-        # Find task
-        task = Task.query.get(task_id)
-        if not task:
-            return create_error_response(
-                "TASK_NOT_FOUND",
-                f"Task with id {task_id} not found",
-                status_code=404
-            )
-        
         data = request.get_json()
         
-        if not data:
+        if not data or not isinstance(data, dict):
             return create_error_response(
                 "INVALID_JSON",
                 "Request body must contain valid JSON",
@@ -344,37 +1077,7 @@ def update_task(task_id):
                 status_code=422
             )
         
-        # Track if completed status changed to set completed_at
-        was_completed = task.completed
-        
-        # Update task fields
-        if 'title' in data:
-            task.title = data['title'].strip()
-        
-        if 'description' in data:
-            task.description = data['description'].strip() or None
-        
-        if 'priority' in data:
-            task.priority = data['priority']
-        
-        if 'completed' in data:
-            task.completed = data['completed']
-            
-            # Set completed_at timestamp
-            if data['completed'] and not was_completed:
-                # Task was just completed
-                task.completed_at = datetime.utcnow()
-            elif not data['completed'] and was_completed:
-                # Task was uncompleted
-                task.completed_at = None
-        
-        # Update timestamp
-        task.updated_at = datetime.utcnow()
-        
-        # Save changes
-        db.session.commit()
-        
-        return jsonify({"task": task.to_dict()})
+        return _update_task_response(task_id, data)
         
     except Exception as e:
         db.session.rollback()
@@ -385,25 +1088,94 @@ def update_task(task_id):
         )
 
 
+@api_bp.route('/tasks/<int:task_id>', methods=['PATCH'])
+@on_task_shard
+def patch_task(task_id):
+    """
+    PATCH /api/tasks/{id} - Partially update a task in one statement
+
+    Request Body (all fields optional):
+        title: string - Task title
+        description: string - Task description
+        priority: string - Task priority (High, Medium, Low)
+        completed: boolean - Completion status
+        version: integer - Version the change is based on (409 if stale)
+
+    Headers:
+        If-Match: optional ETag; the update is rejected with 412 if the task changed
+
+    Same fields and result as PUT, but the task is not loaded first: a
+    single UPDATE ... RETURNING applies the changes, with the completed_at
+    transition computed in SQL, and a missing task is one that no row came
+    back for. Conditional requests (If-Match) read the task's updated_at in
+    the same transaction and match on it in the UPDATE.
+    """
+    try:
+        data = request.get_json(silent=True)
+
+        if not data or not isinstance(data, dict):
+            return create_error_response(
+                "INVALID_JSON",
+                "Request body must contain valid JSON",
+                status_code=400
+            )
+
+        # Validate data
+        is_valid, errors = validate_task_data(data)
+
+        if not is_valid:
+            return create_error_response(
+                "VALIDATION_ERROR",
+                "Invalid task data",
+                errors,
+                status_code=422
+            )
+
+        return _update_task_response(task_id, data)
+
+    except Exception:
+        db.session.rollback()
+        return create_error_response(
+            "INTERNAL_ERROR",
+            "An error occurred while updating the task",
+            status_code=500
+        )
+
+
 @api_bp.route('/tasks/<int:task_id>', methods=['DELETE'])
+@on_task_shard
 def delete_task(task_id):
     """
     DELETE /api/tasks/{id} - Delete task
+
+    Headers:
+        If-Match: optional ETag; the delete is rejected with 412 if the task changed
     """
     try:
-        # Find task
-        task = Task.query.get(task_id)
-        if not task:
+        if_match = request.if_match
+
+        # Conditional write: the DELETE only matches the validated updated_at
+        def write(session):
+            validated, current = _validate_if_match(session, task_id, if_match)
+            if if_match and validated is None:
+                return False, current
+            if delete_task_row(session, task_id, updated_at=validated):
+                return True, None
+            if validated is None:
+                return False, None
+            return False, fetch_task(session, task_id, fields=['updated_at'])
+
+        # Delete task
+        deleted, current = run_write(write)
+        if current is not None:
+            return _precondition_failed_response(current)
+        if not deleted:
             return create_error_response(
                 "TASK_NOT_FOUND",
                 f"Task with id {task_id} not found",
                 status_code=404
             )
         
-        # Delete task
-        db.session.delete(task)
-        db.session.commit()
-        
         return '', 204
         
     except Exception as e:
@@ -416,21 +1188,54 @@ def delete_task(task_id):
 
 
 @api_bp.route('/tasks/<int:task_id>', methods=['GET'])
+@on_task_shard
 def get_task(task_id):
     """
     GET /api/tasks/{id} - Get specific task
+
+    Query Parameters:
+        fields: string - Comma-separated sparse fieldset, e.g. 'id,title,completed'
+
+    A matching If-None-Match is answered with 304 without loading the task;
+    requests without validators load it in a single query.
     """
     try:
-        task = Task.query.get(task_id)
-        if not task:
+        fields = parse_task_fields(request.args.get('fields'))
+
+        # Validate the client's copy from updated_at alone before loading the row
+        if request.if_none_match or request.if_modified_since:
+            updated_at = db.session.execute(
+                select(Task.updated_at).where(Task.id == task_id)
+            ).scalar_one_or_none()
+            if updated_at is None:
+                return create_error_response(
+                    "TASK_NOT_FOUND",
+                    f"Task with id {task_id} not found",
+                    status_code=404
+                )
+
+            etag = task_etag(task_id, updated_at, fields)
+            if is_not_modified(etag, updated_at):
+                return not_modified_response(etag, updated_at)
+
+        task = fetch_task(db.session, task_id, fields, extra=('updated_at',))
+        if task is None:
             return create_error_response(
                 "TASK_NOT_FOUND",
                 f"Task with id {task_id} not found",
                 status_code=404
             )
         
-        return jsonify({"task": task.to_dict()})
+        response = jsonify({"task": task_row_dict(task, fields)})
+        return set_validators(response, task_etag(task.id, task.updated_at, fields),
+                              task.updated_at)
         
+    except InvalidFieldsError as e:
+        return create_error_response(
+            "INVALID_FIELDS",
+            str(e),
+            status_code=400
+        )
     except Exception as e:
         return create_error_response(
             "INTERNAL_ERROR",
@@ -439,10 +1244,207 @@ def get_task(task_id):
         )
 
 
+def _validate_bulk_item(item):
+    """
+    Validate one task of a bulk create request
+
+    Args:
+        item: Element of the request's tasks array
+
+    Returns:
+        dict: Field errors, empty if the task is valid
+    """
+    if not isinstance(item, dict):
+        return {"task": "Each task must be a JSON object"}
+
+    # validate_task_data assumes string values
+    errors = {
+        field: f"{field.capitalize()} must be a string"
+        for field in ('title', 'description')
+        if item.get(field) is not None and not isinstance(item[field], str)
+    }
+    if errors:
+        return errors
+
+    is_valid, errors = validate_task_data(item, required_fields=['title'])
+    return errors
+
+
+def _is_async():
+    """Whether the request asked for a background job (async=true)"""
+    return request.args.get('async', 'false').lower() == 'true'
+
+
+def _enqueue_job(kind, params, total=None):
+    """
+    Queue a background job for the request and answer 202 Accepted
+
+    Args:
+        kind (str): Job handler name (see app.jobs)
+        params (dict): JSON-serializable handler input
+        total (int): Items the job will process, if known
+
+    Returns:
+        tuple: Response with the job and its Location, status code
+    """
+    runner = current_app.extensions['job_runner']
+    job = runner.enqueue(db.session, kind, params, total)
+    response = jsonify({"job": job.to_dict()})
+    response.headers['Location'] = url_for('api.get_job', job_id=job.id)
+    return response, 202
+
+
+@api_bp.route('/tasks/bulk', methods=['POST'])
+@idempotent
+def bulk_create_tasks():
+    """
+    POST /api/tasks/bulk - Create many tasks at once
+
+    Request Body:
+        tasks (required): array of task objects, as accepted by POST /api/tasks
+
+    Query Parameters:
+        atomic: 'true' (default) to reject the whole request with 422 when any
+            task is invalid; 'false' to create the valid tasks (207 if some fail)
+        return: 'tasks' (default) for per-item results with the created task,
+            or 'ids' for just the new ids in request order (null if rejected)
+        async: 'true' to validate now and insert in a background job; the
+            202 response links to GET /api/jobs/<id>, whose result has the
+            'ids' form
+
+    Tasks are validated first, then inserted with batched multi-row INSERTs
+    in a single transaction.
+    """
+    try:
+        data = request.get_json(silent=True)
+
+        if not data or not isinstance(data.get('tasks'), list) or not data['tasks']:
+            return create_error_response(
+                "INVALID_REQUEST",
+                "Request must contain a non-empty tasks array",
+                status_code=400
+            )
+
+        items = data['tasks']
+        max_tasks = current_app.config['BULK_MAX_TASKS']
+        if len(items) > max_tasks:
+            return create_error_response(
+                "TOO_MANY_TASKS",
+                f"A bulk request can contain at most {max_tasks} tasks",
+                {"count": len(items)},
+                status_code=400
+            )
+
+        atomic = request.args.get('atomic', 'true').lower() != 'false'
+        return_mode = request.args.get('return', 'tasks')
+        if return_mode not in ('tasks', 'ids'):
+            return create_error_response(
+                "INVALID_RETURN",
+                "Return must be one of: tasks, ids",
+                status_code=400
+            )
+
+        # Validate everything before writing anything
+        errors = {}
+        for index, item in enumerate(items):
+            item_errors = _validate_bulk_item(item)
+            if item_errors:
+                errors[index] = item_errors
+
+        if errors and atomic:
+            return create_error_response(
+                "VALIDATION_ERROR",
+                "Invalid task data",
+                {str(index): item_errors for index, item_errors in errors.items()},
+                status_code=422
+            )
+
+        accepted = [index for index in range(len(items)) if index not in errors]
+
+        if _is_async():
+            fields = ('title', 'description', 'priority', 'completed')
+            return _enqueue_job('bulk_create', {
+                "tasks": [
+                    {field: items[index][field]
+                     for field in fields if field in items[index]}
+                    for index in accepted
+                ],
+                "indexes": accepted,
+                "count": len(items),
+                "errors": [
+                    {"index": index, "errors": item_errors}
+                    for index, item_errors in errors.items()
+                ]
+            }, total=len(accepted))
+
+        now = datetime.utcnow()
+        rows = insert_tasks(
+            db.session,
+            [new_task_values(items[index], now) for index in accepted],
+            current_app.config['BULK_BATCH_SIZE'],
+            fields=['id'] if return_mode == 'ids' else None
+        )
+        db.session.commit()
+
+        created = dict(zip(accepted, rows))
+        status_code = 207 if errors else 201
+        summary = {"created": len(created), "failed": len(errors)}
+
+        if return_mode == 'ids':
+            ids = [
+                created[index].id if index in created else None
+                for index in range(len(items))
+            ]
+            failures = [
+                {"index": index, "errors": item_errors}
+                for index, item_errors in errors.items()
+            ]
+            return jsonify(dict(summary, ids=ids, errors=failures)), status_code
+
+        results = []
+        for index in range(len(items)):
+            if index in created:
+                results.append({
+                    "index": index, "status": "created",
+                    "task": task_row_dict(created[index])
+                })
+            else:
+                results.append({
+                    "index": index, "status": "invalid", "errors": errors[index]
+                })
+        return jsonify(dict(summary, results=results)), status_code
+
+    except Exception:
+        db.session.rollback()
+        return create_error_response(
+            "INTERNAL_ERROR",
+            "An error occurred while creating tasks",
+            status_code=500
+        )
+
+
 @api_bp.route('/tasks/bulk', methods=['PUT'])
+@idempotent
 def bulk_update_tasks():
     """
     PUT /api/tasks/bulk - Bulk update tasks
+
+    Request Body:
+        task_ids (required): array of task ids; unknown ids are skipped
+        updates (required): fields to set, as accepted by PUT /api/tasks/<id>
+        versions (optional): object mapping task ids to the version each
+            change is based on; tasks that have moved on are left unchanged
+            and returned as conflicts with a 409, the others are updated
+
+    Query Parameters:
+        return: 'tasks' (default) for the updated tasks, or 'minimal' for
+            just the updated count and ids
+        async: 'true' to run the update in a background job (202, see
+            GET /api/jobs/<id>)
+
+    Tasks are updated with one set-based UPDATE per chunk of
+    BULK_UPDATE_CHUNK_SIZE ids, each committed on its own so that long id
+    lists never hold the write lock for long.
     """
     try:
         data = request.get_json()
@@ -457,6 +1459,49 @@ def bulk_update_tasks():
         task_ids = data['task_ids']
         updates = data['updates']
         
+        if not isinstance(task_ids, list) or not all(
+                isinstance(task_id, int) for task_id in task_ids):
+            return create_error_response(
+                "INVALID_REQUEST",
+                "task_ids must be an array of integers",
+                status_code=400
+            )
+
+        versions = data.get('versions', {})
+        if not isinstance(versions, dict) or not all(
+                key.isdigit() and type(version) is int
+                for key, version in versions.items()):
+            return create_error_response(
+                "INVALID_REQUEST",
+                "versions must map task ids to integer versions",
+                status_code=400
+            )
+
+        return_mode = request.args.get('return', 'tasks')
+        if return_mode not in ('tasks', 'minimal'):
+            return create_error_response(
+                "INVALID_RETURN",
+                "Return must be one of: tasks, minimal",
+                status_code=400
+            )
+
+        # Versions are per task; an update setting nothing would still
+        # bump every version and updated_at
+        if not isinstance(updates, dict) or 'version' in updates:
+            return create_error_response(
+                "INVALID_REQUEST",
+                "updates must be an object without version; send the "
+                "expected version of each task in versions",
+                status_code=400
+            )
+        if not any(field in updates for field in UPDATABLE_FIELDS):
+            return create_error_response(
+                "INVALID_REQUEST",
+                "updates must set at least one of: "
+                + ", ".join(UPDATABLE_FIELDS),
+                status_code=400
+            )
+
         # Validate updates
         is_valid, errors = validate_task_data(updates)
         if not is_valid:
@@ -467,31 +1512,57 @@ def bulk_update_tasks():
                 status_code=422
             )
         
-        # Get tasks to update
-        tasks = Task.query.filter(Task.id.in_(task_ids)).all()
-        
-        updated_tasks = []
-        for task in tasks:
-            # Apply updates
-            if 'title' in updates:
-                task.title = updates['title'].strip()
-            if 'description' in updates:
-                task.description = updates['description'].strip() or None
-            if 'priority' in updates:
-                task.priority = updates['priority']
-            if 'completed' in updates:
-                task.completed = updates['completed']
-                if updates['completed'] and not task.completed_at:
-                    task.completed_at = datetime.utcnow()
-                elif not updates['completed']:
-                    task.completed_at = None
-            
-            task.updated_at = datetime.utcnow()
-            updated_tasks.append(task.to_dict())
+        task_ids = sorted(set(task_ids))
+        if _is_async():
+            return _enqueue_job('bulk_update', {
+                "task_ids": task_ids, "updates": updates, "versions": versions
+            }, total=len(task_ids))
         
-        db.session.commit()
+        # One timestamp and one SET clause for every row
+        values = task_update_values(updates)
+        fields = ['id'] if return_mode == 'minimal' else None
+        versions = {int(key): version for key, version in versions.items()}
         
-        return jsonify({"tasks": updated_tasks})
+        rows = []
+        for chunk in chunked(task_ids, current_app.config['BULK_UPDATE_CHUNK_SIZE']):
+            rows.extend(update_tasks(db.session, chunk, values, fields, versions))
+            db.session.commit()
+        rows.sort(key=attrgetter('id'))
+        
+        # Versioned tasks that were not updated either changed or are gone
+        stale = []
+        if versions:
+            updated_ids = {row.id for row in rows}
+            requested = set(task_ids)
+            stale = [
+                task_id for task_id in versions
+                if task_id in requested and task_id not in updated_ids
+            ]
+        if stale:
+            condition = id_in(stale, db.session.get_bind().dialect.name)
+            conflicts = db.session.execute(
+                select_tasks().where(condition).order_by(Task.id)
+            ).all()
+            if conflicts:
+                return create_error_response(
+                    "VERSION_CONFLICT",
+                    f"{len(conflicts)} tasks have been modified; "
+                    "the other tasks were updated",
+                    {
+                        "conflicts": [task_row_dict(row) for row in conflicts],
+                        "updated": [row.id for row in rows]
+                    },
+                    status_code=409
+                )
+
+        if return_mode == 'minimal':
+            return jsonify({"updated": len(rows), "ids": [row.id for row in rows]})
+
+        if not is_compact(current_app.json):
+            return jsonify({"tasks": [task_row_dict(row) for row in rows]})
+
+        body = encode_object(current_app.json, {"tasks": serialize_tasks(rows)})
+        return current_app.response_class(body + b'\n', mimetype='application/json')
         
     except Exception as e:
         db.session.rollback()
@@ -502,43 +1573,260 @@ def bulk_update_tasks():
         )
 
 
+def _mutate_by_filter(updates=None):
+    """
+    Update or delete every task matching the request's filters
+
+    Args:
+        updates (dict): Validated updates, or None to delete
+
+    Returns:
+        Response: affected (or matched, for a dry run) count
+    """
+    filters = parse_task_filters(request.args)
+    everything = request.args.get('all', 'false').lower() == 'true'
+    if not everything and filters['completed'] is None and not filters['priority'] \
+            and not filters['search']:
+        return create_error_response(
+            "MISSING_FILTER",
+            "Pass completed, priority or search, or all=true to match every task",
+            status_code=400
+        )
+
+    statement, _ = apply_task_filters(
+        select(Task.id), filters, db.session.get_bind().dialect.name
+    )
+    action = 'delete' if updates is None else 'update'
+
+    if request.args.get('dry_run', 'false').lower() == 'true':
+        return jsonify({
+            "action": action,
+            "dry_run": True,
+            "matched": count_exact(db.session, statement)
+        })
+
+    if _is_async():
+        return _enqueue_job('filter_mutation', {"filters": filters, "updates": updates})
+
+    # One timestamp and one SET clause for every row
+    values = None if updates is None else task_update_values(updates)
+
+    affected = 0
+    chunk_size = current_app.config['BULK_UPDATE_CHUNK_SIZE']
+    chunks = iter_id_chunks(db.session, statement, chunk_size)
+    for task_ids in chunks:
+        if values is None:
+            affected += delete_tasks(db.session, task_ids)
+        else:
+            affected += len(update_tasks(db.session, task_ids, values, fields=['id']))
+        db.session.commit()
+
+    return jsonify({"action": action, "dry_run": False, "affected": affected})
+
+
+@api_bp.route('/tasks/bulk/update', methods=['POST'])
+@idempotent
+def update_tasks_by_filter():
+    """
+    POST /api/tasks/bulk/update - Update every task matching a filter
+
+    Query Parameters:
+        completed, priority, search: Filters, as for GET /api/tasks
+        all: 'true' - Required to update every task when no filter is given
+        dry_run: 'true' - Only count the matching tasks
+        async: 'true' - Update in a background job (202, see GET /api/jobs/<id>)
+
+    Request Body:
+        updates (required): fields to set, as accepted by PUT /api/tasks/<id>
+
+    Matching tasks are updated in chunks of BULK_UPDATE_CHUNK_SIZE ids with
+    one set-based UPDATE each, committed per chunk.
+    """
+    try:
+        data = request.get_json(silent=True)
+
+        if not data or not isinstance(data.get('updates'), dict) or not data['updates']:
+            return create_error_response(
+                "INVALID_REQUEST",
+                "Request must contain updates",
+                status_code=400
+            )
+
+        updates = data['updates']
+        is_valid, errors = validate_task_data(updates)
+        if not is_valid:
+            return create_error_response(
+                "VALIDATION_ERROR",
+                "Invalid update data",
+                errors,
+                status_code=422
+            )
+
+        return _mutate_by_filter(updates)
+
+    except Exception:
+        db.session.rollback()
+        return create_error_response(
+            "INTERNAL_ERROR",
+            "An error occurred while updating tasks",
+            status_code=500
+        )
+
+
+@api_bp.route('/tasks/bulk/delete', methods=['POST'])
+@idempotent
+def delete_tasks_by_filter():
+    """
+    POST /api/tasks/bulk/delete - Delete every task matching a filter
+
+    Query Parameters:
+        completed, priority, search: Filters, as for GET /api/tasks
+        all: 'true' - Required to delete every task when no filter is given
+        dry_run: 'true' - Only count the matching tasks
+        async: 'true' - Delete in a background job (202, see GET /api/jobs/<id>)
+
+    Matching tasks are deleted in chunks of BULK_UPDATE_CHUNK_SIZE ids with
+    one set-based DELETE each, committed per chunk.
+    """
+    try:
+        return _mutate_by_filter()
+
+    except Exception:
+        db.session.rollback()
+        return create_error_response(
+            "INTERNAL_ERROR",
+            "An error occurred while deleting tasks",
+            status_code=500
+        )
+
+
+@api_bp.route('/jobs/<job_id>', methods=['GET'])
+@read_from_primary
+def get_job(job_id):
+    """
+    GET /api/jobs/<id> - Poll a background job
+
+    Path Parameters:
+        job_id: Id from the 202 response that queued the job
+
+    Returns the job's status (queued, running, succeeded, failed), progress,
+    throughput in items per second and, once finished, its result or error.
+    Always read from the primary, as workers update jobs between polls.
+    """
+    try:
+        job = db.session.get(Job, job_id)
+        if job is None:
+            return create_error_response(
+                "JOB_NOT_FOUND",
+                f"Job with ID {job_id} not found",
+                status_code=404
+            )
+
+        return jsonify({"job": job.to_dict()})
+
+    except Exception:
+        return create_error_response(
+            "INTERNAL_ERROR",
+            "An error occurred while retrieving the job",
+            status_code=500
+        )
+
+
 @api_bp.route('/tasks/stats', methods=['GET'])
 def get_task_stats():
     """
     GET /api/tasks/stats - Retrieve task statistics
+
+    Besides the totals and priority_breakdown, pending_by_priority and
+    completed_by_priority split each priority by completion status.
+    With sharding every shard's counters are read in parallel and summed.
+
+    A matching If-None-Match is answered with 304 without counting.
     """
     try:
-        # Get basic counts
-        total_tasks = Task.query.count()
-        completed_tasks = Task.query.filter(Task.completed == True).count()
-        pending_tasks = total_tasks - completed_tasks
-        
-        # Calculate completion rate
-        completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        completion_rate = round(completion_rate, 2)
-        
-        # Get priority breakdown
-        high_priority = Task.query.filter(Task.priority == 'High').count()
-        medium_priority = Task.query.filter(Task.priority == 'Medium').count()
-        low_priority = Task.query.filter(Task.priority == 'Low').count()
-        
-        stats_data = {
-            "total_tasks": total_tasks,
-            "completed_tasks": completed_tasks,
-            "pending_tasks": pending_tasks,
-            "completion_rate": completion_rate,
-            "priority_breakdown": {
-                "high": high_priority,
-                "medium": medium_priority,
-                "low": low_priority
-            }
-        }
+        # Stats change only when the tasks table is written
+        generation, last_modified = _tasks_generation()
+        etag = make_etag('stats', generation)
+        if is_not_modified(etag, last_modified):
+            return not_modified_response(etag, last_modified)
         
-        return jsonify({"stats": stats_data})
+        # Every breakdown comes from one grouped count (per shard, summed)
+        shards = current_app.extensions.get('task_shards')
+        if shards is None:
+            stats_data = compute_task_stats(db.session)
+        else:
+            counts = shards.fan_out(lambda session, shard: read_counters(session))
+            stats_data = build_task_stats(sum_counts(counts))
+        
+        return set_validators(jsonify({"stats": stats_data}), etag, last_modified)
         
     except Exception as e:
         return create_error_response(
             "INTERNAL_ERROR",
             "An error occurred while retrieving task statistics",
             status_code=500
-        )
\ No newline at end of file
+        )
+
+
+@api_bp.route('/tasks/stats/timeseries', methods=['GET'])
+def get_task_timeseries():
+    """
+    GET /api/tasks/stats/timeseries - Tasks created and completed over time
+
+    Query Parameters:
+        bucket: 'hour', 'day' or 'week' (default: 'day'); weeks start on Monday
+        from: ISO 8601 date or datetime in the first bucket (default: 30
+            buckets before 'to')
+        to: ISO 8601 date or datetime in the last bucket, inclusive
+            (default: now); naive values are UTC
+
+    Counts come from hourly rollups, so the cost depends on the number of
+    buckets, not the number of tasks. Tasks count where their current
+    created_at/completed_at fall; deleted tasks are not counted.
+    """
+    try:
+        bucket = request.args.get('bucket', 'day')
+        if bucket not in TIMESERIES_BUCKETS:
+            return create_error_response(
+                "INVALID_BUCKET",
+                "Bucket must be one of: hour, day, week",
+                status_code=400
+            )
+
+        try:
+            start = parse_timestamp(request.args.get('from'))
+            end = parse_timestamp(request.args.get('to'))
+        except ValueError:
+            return create_error_response(
+                "INVALID_RANGE",
+                "'from' and 'to' must be ISO 8601 dates or datetimes",
+                status_code=400
+            )
+
+        first, end, points = timeseries_range(bucket, start, end)
+        if points < 1 or points > MAX_TIMESERIES_POINTS:
+            return create_error_response(
+                "INVALID_RANGE",
+                f"The range must cover between 1 and {MAX_TIMESERIES_POINTS} buckets",
+                {"buckets": points},
+                status_code=400
+            )
+
+        # Rollups change only when the tasks table is written
+        generation, last_modified = current_generation(db.session)
+        etag = make_etag(
+            'timeseries', generation, bucket, first.isoformat(), end.isoformat()
+        )
+        if is_not_modified(etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+        timeseries = compute_timeseries(db.session, bucket, first, end)
+
+        return set_validators(jsonify({"timeseries": timeseries}), etag, last_modified)
+
+    except Exception:
+        return create_error_response(
+            "INTERNAL_ERROR",
+            "An error occurred while retrieving the task time series",
+            status_code=500
+        )
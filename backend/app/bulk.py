@@ -0,0 +1,319 @@
+"""
+Batched task writes
+
+The bulk endpoints write many tasks in one transaction with a few
+multi-row statements instead of one unit-of-work flush per task. New rows
+are inserted with executemany, which SQLAlchemy sends as multi-row
+INSERT ... VALUES ... RETURNING batches on SQLite 3.35+ and PostgreSQL.
+Updates are a single UPDATE ... WHERE id IN (...) per chunk of ids, with
+per-row logic such as stamping completed_at expressed in SQL. Filter-based
+mutations walk the matching ids in keyset chunks and apply one statement
+per chunk.
+"""
+
+import json
+from datetime import datetime
+from operator import attrgetter
+
+from sqlalchemy import ARRAY, Integer, any_, bindparam, case, func, or_, select, tuple_
+
+from app.models import Task
+from app.reads import task_columns
+
+
+def chunked(items, size):
+    """
+    Split a list into consecutive slices
+
+    Args:
+        items (list): Items to split
+        size (int): Maximum slice length
+
+    Returns:
+        generator: Slices of items, in order
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def new_task_values(data, now=None):
+    """
+    Column values for a task created from validated request data
+
+    Mirrors POST /api/tasks: title and description are stripped, priority
+    defaults to Medium and tasks created as completed get completed_at.
+
+    Args:
+        data (dict): Validated task data
+        now (datetime): Timestamp for created_at/updated_at
+
+    Returns:
+        dict: Values for an INSERT into tasks
+    """
+    now = now or datetime.utcnow()
+    completed = data.get('completed', False)
+    return {
+        'title': data['title'].strip(),
+        'description': (data.get('description') or '').strip() or None,
+        'priority': data.get('priority', 'Medium'),
+        'completed': completed,
+        'created_at': now,
+        'updated_at': now,
+        'completed_at': now if completed else None
+    }
+
+
+def insert_tasks(session, values, batch_size, fields=None):
+    """
+    Insert tasks in batches and read back the new rows
+
+    Runs inside the session's transaction; the caller commits.
+
+    Args:
+        session: SQLAlchemy session
+        values (list): Dicts from new_task_values
+        batch_size (int): Rows per executemany call
+        fields (list): Fields to return besides id, or None for every field
+
+    Returns:
+        list: One row per inserted task, in the order of values; rows
+            expose the fields as attributes (see app.reads.task_row_dict)
+    """
+    columns = task_columns(fields)
+    dialect = session.get_bind().dialect
+    rows = []
+    for batch in chunked(values, batch_size):
+        if dialect.name == 'sqlite' and dialect.insert_executemany_returning:
+            # SQLAlchemy has no ordered multi-row RETURNING for SQLite, but
+            # one INSERT into a rowid table under the write lock assigns
+            # ascending ids in VALUES order, so sorting restores the order
+            statement = Task.__table__.insert().returning(*columns)
+            inserted = session.execute(statement, batch).all()
+            rows.extend(sorted(inserted, key=attrgetter('id')))
+        elif dialect.insert_executemany_returning_sort_by_parameter_order:
+            statement = Task.__table__.insert().returning(
+                *columns, sort_by_parameter_order=True
+            )
+            rows.extend(session.execute(statement, batch).all())
+        else:
+            # No RETURNING from executemany: let the unit of work fetch the ids
+            tasks = [Task(**row) for row in batch]
+            session.add_all(tasks)
+            session.flush()
+            rows.extend(tasks)
+    return rows
+
+
+def task_update_values(updates, now=None):
+    """
+    SET clause for applying validated updates to tasks in SQL
+
+    Mirrors PUT /api/tasks/<id>: completed_at is stamped when a pending
+    task is completed and cleared when a completed task is reopened. The
+    transition is a CASE on each row's current completed value, so it needs
+    no prior read and applies per row to many tasks at once. Every update
+    increments version.
+
+    Args:
+        updates (dict): Validated update data
+        now (datetime): Timestamp for updated_at and new completed_at values
+
+    Returns:
+        dict: Column name -> value or SQL expression
+    """
+    now = now or datetime.utcnow()
+    values = {'updated_at': now, 'version': Task.version + 1}
+    if 'title' in updates:
+        values['title'] = updates['title'].strip()
+    if 'description' in updates:
+        values['description'] = (updates['description'] or '').strip() or None
+    if 'priority' in updates:
+        values['priority'] = updates['priority']
+    if 'completed' in updates:
+        values['completed'] = updates['completed']
+        if updates['completed']:
+            values['completed_at'] = case(
+                (Task.completed.is_(True), Task.completed_at), else_=now
+            )
+        else:
+            values['completed_at'] = case(
+                (Task.completed.is_(True), None), else_=Task.completed_at
+            )
+    return values
+
+
+def id_in(task_ids, dialect_name):
+    """
+    Condition matching tasks whose id is in a list
+
+    Long lists are bound as a single parameter (a JSON array expanded by
+    json_each on SQLite, an array on PostgreSQL) rather than one bind
+    parameter per id, which keeps statement compilation constant-time and
+    stays clear of SQLite's bind parameter limit.
+
+    Args:
+        task_ids (list): Task ids
+        dialect_name (str): Name of the active database dialect
+
+    Returns:
+        ColumnElement: WHERE condition
+    """
+    if dialect_name == 'sqlite':
+        ids = func.json_each(json.dumps(task_ids)).table_valued('value')
+        return Task.id.in_(select(ids.c.value))
+    if dialect_name == 'postgresql':
+        return Task.id == any_(bindparam('task_ids', task_ids, type_=ARRAY(Integer)))
+    return Task.id.in_(task_ids)
+
+
+def update_tasks(session, task_ids, values, fields=None, versions=None):
+    """
+    Apply one SET clause to a set of tasks with a single UPDATE
+
+    Runs inside the session's transaction; the caller commits. Callers
+    with very long id lists should pass them in chunks (see chunked) and
+    commit between chunks to keep write locks short.
+
+    Args:
+        session: SQLAlchemy session
+        task_ids (list): Ids of the tasks to update; unknown ids are skipped
+        values (dict): SET clause from task_update_values
+        fields (list): Fields to return besides id, or None for every field
+        versions (dict): Expected version by task id; those tasks are only
+            updated if their version still matches
+
+    Returns:
+        list: Rows of the updated tasks, in no particular order
+    """
+    columns = task_columns(fields)
+    dialect = session.get_bind().dialect
+    versions = versions or {}
+    unversioned = [task_id for task_id in task_ids if task_id not in versions]
+    expected = {
+        task_id: versions[task_id] for task_id in task_ids if task_id in versions
+    }
+
+    condition = _versioned_id_in(unversioned, expected, dialect.name)
+    statement = Task.__table__.update().where(condition).values(values)
+
+    if dialect.update_returning:
+        return session.execute(statement.returning(*columns)).all()
+
+    # No UPDATE ... RETURNING: read the rows back in the same transaction,
+    # matching versioned tasks by the version the update gave them
+    session.execute(statement)
+    updated = {task_id: version + 1 for task_id, version in expected.items()}
+    condition = _versioned_id_in(unversioned, updated, dialect.name)
+    return session.execute(select(*columns).where(condition)).all()
+
+
+def _versioned_id_in(task_ids, versions, dialect_name):
+    """Condition matching task_ids, or a task in versions at that version"""
+    if not versions:
+        return id_in(task_ids, dialect_name)
+    matched = tuple_(Task.id, Task.version).in_(list(versions.items()))
+    return or_(id_in(task_ids, dialect_name), matched) if task_ids else matched
+
+
+def update_task_row(session, task_id, values, fields=None, version=None,
+                    updated_at=None):
+    """
+    Apply a SET clause to one task in a single round trip
+
+    Runs inside the session's transaction; the caller commits.
+
+    Args:
+        session: SQLAlchemy session
+        task_id (int): Id of the task to update
+        values (dict): SET clause from task_update_values
+        fields (list): Fields to return besides id, or None for every field
+        version (int): Only update the task if its version still matches
+        updated_at (datetime): Only update the task if its updated_at still
+            matches, e.g. the one an If-Match ETag was validated against
+
+    Returns:
+        Row: The updated task, or None if no task has that id (or version,
+            or updated_at)
+    """
+    columns = task_columns(fields)
+    statement = Task.__table__.update().where(Task.id == task_id).values(values)
+    if version is not None:
+        statement = statement.where(Task.version == version)
+    if updated_at is not None:
+        statement = statement.where(Task.updated_at == updated_at)
+
+    if session.get_bind().dialect.update_returning:
+        # SQLite reports no rowcount for UPDATE ... RETURNING; the returned
+        # row is the affected-row count
+        return session.execute(statement.returning(*columns)).first()
+
+    if session.execute(statement).rowcount == 0:
+        return None
+    return session.execute(select(*columns).where(Task.id == task_id)).first()
+
+
+def delete_task_row(session, task_id, updated_at=None):
+    """
+    Delete one task with a single DELETE
+
+    Runs inside the session's transaction; the caller commits.
+
+    Args:
+        session: SQLAlchemy session
+        task_id (int): Id of the task to delete
+        updated_at (datetime): Only delete the task if its updated_at still
+            matches
+
+    Returns:
+        bool: True if the task was deleted
+    """
+    statement = Task.__table__.delete().where(Task.id == task_id)
+    if updated_at is not None:
+        statement = statement.where(Task.updated_at == updated_at)
+    return session.execute(statement).rowcount > 0
+
+
+def delete_tasks(session, task_ids):
+    """
+    Delete a set of tasks with a single DELETE
+
+    Runs inside the session's transaction; the caller commits.
+
+    Args:
+        session: SQLAlchemy session
+        task_ids (list): Ids of the tasks to delete; unknown ids are skipped
+
+    Returns:
+        int: Number of deleted tasks
+    """
+    condition = id_in(task_ids, session.get_bind().dialect.name)
+    return session.execute(Task.__table__.delete().where(condition)).rowcount
+
+
+def iter_id_chunks(session, statement, chunk_size, after=None):
+    """
+    Walk the ids selected by a filtered statement in ascending chunks
+
+    Each chunk is fetched with a keyset query (id > last id seen), so the
+    caller may update, delete and commit between chunks; rows that stop
+    or start matching behind the cursor are not revisited.
+
+    Args:
+        session: SQLAlchemy session
+        statement: select(Task.id) with the filters applied
+        chunk_size (int): Ids per chunk
+        after (int): Resume after this id, or None to start from the first
+
+    Returns:
+        generator: Lists of ids, each non-empty
+    """
+    last_id = after
+    while True:
+        chunk = statement.order_by(Task.id).limit(chunk_size)
+        if last_id is not None:
+            chunk = chunk.where(Task.id > last_id)
+        task_ids = session.execute(chunk).scalars().all()
+        if not task_ids:
+            return
+        yield task_ids
+        last_id = task_ids[-1]
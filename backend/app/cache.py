@@ -0,0 +1,119 @@
+"""
+Query-result cache for task listings
+
+Serialized GET /api/tasks response bodies are kept in a bounded, per-process
+LRU keyed on the normalized query parameters. Each entry remembers the tasks
+table write generation it was computed under (see app.generation); any
+committed write advances the generation and so invalidates every entry at
+once, in every worker process, at the cost of one primary-key lookup per
+request.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    LRU map of key -> (generation, body) bounded by total body size
+
+    Counters:
+        hits: Lookups answered from the cache
+        misses: Lookups that found nothing usable (absent or stale)
+        evictions: Entries dropped to stay within max_bytes
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._generation = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, generation):
+        """
+        Return the body cached for key at generation, or None
+
+        Args:
+            key: Hashable normalized request key
+            generation (int): Current tasks table generation
+
+        Returns:
+            bytes: Cached response body, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != generation:
+                if entry is not None:
+                    self._discard(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, generation, body):
+        """
+        Remember a response body computed at generation
+
+        Bodies computed under a generation older than one already seen are
+        not stored, and the first body of a newer generation drops every
+        entry of the previous ones.
+
+        Args:
+            key: Hashable normalized request key
+            generation (int): Tasks table generation read before the query ran
+            body (bytes): Serialized response body
+        """
+        if len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            if self._generation is not None and generation < self._generation:
+                return
+            if generation != self._generation:
+                self._entries.clear()
+                self.size = 0
+                self._generation = generation
+
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (generation, body)
+            self.size += len(body)
+
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry, keeping the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self._generation = None
+
+    def stats(self):
+        """
+        Report the cache's size and counters
+
+        Returns:
+            dict: entries, bytes, max_bytes, hits, misses, evictions
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def _discard(self, key):
+        """Remove an entry and release its bytes; caller holds the lock"""
+        _, body = self._entries.pop(key)
+        self.size -= len(body)
@@ -0,0 +1,156 @@
+"""
+Negotiated response compression
+
+Compresses JSON, NDJSON and CSV responses with brotli (when the optional
+``brotli`` package is installed) or gzip, based on the request's
+Accept-Encoding. Buffered responses smaller than COMPRESSION_MIN_SIZE are
+sent as-is; streamed responses are compressed chunk by chunk and flushed
+after every chunk so clients keep receiving data as it is produced.
+"""
+
+import gzip
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/csv')
+
+
+def available_codings():
+    """Return supported content codings in order of preference"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def encoded_etag(etag, coding):
+    """
+    Entity tag of an encoded representation
+
+    A strong ETag identifies exact bytes, so every content coding gets its
+    own tag derived from the identity one.
+    """
+    return f'{etag}-{coding}'
+
+
+class _GzipStream:
+    """Incremental gzip encoder"""
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        compressed = self._compressor.compress(data)
+        return compressed + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    """Incremental brotli encoder"""
+
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+def compress_bytes(data, coding, config):
+    """
+    Compress a complete body
+
+    Args:
+        data (bytes): Body to compress
+        coding (str): 'br' or 'gzip'
+        config: Application config with the compression settings
+
+    Returns:
+        bytes: Encoded body
+    """
+    if coding == 'br':
+        return brotli.compress(data, quality=config['COMPRESSION_BROTLI_QUALITY'])
+    return gzip.compress(data, compresslevel=config['COMPRESSION_LEVEL'], mtime=0)
+
+
+def _compress_stream(chunks, encoder, source):
+    """Yield encoded chunks, closing the source iterable when done"""
+    try:
+        for chunk in chunks:
+            if chunk:
+                yield encoder.compress(chunk)
+        yield encoder.finish()
+    finally:
+        if hasattr(source, 'close'):
+            source.close()
+
+
+def negotiate_coding():
+    """
+    Pick the content coding for the current request
+
+    Returns:
+        str: 'br' or 'gzip', or None when the client accepts neither
+    """
+    return request.accept_encodings.best_match(available_codings())
+
+
+def compress_response(response):
+    """
+    after_request hook applying negotiated compression
+
+    Args:
+        response: Outgoing Flask response
+
+    Returns:
+        Response: The response, compressed when worthwhile
+    """
+    config = current_app.config
+
+    if (not config['COMPRESSION_ENABLED']
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    coding = negotiate_coding()
+    if coding is None:
+        return response
+
+    if response.is_streamed:
+        if coding == 'br':
+            encoder = _BrotliStream(config['COMPRESSION_BROTLI_QUALITY'])
+        else:
+            encoder = _GzipStream(config['COMPRESSION_LEVEL'])
+        source = response.response
+        response.response = _compress_stream(response.iter_encoded(), encoder, source)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESSION_MIN_SIZE']:
+            return response
+        response.set_data(compress_bytes(data, coding, config))
+
+    response.headers['Content-Encoding'] = coding
+
+    etag, weak = response.get_etag()
+    if etag is not None:
+        response.set_etag(encoded_etag(etag, coding), weak)
+
+    return response
+
+
+def init_compression(app):
+    """Register response compression on an application"""
+    app.after_request(compress_response)
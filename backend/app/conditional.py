@@ -0,0 +1,141 @@
+"""
+Conditional request support
+
+Validators are derived from data that is cheap to read: listings and stats
+use the tasks table write generation (see app.generation), a single task
+uses its id and updated_at. Matching If-None-Match / If-Modified-Since
+requests are answered with 304 before any rows are loaded, and If-Match
+lets clients make writes conditional on the version they last saw.
+"""
+
+import hashlib
+from datetime import timezone
+
+from flask import current_app, request
+
+from app.compression import available_codings, encoded_etag
+
+
+def make_etag(*parts):
+    """
+    Build a strong entity tag from the values that determine a representation
+
+    Args:
+        *parts: Hashable values such as a resource name, generation and
+            normalized query parameters
+
+    Returns:
+        str: Opaque tag value, without quotes
+    """
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:32]
+
+
+def task_etag(task_id, updated_at, fields=None):
+    """
+    Entity tag of a single task's representation
+
+    Args:
+        task_id (int): Task id
+        updated_at (datetime): The task's updated_at
+        fields (list): Sparse fieldset, or None for the full representation
+
+    Returns:
+        str: Opaque tag value, without quotes
+    """
+    return make_etag('task', task_id, updated_at, tuple(fields) if fields else None)
+
+
+def _etag_variants(etag):
+    """Return the identity ETag and the ETags of its compressed encodings"""
+    return [etag] + [encoded_etag(etag, coding) for coding in available_codings()]
+
+
+def _to_http_date(value):
+    """Drop sub-second precision and mark a naive UTC datetime as UTC"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def is_not_modified(etag, last_modified=None):
+    """
+    Check the current request's cache validators
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    no entity tags were sent.
+
+    Args:
+        etag (str): Current entity tag
+        last_modified (datetime): Current modification time, or None
+
+    Returns:
+        bool: True if the client's copy is still current
+    """
+    if request.if_none_match:
+        return any(request.if_none_match.contains_weak(variant)
+                   for variant in _etag_variants(etag))
+    if request.if_modified_since and last_modified is not None:
+        return _to_http_date(last_modified) <= request.if_modified_since
+    return False
+
+
+def set_validators(response, etag, last_modified=None, weak=False):
+    """
+    Attach ETag and Last-Modified headers to a response
+
+    Cache-Control: no-cache lets clients store the response but makes them
+    revalidate on every use, so a heuristic freshness lifetime derived from
+    Last-Modified can never show a list from before a write.
+
+    Args:
+        response: Flask response
+        etag (str): Entity tag
+        last_modified (datetime): Modification time, or None
+        weak (bool): Mark the tag weak, for representations that are
+            equivalent but not byte-identical across requests
+
+    Returns:
+        Response: The same response
+    """
+    response.set_etag(etag, weak)
+    response.cache_control.no_cache = True
+    if last_modified is not None:
+        response.last_modified = _to_http_date(last_modified)
+    return response
+
+
+def not_modified_response(etag, last_modified=None, weak=False):
+    """
+    Build an empty 304 response carrying the current validators
+
+    The ETag echoed back is the variant the client holds, which may be the
+    tag of a compressed encoding.
+    """
+    for variant in _etag_variants(etag):
+        if request.if_none_match.contains_weak(variant):
+            etag = variant
+            break
+    response = current_app.response_class(status=304)
+    return set_validators(response, etag, last_modified, weak)
+
+
+def precondition_failed(etag, if_match=None):
+    """
+    Check an If-Match header against an entity tag
+
+    Args:
+        etag (str): Current entity tag of the target resource
+        if_match (ETags): Parsed If-Match header; the current request's by
+            default. Writes running outside the request, on the group-commit
+            writer, capture it beforehand.
+
+    Returns:
+        bool: True if an If-Match header was sent and does not match
+    """
+    if if_match is None:
+        if_match = request.if_match
+    if not if_match:
+        return False
+    return not any(if_match.contains(variant) for variant in _etag_variants(etag))
@@ -0,0 +1,227 @@
+"""
+Total-count strategies for task listings
+
+Counting the rows behind a filtered listing costs as much as (or more than)
+fetching the page itself. Callers pick how the ``total`` is produced:
+
+* exact: ``SELECT count(*)`` with the listing's filters
+* estimated: planner statistics (``EXPLAIN`` on PostgreSQL, ``sqlite_stat1``
+  on SQLite); falls back to exact when no statistics are available
+* cached: exact counts remembered per filter set and invalidated by the
+  tasks table write generation
+* none: no total at all
+
+Each function reports the strategy that actually produced the number so
+responses can tell clients how much to trust it.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Query
+
+from app.generation import current_generation
+
+
+COUNT_STRATEGIES = ('exact', 'estimated', 'cached', 'none')
+
+# Strategies whose total, and the strategy reported with it, can differ
+# between identical requests at the same generation
+APPROXIMATE_COUNT_STRATEGIES = ('estimated', 'cached')
+
+
+class CountCache:
+    """
+    Bounded LRU map of filter key -> (generation, count)
+
+    Entries recorded under an older tasks generation are treated as misses,
+    so any committed write invalidates every cached count at once.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, generation):
+        """Return the cached count for key at generation, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != generation:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, generation, count):
+        """Remember a count computed at generation"""
+        with self._lock:
+            self._entries[key] = (generation, count)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached count"""
+        with self._lock:
+            self._entries.clear()
+
+
+def _statement(query):
+    """Return the SELECT behind an ORM query or a Core select, unordered"""
+    query = query.order_by(None)
+    return query.statement if isinstance(query, Query) else query
+
+
+def count_exact(session, query):
+    """Run an exact count of an ORM query or Core select, ignoring its ordering"""
+    subquery = _statement(query).subquery()
+    return session.execute(select(func.count()).select_from(subquery)).scalar()
+
+
+def _estimate_postgresql(session, query):
+    """Read the planner's row estimate for a query from EXPLAIN"""
+    statement = _statement(query)
+    compiled = statement.compile(
+        dialect=session.get_bind().dialect, compile_kwargs={'literal_binds': True}
+    )
+    plan = session.execute(text(f'EXPLAIN (FORMAT JSON) {compiled}')).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def _sqlite_index_stats(session):
+    """Map index name -> list of sqlite_stat1 integers for the tasks table"""
+    # sqlite_stat1 only exists once ANALYZE has run
+    has_stats = session.execute(
+        text(
+            "SELECT 1 FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'sqlite_stat1'"
+        )
+    ).first()
+    if not has_stats:
+        return {}
+
+    rows = session.execute(
+        text("SELECT idx, stat FROM sqlite_stat1 WHERE tbl = 'tasks'")
+    ).all()
+    stats = {}
+    for idx, stat in rows:
+        numbers = [int(part) for part in stat.split() if part.isdigit()]
+        if idx and numbers:
+            stats[idx] = numbers
+    return stats
+
+
+def _estimate_sqlite(session, filters):
+    """
+    Estimate a filtered row count from ANALYZE statistics
+
+    The partial pending/completed indexes record exact per-state row counts
+    as of the last ANALYZE; the priority index records the average number of
+    rows per priority value.
+    """
+    if filters.get('search'):
+        return None
+
+    stats = _sqlite_index_stats(session)
+    table_stat = stats.get('ix_tasks_created_at_id')
+    if not table_stat:
+        return None
+
+    estimate = float(table_stat[0])
+
+    completed = filters.get('completed')
+    if completed is not None:
+        partial = (
+            'ix_tasks_done_created_at' if completed else 'ix_tasks_pending_created_at'
+        )
+        if partial not in stats:
+            return None
+        estimate = float(stats[partial][0])
+
+    if filters.get('priority'):
+        priority_stat = stats.get('ix_tasks_priority_created_at')
+        if not priority_stat or len(priority_stat) < 2 or not priority_stat[0]:
+            return None
+        estimate *= priority_stat[1] / priority_stat[0]
+
+    return int(round(estimate))
+
+
+def count_estimated(session, query, filters):
+    """
+    Estimate the row count of a filtered task query
+
+    Args:
+        session: SQLAlchemy session
+        query: Filtered task query or select
+        filters (dict): Normalized filters the query was built from
+
+    Returns:
+        tuple: (total, strategy) where strategy is 'estimated', or 'exact'
+            when no usable statistics exist
+    """
+    dialect_name = session.get_bind().dialect.name
+    estimate = None
+    if dialect_name == 'postgresql':
+        estimate = _estimate_postgresql(session, query)
+    elif dialect_name == 'sqlite':
+        estimate = _estimate_sqlite(session, filters)
+
+    if estimate is None:
+        return count_exact(session, query), 'exact'
+    return estimate, 'estimated'
+
+
+def count_cached(session, query, cache, key):
+    """
+    Return an exact count, reusing one computed since the last write
+
+    Args:
+        session: SQLAlchemy session
+        query: Filtered task query or select
+        cache (CountCache): Cache shared by the application
+        key: Hashable normalized filter key
+
+    Returns:
+        tuple: (total, strategy) where strategy is 'cached' on a hit and
+            'exact' when the count had to be computed
+    """
+    generation, _ = current_generation(session)
+    total = cache.get(key, generation)
+    if total is not None:
+        return total, 'cached'
+
+    total = count_exact(session, query)
+    cache.set(key, generation, total)
+    return total, 'exact'
+
+
+def count_tasks(session, query, strategy, filters, cache=None, key=None):
+    """
+    Produce the total for a task listing with the requested strategy
+
+    Args:
+        session: SQLAlchemy session
+        query: Filtered task query or select
+        strategy (str): One of COUNT_STRATEGIES
+        filters (dict): Normalized filters the query was built from
+        cache (CountCache): Cache used by the 'cached' strategy
+        key: Cache key for the filters
+
+    Returns:
+        tuple: (total or None, strategy actually used)
+    """
+    if strategy == 'none':
+        return None, 'none'
+    if strategy == 'estimated':
+        return count_estimated(session, query, filters)
+    if strategy == 'cached' and cache is not None:
+        return count_cached(session, query, cache, key)
+    return count_exact(session, query), 'exact'
@@ -9,7 +9,9 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 
-# Initialize extensions
-db = SQLAlchemy()
+from app.routing import RoutingSession
+
+# Initialize extensions; the session can route reads to replicas
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 cors = CORS()
\ No newline at end of file
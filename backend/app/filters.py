@@ -0,0 +1,123 @@
+"""
+Task filter vocabulary
+
+Parses the completed/priority/search and fields query parameters shared by
+the task endpoints and applies them to a query, so every endpoint that
+accepts them interprets them the same way.
+"""
+
+from sqlalchemy import true, false
+
+from app.models import Task
+from app.search import apply_search
+
+
+VALID_PRIORITIES = ['High', 'Medium', 'Low']
+
+
+def parse_task_filters(args):
+    """
+    Normalize filter parameters from a request's query string
+
+    Unknown values are ignored, matching the original behavior of
+    GET /api/tasks.
+
+    Args:
+        args: Mapping of query parameters (e.g. request.args)
+
+    Returns:
+        dict: {'completed': bool or None, 'priority': str or None,
+            'search': str}
+    """
+    completed = None
+    completed_filter = args.get('completed')
+    if completed_filter is not None:
+        if completed_filter.lower() == 'true':
+            completed = True
+        elif completed_filter.lower() == 'false':
+            completed = False
+
+    priority = args.get('priority')
+    if priority not in VALID_PRIORITIES:
+        priority = None
+
+    return {
+        'completed': completed,
+        'priority': priority,
+        'search': args.get('search', '').strip()
+    }
+
+
+def filter_key(filters):
+    """Return a hashable key identifying a normalized filter set"""
+    return (filters['completed'], filters['priority'], filters['search'])
+
+
+def apply_task_filters(query, filters, dialect_name, rank=False):
+    """
+    Apply normalized filters to a Task query
+
+    Args:
+        query: Task query
+        filters (dict): Output of parse_task_filters
+        dialect_name (str): Name of the active database dialect
+        rank (bool): Whether the caller will order search results by relevance
+
+    Returns:
+        tuple: (query, rank_order) as returned by app.search.apply_search;
+            rank_order is None without a search
+    """
+    # Literal booleans let the planner match the partial completed indexes
+    if filters['completed'] is True:
+        query = query.filter(Task.completed == true())
+    elif filters['completed'] is False:
+        query = query.filter(Task.completed == false())
+
+    if filters['priority']:
+        query = query.filter(Task.priority == filters['priority'])
+
+    rank_order = None
+    if filters['search']:
+        query, rank_order = apply_search(
+            query, filters['search'], dialect_name, rank=rank
+        )
+
+    return query, rank_order
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when a fields parameter names unknown task fields"""
+
+
+def parse_task_fields(raw):
+    """
+    Parse a sparse fieldset parameter such as 'id,title,completed'
+
+    Args:
+        raw (str): Comma-separated field names, or None for every field
+
+    Returns:
+        list: Requested fields in request order without duplicates, or None
+            when every field should be returned
+
+    Raises:
+        InvalidFieldsError: If a name is not one of Task.FIELDS
+    """
+    if raw is None:
+        return None
+
+    fields = []
+    for name in raw.split(','):
+        name = name.strip()
+        if not name or name in fields:
+            continue
+        if name not in Task.FIELDS:
+            raise InvalidFieldsError(
+                f"Unknown field '{name}'. "
+                f"Fields must be among: {', '.join(Task.FIELDS)}"
+            )
+        fields.append(name)
+
+    if not fields:
+        raise InvalidFieldsError("At least one field must be requested")
+    return fields
@@ -0,0 +1,101 @@
+"""
+Table write generations
+
+Every transaction that writes to a tracked table increments that table's
+row in ``table_generations`` inside the same transaction. Readers compare
+the generation they cached data under with the current one: a single
+primary-key lookup that is correct across worker processes.
+
+Writes are detected with session events, so ORM unit-of-work changes and
+set-based ``session.execute(update(Task)...)`` statements are both covered.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import event, select, update, insert
+
+from app.extensions import db
+from app.models import TableGeneration
+
+
+TRACKED_TABLES = ('tasks',)
+
+_BUMPED_KEY = 'bumped_generations'
+
+
+def current_generation(session, table_name='tasks'):
+    """
+    Read the committed write generation of a table
+
+    Args:
+        session: SQLAlchemy session
+        table_name (str): Tracked table name
+
+    Returns:
+        tuple: (generation, updated_at); (0, None) before the first write
+    """
+    row = session.execute(
+        select(TableGeneration.generation, TableGeneration.updated_at)
+        .where(TableGeneration.table_name == table_name)
+    ).first()
+    if row is None:
+        return 0, None
+    return row.generation, row.updated_at
+
+
+def bump_generation(session, table_name):
+    """
+    Increment a table's generation once within the current transaction
+
+    Args:
+        session: SQLAlchemy session with an open transaction
+        table_name (str): Tracked table name
+    """
+    bumped = session.info.setdefault(_BUMPED_KEY, set())
+    if table_name in bumped:
+        return
+    bumped.add(table_name)
+
+    connection = session.connection()
+    now = datetime.utcnow()
+    result = connection.execute(
+        update(TableGeneration.__table__)
+        .where(TableGeneration.__table__.c.table_name == table_name)
+        .values(generation=TableGeneration.__table__.c.generation + 1, updated_at=now)
+    )
+    if result.rowcount == 0:
+        connection.execute(
+            insert(TableGeneration.__table__)
+            .values(table_name=table_name, generation=1, updated_at=now)
+        )
+
+
+def _reset(session, *args):
+    """Forget which tables were bumped once the transaction ends"""
+    session.info.pop(_BUMPED_KEY, None)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _bump_after_flush(session, flush_context):
+    """Bump tracked tables touched by a unit-of-work flush"""
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table_name = getattr(obj, '__tablename__', None)
+        if table_name in TRACKED_TABLES:
+            bump_generation(session, table_name)
+
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _bump_on_dml(orm_execute_state):
+    """Bump tracked tables targeted by INSERT/UPDATE/DELETE statements"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update
+            or orm_execute_state.is_delete):
+        return
+    target = getattr(orm_execute_state.statement, 'table', None)
+    table_name = getattr(target, 'name', None)
+    if table_name in TRACKED_TABLES:
+        bump_generation(orm_execute_state.session, table_name)
+
+
+event.listen(db.session, 'after_commit', _reset)
+event.listen(db.session, 'after_rollback', _reset)
+event.listen(db.session, 'after_soft_rollback', _reset)
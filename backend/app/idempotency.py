@@ -0,0 +1,354 @@
+"""
+Idempotency keys for task-creating and bulk write requests
+
+A client that retries a POST after a timeout cannot tell whether the first
+attempt was applied. Sending the same Idempotency-Key header on every
+attempt makes the retry safe: the first request to use a key claims it by
+inserting a pending row into idempotency_keys, runs, and stores its
+response there. Later requests with that key get the stored response back
+without running the view, so they never touch the tasks table.
+
+Stored responses are also kept in a per-process LRU, so most replays cost
+no query at all. Requests that arrive while the first one is still running
+wait for it rather than racing it. Within a process they wait on an event,
+and across processes they poll the pending row. While the first request
+runs, a heartbeat thread in its process refreshes the pending row's
+created_at every third of IDEMPOTENCY_LOCK_TIMEOUT, however long the request
+takes. A pending row not refreshed for IDEMPOTENCY_LOCK_TIMEOUT therefore
+belongs to a crashed worker and can be taken over.
+
+Keys expire after IDEMPOTENCY_TTL seconds. Expired rows are ignored and
+replaced on use, and purge_expired removes them in bulk (see the
+purge-idempotency-keys CLI command). Responses with a 5xx status are not
+stored, so the key can be retried.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+# Response headers replayed along with the status and body
+STORED_HEADERS = ('Content-Type', 'Location', 'ETag', 'Last-Modified')
+
+StoredResponse = namedtuple(
+    'StoredResponse', 'fingerprint status_code headers body expires_at'
+)
+
+
+class IdempotencyKeyReused(Exception):
+    """The key was already used for a different request"""
+
+
+class IdempotencyInProgress(Exception):
+    """The request that holds the key did not finish in time"""
+
+
+def request_fingerprint(request):
+    """
+    Hash identifying a request's method, path, query string and body
+
+    Args:
+        request: Flask request
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in (request.method.encode(), request.path.encode(), request.query_string,
+                 request.get_data()):
+        digest.update(len(part).to_bytes(8, 'big'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Claims keys and stores responses in idempotency_keys behind an LRU
+
+    Args:
+        max_entries (int): Stored responses kept in memory
+        ttl (float): Seconds a key is remembered
+        wait_timeout (float): Seconds a duplicate waits for the first request
+        lock_timeout (float): Seconds without a heartbeat after which a
+            pending key is abandoned
+        poll_interval (float): Seconds between checks of another process's
+            pending key
+        heartbeat_interval (float): Seconds between refreshes of the pending
+            keys this process holds; a third of lock_timeout by default
+    """
+
+    def __init__(self, max_entries=1024, ttl=86400, wait_timeout=30, lock_timeout=60,
+                 poll_interval=0.05, heartbeat_interval=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval or lock_timeout / 3
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._held = {}
+        self._heartbeat = None
+        self._lock = threading.Lock()
+
+    def _cached(self, cache_key):
+        """Unexpired stored response from the LRU, or None"""
+        with self._lock:
+            stored = self._entries.get(cache_key)
+            if stored is None:
+                return None
+            if stored.expires_at <= datetime.utcnow():
+                del self._entries[cache_key]
+                return None
+            self._entries.move_to_end(cache_key)
+            return stored
+
+    def _remember(self, cache_key, stored):
+        with self._lock:
+            self._entries[cache_key] = stored
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _release(self, cache_key):
+        """Stop the key's heartbeat and wake the requests waiting on it"""
+        with self._lock:
+            self._held.pop(cache_key, None)
+            event = self._in_flight.pop(cache_key, None)
+        if event is not None:
+            event.set()
+
+    def _hold(self, cache_key, engine):
+        """Keep a claimed key's pending row fresh until it is released"""
+        with self._lock:
+            self._held[cache_key] = engine
+            # A forked child inherits the thread object but not the thread
+            if self._heartbeat is None or not self._heartbeat.is_alive():
+                self._heartbeat = threading.Thread(
+                    target=self._beat, name='idempotency-heartbeat', daemon=True
+                )
+                self._heartbeat.start()
+
+    def _beat(self):
+        """Refresh created_at of the held keys until none is left"""
+        while True:
+            time.sleep(self.heartbeat_interval)
+            with self._lock:
+                if not self._held:
+                    self._heartbeat = None
+                    return
+                held = list(self._held.items())
+
+            now = datetime.utcnow()
+            for (scope, key), engine in held:
+                try:
+                    with engine.begin() as connection:
+                        connection.execute(
+                            update(IdempotencyKey)
+                            .where(IdempotencyKey.scope == scope,
+                                   IdempotencyKey.key == key,
+                                   IdempotencyKey.status_code.is_(None))
+                            .values(created_at=now)
+                        )
+                except Exception:
+                    logger.warning('Could not refresh idempotency key %s', key,
+                                   exc_info=True)
+
+    @staticmethod
+    def _checked(stored, fingerprint):
+        if stored.fingerprint != fingerprint:
+            raise IdempotencyKeyReused()
+        return stored
+
+    def claim(self, session, scope, key, fingerprint):
+        """
+        Claim a key for a request, or return the response stored under it
+
+        When this returns None the caller owns the key and must call
+        complete or abandon once the request has been handled.
+
+        Args:
+            session: SQLAlchemy session; the claim is committed through it
+            scope (str): Method and path
+            key (str): Idempotency-Key header value
+            fingerprint (str): request_fingerprint of the request
+
+        Returns:
+            StoredResponse: Response to replay, or None if the key is claimed
+
+        Raises:
+            IdempotencyKeyReused: The key belongs to a different request
+            IdempotencyInProgress: The first request is still running after
+                wait_timeout seconds
+        """
+        cache_key = (scope, key)
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            stored = self._cached(cache_key)
+            if stored is not None:
+                return self._checked(stored, fingerprint)
+
+            with self._lock:
+                event = self._in_flight.get(cache_key)
+                if event is None:
+                    self._in_flight[cache_key] = threading.Event()
+            if event is not None:
+                # Another request in this process has the key: wait for it,
+                # then look again (it may also have given the key up)
+                if not event.wait(max(deadline - time.monotonic(), 0)):
+                    raise IdempotencyInProgress()
+                continue
+
+            try:
+                stored = self._claim_row(session, scope, key, fingerprint, deadline)
+            except Exception:
+                self._release(cache_key)
+                raise
+            if stored is not None:
+                self._remember(cache_key, stored)
+                self._release(cache_key)
+                return self._checked(stored, fingerprint)
+            self._hold(cache_key, session.get_bind())
+            return None
+
+    def _claim_row(self, session, scope, key, fingerprint, deadline):
+        """Insert the pending row, or wait for the stored response of another process"""
+        identity = (IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+        while True:
+            now = datetime.utcnow()
+            try:
+                session.execute(insert(IdempotencyKey).values(
+                    scope=scope, key=key, fingerprint=fingerprint,
+                    created_at=now, expires_at=now + timedelta(seconds=self.ttl)
+                ))
+                session.commit()
+                return None
+            except IntegrityError:
+                session.rollback()
+
+            row = session.execute(
+                select(IdempotencyKey).where(*identity)
+            ).scalar_one_or_none()
+            session.commit()
+            if row is None:
+                continue
+
+            if row.expires_at <= now:
+                session.execute(delete(IdempotencyKey).where(
+                    *identity, IdempotencyKey.expires_at <= now
+                ))
+                session.commit()
+                continue
+
+            if row.status_code is not None:
+                return StoredResponse(row.fingerprint, row.status_code, row.headers,
+                                      row.body, row.expires_at)
+
+            if row.fingerprint != fingerprint:
+                raise IdempotencyKeyReused()
+
+            if row.created_at <= now - timedelta(seconds=self.lock_timeout):
+                # No heartbeat: the owner died mid-request, take the key over
+                taken = session.execute(
+                    update(IdempotencyKey)
+                    .where(*identity, IdempotencyKey.status_code.is_(None),
+                           IdempotencyKey.created_at == row.created_at)
+                    .values(
+                        created_at=now, expires_at=now + timedelta(seconds=self.ttl)
+                    )
+                ).rowcount
+                session.commit()
+                if taken:
+                    return None
+                continue
+
+            if time.monotonic() >= deadline:
+                raise IdempotencyInProgress()
+            time.sleep(self.poll_interval)
+
+    def complete(self, session, scope, key, fingerprint, response):
+        """
+        Store the response of a claimed key and wake waiting duplicates
+
+        Args:
+            session: SQLAlchemy session
+            scope (str): Method and path
+            key (str): Claimed key
+            fingerprint (str): Fingerprint the key was claimed with
+            response: Flask response to store
+        """
+        cache_key = (scope, key)
+        try:
+            headers = {name: response.headers[name] for name in STORED_HEADERS
+                       if name in response.headers}
+            body = response.get_data()
+            expires_at = datetime.utcnow() + timedelta(seconds=self.ttl)
+            session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+                .values(status_code=response.status_code, headers=headers, body=body,
+                        expires_at=expires_at)
+            )
+            session.commit()
+            self._remember(cache_key, StoredResponse(fingerprint, response.status_code,
+                                                     headers, body, expires_at))
+        finally:
+            self._release(cache_key)
+
+    def abandon(self, session, scope, key):
+        """Give a claimed key up so that a retry runs the request again"""
+        try:
+            session.rollback()
+            session.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.scope == scope, IdempotencyKey.key == key,
+                IdempotencyKey.status_code.is_(None)
+            ))
+            session.commit()
+        finally:
+            self._release((scope, key))
+
+    def clear(self):
+        """Drop every stored response held in memory"""
+        with self._lock:
+            self._entries.clear()
+
+
+def purge_expired(session, now=None):
+    """
+    Delete expired idempotency keys
+
+    Args:
+        session: SQLAlchemy session; the caller commits
+        now (datetime): Reference time, defaults to the current time
+
+    Returns:
+        int: Number of deleted keys
+    """
+    now = now or datetime.utcnow()
+    return session.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now)
+    ).rowcount
+
+
+def init_idempotency(app):
+    """Install the application's IdempotencyStore"""
+    app.extensions['idempotency_store'] = IdempotencyStore(
+        max_entries=app.config['IDEMPOTENCY_CACHE_SIZE'],
+        ttl=app.config['IDEMPOTENCY_TTL'],
+        wait_timeout=app.config['IDEMPOTENCY_WAIT_TIMEOUT'],
+        lock_timeout=app.config['IDEMPOTENCY_LOCK_TIMEOUT']
+    )
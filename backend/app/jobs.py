@@ -0,0 +1,348 @@
+"""
+Background jobs for long bulk operations
+
+Bulk requests called with async=true are validated in the request, stored
+as a row in the jobs table and answered with 202 straight away. A per-process
+thread pool of JOBS_MAX_CONCURRENT workers then runs them, so at most that
+many jobs write at once however many are queued.
+
+A job handler works in steps (a batch of inserts, a chunk of updates) and
+reports each one through JobContext.advance, which records progress and a
+checkpoint and commits them in the same transaction as the step's writes.
+After a crash or restart a job therefore resumes from its last checkpoint
+without repeating or losing work: queued jobs, and running jobs whose
+heartbeat is older than JOBS_STALE_AFTER seconds, are picked up again by
+JobRunner.resume. A step must finish well within JOBS_STALE_AFTER, or a
+second process could take the job over while it is still running.
+"""
+
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, func, or_, select, update
+
+from app.bulk import (
+    chunked, delete_tasks, insert_tasks, iter_id_chunks, new_task_values,
+    task_update_values, update_tasks
+)
+from app.counting import count_exact
+from app.extensions import db
+from app.filters import apply_task_filters
+from app.models import Job, Task
+
+logger = logging.getLogger(__name__)
+
+# Job kind -> handler(context) returning the job's result
+JOB_HANDLERS = {}
+
+
+def job_handler(kind):
+    """Register a function as the handler for a job kind"""
+    def register(handler):
+        JOB_HANDLERS[kind] = handler
+        return handler
+    return register
+
+
+class JobContext:
+    """
+    What a handler sees of its job
+
+    Args:
+        session: SQLAlchemy session the handler writes through
+        job (Job): The running job
+    """
+
+    def __init__(self, session, job):
+        self.session = session
+        self.job = job
+
+    @property
+    def params(self):
+        """Handler input stored when the job was queued"""
+        return self.job.params
+
+    @property
+    def checkpoint(self):
+        """Position saved by the last advance, empty on a first run"""
+        return self.job.checkpoint or {}
+
+    def set_total(self, total):
+        """Set the number of items the job will process"""
+        self.job.progress_total = total
+
+    def advance(self, done, checkpoint):
+        """
+        Commit a step of work together with its progress
+
+        Args:
+            done (int): Items processed by this step
+            checkpoint (dict): JSON-serializable position to resume from
+        """
+        self.job.progress_done += done
+        self.job.checkpoint = checkpoint
+        self.job.heartbeat_at = datetime.utcnow()
+        self.session.commit()
+
+
+class JobRunner:
+    """
+    Runs queued jobs on a bounded thread pool
+
+    Args:
+        app: Flask application whose context jobs run in
+        max_workers (int): Most jobs running at once in this process
+        stale_after (float): Seconds without a heartbeat after which a
+            running job is considered abandoned
+    """
+
+    def __init__(self, app, max_workers=2, stale_after=60):
+        self.app = app
+        self.max_workers = max_workers
+        self.stale_after = stale_after
+        self.resumed = False
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _pool(self):
+        """The thread pool, created again in a forked child process"""
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix='job'
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def enqueue(self, session, kind, params, total=None):
+        """
+        Store a new job and schedule it
+
+        Args:
+            session: SQLAlchemy session; the job is committed through it
+            kind (str): Registered handler name
+            params (dict): JSON-serializable handler input
+            total (int): Items to process, if known up front
+
+        Returns:
+            Job: The queued job
+        """
+        job = Job(id=uuid.uuid4().hex, kind=kind, status='queued', params=params,
+                  progress_total=total)
+        session.add(job)
+        session.commit()
+        self._pool().submit(self._execute, job.id)
+        return job
+
+    def _claimable(self, now):
+        """Condition for jobs no worker is currently running"""
+        stale = now - timedelta(seconds=self.stale_after)
+        return or_(
+            Job.status == 'queued',
+            and_(Job.status == 'running', Job.heartbeat_at < stale)
+        )
+
+    def resume(self, session):
+        """
+        Schedule jobs left queued, or abandoned while running, e.g. by a restart
+
+        Returns:
+            list: Ids of the scheduled jobs
+        """
+        statement = (
+            select(Job.id)
+            .where(self._claimable(datetime.utcnow()))
+            .order_by(Job.created_at)
+        )
+        job_ids = session.execute(statement).scalars().all()
+        for job_id in job_ids:
+            self._pool().submit(self._execute, job_id)
+        return job_ids
+
+    def shutdown(self, wait=True):
+        """Stop the pool; queued jobs stay in the table for resume"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._pid == os.getpid():
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _claim(self, session, job_id):
+        """Mark a job running unless another worker already has it"""
+        now = datetime.utcnow()
+        result = session.execute(
+            update(Job)
+            .where(Job.id == job_id, self._claimable(now))
+            .values(status='running', heartbeat_at=now,
+                    started_at=func.coalesce(Job.started_at, now))
+        )
+        session.commit()
+        return result.rowcount == 1
+
+    def _execute(self, job_id):
+        """Worker thread: run one job to completion or failure"""
+        with self.app.app_context():
+            session = db.session
+            try:
+                if not self._claim(session, job_id):
+                    return
+                job = session.get(Job, job_id)
+                result = JOB_HANDLERS[job.kind](JobContext(session, job))
+                job.status = 'succeeded'
+                job.result = result
+                job.finished_at = job.heartbeat_at = datetime.utcnow()
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.exception('Job %s failed', job_id)
+                session.execute(
+                    update(Job).where(Job.id == job_id).values(
+                        status='failed',
+                        error=str(e) or e.__class__.__name__,
+                        finished_at=datetime.utcnow()
+                    )
+                )
+                session.commit()
+
+
+@job_handler('bulk_create')
+def run_bulk_create(context):
+    """
+    Insert validated tasks batch by batch
+
+    Params: tasks (accepted task data), indexes (their positions in the
+    request), count (request length) and errors (rejected items).
+    """
+    params = context.params
+    ids = list(context.checkpoint.get('ids', []))
+    batch_size = current_app.config['BULK_BATCH_SIZE']
+
+    pending = params['tasks'][len(ids):]
+    for batch in chunked(pending, batch_size):
+        now = datetime.utcnow()
+        rows = insert_tasks(
+            context.session, [new_task_values(item, now) for item in batch],
+            batch_size, fields=['id']
+        )
+        ids.extend(row.id for row in rows)
+        context.advance(len(batch), {'ids': ids})
+
+    request_ids = [None] * params['count']
+    for index, task_id in zip(params['indexes'], ids):
+        request_ids[index] = task_id
+    return {
+        'created': len(ids),
+        'failed': len(params['errors']),
+        'ids': request_ids,
+        'errors': params['errors']
+    }
+
+
+@job_handler('bulk_update')
+def run_bulk_update(context):
+    """
+    Apply updates to a list of tasks chunk by chunk
+
+    Params: task_ids (sorted, distinct), updates (validated) and versions
+    (expected version by task id, as a JSON object). The result lists the
+    versioned tasks that were not updated because they had changed (or
+    were deleted) since.
+    """
+    params = context.params
+    task_ids = params['task_ids']
+    versions = {
+        int(key): version for key, version in params.get('versions', {}).items()
+    }
+    position = context.checkpoint.get('position', 0)
+    updated = context.checkpoint.get('updated', 0)
+    skipped = list(context.checkpoint.get('skipped', []))
+    chunk_size = current_app.config['BULK_UPDATE_CHUNK_SIZE']
+    values = task_update_values(params['updates'])
+
+    for start in range(position, len(task_ids), chunk_size):
+        chunk = task_ids[start:start + chunk_size]
+        rows = update_tasks(
+            context.session, chunk, values, fields=['id'], versions=versions
+        )
+        updated_ids = {row.id for row in rows}
+        updated += len(rows)
+        skipped.extend(
+            task_id for task_id in chunk
+            if task_id in versions and task_id not in updated_ids
+        )
+        context.advance(len(chunk), {
+            'position': start + len(chunk), 'updated': updated, 'skipped': skipped
+        })
+
+    return {'updated': updated, 'version_conflicts': skipped}
+
+
+@job_handler('filter_mutation')
+def run_filter_mutation(context):
+    """
+    Update or delete the tasks matching a filter, in keyset chunks
+
+    Params: filters (normalized) and updates (validated, or None to delete).
+    """
+    params = context.params
+    session = context.session
+    statement, _ = apply_task_filters(
+        select(Task.id), params['filters'], session.get_bind().dialect.name
+    )
+    if context.job.progress_total is None:
+        context.set_total(count_exact(session, statement))
+
+    updates = params['updates']
+    values = None if updates is None else task_update_values(updates)
+    affected = context.checkpoint.get('affected', 0)
+
+    chunks = iter_id_chunks(
+        session, statement, current_app.config['BULK_UPDATE_CHUNK_SIZE'],
+        after=context.checkpoint.get('last_id')
+    )
+    for task_ids in chunks:
+        if values is None:
+            affected += delete_tasks(session, task_ids)
+        else:
+            affected += len(update_tasks(session, task_ids, values, fields=['id']))
+        context.advance(len(task_ids), {'last_id': task_ids[-1], 'affected': affected})
+
+    return {'action': 'delete' if updates is None else 'update', 'affected': affected}
+
+
+def init_jobs(app):
+    """
+    Install the application's JobRunner
+
+    With JOBS_RESUME_ON_START, the first request a process serves schedules
+    the jobs an earlier process left unfinished.
+    """
+    runner = JobRunner(
+        app,
+        max_workers=app.config['JOBS_MAX_CONCURRENT'],
+        stale_after=app.config['JOBS_STALE_AFTER']
+    )
+    app.extensions['job_runner'] = runner
+
+    if not app.config['JOBS_RESUME_ON_START']:
+        return
+
+    @app.before_request
+    def resume_jobs():
+        if runner.resumed:
+            return
+        with runner._lock:
+            if runner.resumed:
+                return
+            runner.resumed = True
+        try:
+            runner.resume(db.session)
+        except Exception:
+            # e.g. the jobs table does not exist yet; serve the request anyway
+            db.session.rollback()
+            logger.exception('Could not resume unfinished jobs')
@@ -5,6 +5,7 @@ Defines the Task model and related database schema.
 """
 
 from datetime import datetime
+from sqlalchemy import DDL, event, true, false
 from app.extensions import db
 
 
@@ -21,6 +22,8 @@ class Task(db.Model):
         created_at (datetime): Creation timestamp
         updated_at (datetime): Last update timestamp
         completed_at (datetime): Completion timestamp (null if not completed)
+        version (int): Incremented by every update; clients send it back to
+            have an update rejected if the task changed in the meantime
     """
     
     __tablename__ = 'tasks'
@@ -33,18 +36,58 @@ class Task(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     completed_at = db.Column(db.DateTime, nullable=True)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+
+    # Indexes matching the filter/sort shapes used by the API
+    __table_args__ = (
+        db.Index('ix_tasks_created_at_id', created_at, id),
+        db.Index('ix_tasks_updated_at_id', updated_at, id),
+        db.Index('ix_tasks_title_id', title, id),
+        db.Index('ix_tasks_priority_id', priority, id),
+        db.Index('ix_tasks_priority_created_at', priority, created_at),
+        db.Index('ix_tasks_completed_priority', completed, priority),
+        db.Index(
+            'ix_tasks_pending_created_at', created_at,
+            sqlite_where=completed == false(),
+            postgresql_where=completed == false()
+        ),
+        db.Index(
+            'ix_tasks_done_created_at', created_at,
+            sqlite_where=completed == true(),
+            postgresql_where=completed == true()
+        ),
+    )
+
+    # Serializable fields, in to_dict order, and which of them are timestamps
+    FIELDS = (
+        'id', 'title', 'description', 'priority', 'completed',
+        'created_at', 'updated_at', 'completed_at', 'version'
+    )
+    TIMESTAMP_FIELDS = frozenset(('created_at', 'updated_at', 'completed_at'))
     
     def __repr__(self):
         """String representation of Task object"""
         return f'<Task {self.id}: {self.title}>'
     
-    def to_dict(self):
+    def to_dict(self, fields=None):
         """
         Convert Task object to dictionary for JSON serialization
+
+        Args:
+            fields (list): Optional subset of FIELDS to include (sparse fieldset)
         
         Returns:
             dict: Task data as dictionary
         """
+        if fields is not None:
+            data = {}
+            for field in fields:
+                value = getattr(self, field)
+                if field in self.TIMESTAMP_FIELDS and value is not None:
+                    value = value.isoformat()
+                data[field] = value
+            return data
+
         return {
             'id': self.id,
             'title': self.title,
@@ -53,7 +96,10 @@ class Task(db.Model):
             'completed': self.completed,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+            'completed_at': (
+                self.completed_at.isoformat() if self.completed_at else None
+            ),
+            'version': self.version
         }
     
     @classmethod
@@ -72,4 +118,464 @@ class Task(db.Model):
             description=data.get('description', ''),
             priority=data.get('priority', 'Medium'),
             completed=data.get('completed', False)
-        )
\ No newline at end of file
+        )
+
+
+class TableGeneration(db.Model):
+    """
+    Write generation counter for a table
+
+    Bumped inside every transaction that writes to the table (see
+    app.generation), so any process can cheaply tell whether data derived
+    from the table is still current.
+
+    Attributes:
+        table_name (str): Name of the tracked table
+        generation (int): Incremented once per committed write transaction
+        updated_at (datetime): Time of the last bump
+    """
+
+    __tablename__ = 'table_generations'
+
+    table_name = db.Column(db.String(64), primary_key=True)
+    generation = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        """String representation of TableGeneration object"""
+        return f'<TableGeneration {self.table_name}: {self.generation}>'
+
+
+class TaskCounter(db.Model):
+    """
+    Number of tasks in one (completed, priority) state
+
+    Maintained by database triggers on the tasks table in the same
+    transaction as every insert, delete and completed/priority update, so
+    task statistics are a read of a handful of rows (see app.stats).
+
+    Attributes:
+        completed (bool): Completion status (NULL is stored as false)
+        priority (str): Priority value (NULL is stored as '')
+        task_count (int): Number of tasks in this state
+    """
+
+    __tablename__ = 'task_counters'
+
+    completed = db.Column(db.Boolean, primary_key=True)
+    priority = db.Column(db.String(10), primary_key=True)
+    task_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        """String representation of TaskCounter object"""
+        return f'<TaskCounter {self.completed}/{self.priority}: {self.task_count}>'
+
+
+class TaskActivity(db.Model):
+    """
+    Tasks created and completed within one hour
+
+    Maintained by database triggers on the tasks table, like TaskCounter.
+    Rows mirror the current tasks: deleting a task or clearing its
+    completed_at takes it back out of its hour (see app.timeseries).
+
+    Attributes:
+        bucket_start (datetime): Start of the hour (UTC)
+        created_count (int): Tasks whose created_at falls in the hour
+        completed_count (int): Tasks whose completed_at falls in the hour
+    """
+
+    __tablename__ = 'task_activity'
+
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    created_count = db.Column(db.Integer, nullable=False, default=0)
+    completed_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        """String representation of TaskActivity object"""
+        counts = f'+{self.created_count}/{self.completed_count}'
+        return f'<TaskActivity {self.bucket_start}: {counts}>'
+
+
+class Job(db.Model):
+    """
+    Background job record (see app.jobs)
+
+    Attributes:
+        id (str): Random hex identifier
+        kind (str): Registered handler name, e.g. 'bulk_update'
+        status (str): queued, running, succeeded or failed
+        params (dict): Handler input, validated before the job was queued
+        checkpoint (dict): Handler position, committed with each step of
+            work so a restarted job resumes where it stopped
+        result (dict): Handler output once succeeded
+        error (str): Failure message once failed
+        progress_done (int): Items processed so far
+        progress_total (int): Items to process, if known
+        created_at (datetime): Queue time
+        started_at (datetime): First start time
+        heartbeat_at (datetime): Last progress report of a running job
+        finished_at (datetime): Completion time
+    """
+
+    __tablename__ = 'jobs'
+
+    STATUSES = ('queued', 'running', 'succeeded', 'failed')
+
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(32), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default='queued')
+    params = db.Column(db.JSON, nullable=False)
+    checkpoint = db.Column(db.JSON)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    progress_done = db.Column(db.Integer, nullable=False, default=0)
+    progress_total = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_jobs_status_heartbeat_at', status, heartbeat_at),
+    )
+
+    def __repr__(self):
+        """String representation of Job object"""
+        return f'<Job {self.id}: {self.kind} {self.status}>'
+
+    def to_dict(self, now=None):
+        """
+        Convert Job object to dictionary for JSON serialization
+
+        Args:
+            now (datetime): Reference time for a running job's throughput
+
+        Returns:
+            dict: Job status, progress, throughput (items per second since
+                the job started) and result
+        """
+        percent = None
+        if self.progress_total:
+            percent = round(self.progress_done / self.progress_total * 100, 2)
+
+        throughput = None
+        if self.started_at is not None:
+            end = self.finished_at or now or datetime.utcnow()
+            elapsed = (end - self.started_at).total_seconds()
+            if elapsed > 0:
+                throughput = round(self.progress_done / elapsed, 2)
+
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': {
+                'done': self.progress_done,
+                'total': self.progress_total,
+                'percent': percent
+            },
+            'items_per_second': throughput,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class IdempotencyKey(db.Model):
+    """
+    Stored response for a request sent with an Idempotency-Key header
+    (see app.idempotency)
+
+    Attributes:
+        scope (str): Method and path the key was used on
+        key (str): Client-chosen key
+        fingerprint (str): Hash of the request; reusing a key for a
+            different request is rejected
+        status_code (int): Response status, or None while the first
+            request is still being processed
+        headers (dict): Response headers worth replaying
+        body (bytes): Response body
+        created_at (datetime): When the first request claimed the key
+        expires_at (datetime): When the key may be forgotten
+    """
+
+    __tablename__ = 'idempotency_keys'
+
+    scope = db.Column(db.String(64), primary_key=True)
+    key = db.Column(db.String(255), primary_key=True)
+    fingerprint = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer)
+    headers = db.Column(db.JSON)
+    body = db.Column(db.LargeBinary)
+    created_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        """String representation of IdempotencyKey object"""
+        return f'<IdempotencyKey {self.scope} {self.key}: {self.status_code}>'
+
+
+# Full-text search structures are created alongside the tasks table. SQLite
+# gets an external-content FTS5 index kept in sync by triggers; PostgreSQL
+# gets a GIN index over the same tsvector expression used by app.search.
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description,
+        content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au
+    AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+POSTGRES_FTS_DDL = [
+    """
+    CREATE INDEX IF NOT EXISTS ix_tasks_search ON tasks USING GIN (
+        to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))
+    )
+    """,
+]
+
+for statement in SQLITE_FTS_DDL:
+    event.listen(
+        Task.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite')
+    )
+event.listen(
+    Task.__table__, 'after_drop',
+    DDL('DROP TABLE IF EXISTS tasks_fts').execute_if(dialect='sqlite')
+)
+
+for statement in POSTGRES_FTS_DDL:
+    event.listen(
+        Task.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql')
+    )
+
+# Tables and indexes created by the DDL in this module rather than declared
+# on a model: the FTS5 table with its tasks_fts_* shadow tables, and the GIN
+# index. Alembic does not reflect triggers or functions.
+DDL_MANAGED_PREFIXES = ('tasks_fts', 'ix_tasks_search')
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """
+    Alembic autogenerate filter leaving the DDL-managed objects alone
+
+    Without it, every autogenerated migration would drop the search index.
+    """
+    if reflected and compare_to is None and type_ in ('table', 'index'):
+        return not (name or '').startswith(DDL_MANAGED_PREFIXES)
+    return True
+
+
+# Task counters are maintained by row triggers on tasks, which covers ORM
+# flushes, set-based UPDATE/DELETE statements and raw SQL alike.
+SQLITE_COUNTER_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS task_counters_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_counters (completed, priority, task_count)
+        VALUES (coalesce(new.completed, 0), coalesce(new.priority, ''), 1)
+        ON CONFLICT (completed, priority) DO UPDATE SET task_count = task_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_counters_ad AFTER DELETE ON tasks BEGIN
+        UPDATE task_counters SET task_count = task_count - 1
+        WHERE completed = coalesce(old.completed, 0)
+            AND priority = coalesce(old.priority, '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_counters_au
+    AFTER UPDATE OF completed, priority ON tasks
+    WHEN coalesce(old.completed, 0) <> coalesce(new.completed, 0)
+        OR coalesce(old.priority, '') <> coalesce(new.priority, '')
+    BEGIN
+        UPDATE task_counters SET task_count = task_count - 1
+        WHERE completed = coalesce(old.completed, 0)
+            AND priority = coalesce(old.priority, '');
+        INSERT INTO task_counters (completed, priority, task_count)
+        VALUES (coalesce(new.completed, 0), coalesce(new.priority, ''), 1)
+        ON CONFLICT (completed, priority) DO UPDATE SET task_count = task_count + 1;
+    END
+    """,
+]
+
+POSTGRES_COUNTER_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION task_counters_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE task_counters SET task_count = task_count - 1
+            WHERE completed = coalesce(OLD.completed, false)
+                AND priority = coalesce(OLD.priority, '');
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO task_counters (completed, priority, task_count)
+            VALUES (coalesce(NEW.completed, false), coalesce(NEW.priority, ''), 1)
+            ON CONFLICT (completed, priority)
+            DO UPDATE SET task_count = task_counters.task_count + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER task_counters_insert_delete AFTER INSERT OR DELETE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION task_counters_apply()
+    """,
+    """
+    CREATE TRIGGER task_counters_update AFTER UPDATE OF completed, priority ON tasks
+    FOR EACH ROW WHEN (
+        coalesce(OLD.completed, false) IS DISTINCT FROM coalesce(NEW.completed, false)
+        OR coalesce(OLD.priority, '') IS DISTINCT FROM coalesce(NEW.priority, '')
+    )
+    EXECUTE FUNCTION task_counters_apply()
+    """,
+]
+
+for statement in SQLITE_COUNTER_DDL:
+    event.listen(
+        Task.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite')
+    )
+
+for statement in POSTGRES_COUNTER_DDL:
+    event.listen(
+        Task.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql')
+    )
+event.listen(
+    Task.__table__, 'after_drop',
+    DDL('DROP FUNCTION IF EXISTS task_counters_apply()')
+    .execute_if(dialect='postgresql')
+)
+
+
+# Hourly activity rollups use the same trigger approach. SQLite truncates
+# with strftime into SQLAlchemy's DateTime storage format so that rollup
+# rows compare correctly against bound datetime parameters (DDL applies
+# %-formatting to its statement, hence the doubled %%).
+SQLITE_ACTIVITY_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS task_activity_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_activity (bucket_start, created_count, completed_count)
+        SELECT strftime('%%Y-%%m-%%d %%H:00:00.000000', new.created_at), 1, 0
+        WHERE new.created_at IS NOT NULL
+        ON CONFLICT (bucket_start) DO UPDATE SET created_count = created_count + 1;
+        INSERT INTO task_activity (bucket_start, created_count, completed_count)
+        SELECT strftime('%%Y-%%m-%%d %%H:00:00.000000', new.completed_at), 0, 1
+        WHERE new.completed_at IS NOT NULL
+        ON CONFLICT (bucket_start) DO UPDATE SET completed_count = completed_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_activity_ad AFTER DELETE ON tasks BEGIN
+        UPDATE task_activity SET created_count = created_count - 1
+        WHERE bucket_start = strftime('%%Y-%%m-%%d %%H:00:00.000000', old.created_at);
+        UPDATE task_activity SET completed_count = completed_count - 1
+        WHERE bucket_start = strftime('%%Y-%%m-%%d %%H:00:00.000000', old.completed_at);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_activity_au_created
+    AFTER UPDATE OF created_at ON tasks
+    WHEN old.created_at IS NOT new.created_at
+    BEGIN
+        UPDATE task_activity SET created_count = created_count - 1
+        WHERE bucket_start = strftime('%%Y-%%m-%%d %%H:00:00.000000', old.created_at);
+        INSERT INTO task_activity (bucket_start, created_count, completed_count)
+        SELECT strftime('%%Y-%%m-%%d %%H:00:00.000000', new.created_at), 1, 0
+        WHERE new.created_at IS NOT NULL
+        ON CONFLICT (bucket_start) DO UPDATE SET created_count = created_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_activity_au_completed
+    AFTER UPDATE OF completed_at ON tasks
+    WHEN old.completed_at IS NOT new.completed_at
+    BEGIN
+        UPDATE task_activity SET completed_count = completed_count - 1
+        WHERE bucket_start = strftime('%%Y-%%m-%%d %%H:00:00.000000', old.completed_at);
+        INSERT INTO task_activity (bucket_start, created_count, completed_count)
+        SELECT strftime('%%Y-%%m-%%d %%H:00:00.000000', new.completed_at), 0, 1
+        WHERE new.completed_at IS NOT NULL
+        ON CONFLICT (bucket_start) DO UPDATE SET completed_count = completed_count + 1;
+    END
+    """,
+]
+
+POSTGRES_ACTIVITY_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION task_activity_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE'
+                AND OLD.created_at IS DISTINCT FROM NEW.created_at) THEN
+            UPDATE task_activity SET created_count = created_count - 1
+            WHERE bucket_start = date_trunc('hour', OLD.created_at);
+        END IF;
+        IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE'
+                AND OLD.completed_at IS DISTINCT FROM NEW.completed_at) THEN
+            UPDATE task_activity SET completed_count = completed_count - 1
+            WHERE bucket_start = date_trunc('hour', OLD.completed_at);
+        END IF;
+        IF NEW.created_at IS NOT NULL AND (TG_OP = 'INSERT' OR (TG_OP = 'UPDATE'
+                AND OLD.created_at IS DISTINCT FROM NEW.created_at)) THEN
+            INSERT INTO task_activity (bucket_start, created_count, completed_count)
+            VALUES (date_trunc('hour', NEW.created_at), 1, 0)
+            ON CONFLICT (bucket_start)
+            DO UPDATE SET created_count = task_activity.created_count + 1;
+        END IF;
+        IF NEW.completed_at IS NOT NULL AND (TG_OP = 'INSERT' OR (TG_OP = 'UPDATE'
+                AND OLD.completed_at IS DISTINCT FROM NEW.completed_at)) THEN
+            INSERT INTO task_activity (bucket_start, created_count, completed_count)
+            VALUES (date_trunc('hour', NEW.completed_at), 0, 1)
+            ON CONFLICT (bucket_start)
+            DO UPDATE SET completed_count = task_activity.completed_count + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER task_activity_changes
+    AFTER INSERT OR DELETE OR UPDATE OF created_at, completed_at ON tasks
+    FOR EACH ROW EXECUTE FUNCTION task_activity_apply()
+    """,
+]
+
+for statement in SQLITE_ACTIVITY_DDL:
+    event.listen(
+        Task.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite')
+    )
+
+for statement in POSTGRES_ACTIVITY_DDL:
+    event.listen(
+        Task.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql')
+    )
+event.listen(
+    Task.__table__, 'after_drop',
+    DDL('DROP FUNCTION IF EXISTS task_activity_apply()')
+    .execute_if(dialect='postgresql')
+)
@@ -0,0 +1,138 @@
+"""
+Keyset (cursor) pagination helpers
+
+Encodes the position of the last row of a page as an opaque cursor so the
+next page can be fetched with a ``WHERE (sort_key, id) > (...)`` predicate
+instead of an OFFSET scan. Every page then costs the same regardless of depth.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_, asc, desc
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded or does not match the query"""
+
+
+def _encode_value(value):
+    """Convert a sort key value to a JSON-safe representation"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(value, is_datetime):
+    """
+    Convert a JSON cursor value back to its column type
+
+    Raises:
+        TypeError: If the value cannot belong to the sort column
+        ValueError: If a timestamp is not in ISO 8601 format
+    """
+    if value is None:
+        return None
+    if is_datetime:
+        if not isinstance(value, str):
+            raise TypeError("Cursor value is not a timestamp")
+        return datetime.fromisoformat(value)
+    if isinstance(value, bool) or not isinstance(value, (str, int)):
+        raise TypeError("Cursor value is not a string or integer")
+    return value
+
+
+def encode_cursor(row, sort_field, sort_order):
+    """
+    Build an opaque cursor pointing just past the given row
+
+    Args:
+        row: Last row of the current page (must expose sort_field and id)
+        sort_field (str): Column the page is sorted by
+        sort_order (str): 'asc' or 'desc'
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    payload = {
+        's': sort_field,
+        'o': sort_order,
+        'v': _encode_value(getattr(row, sort_field)),
+        'id': row.id
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort_field, sort_order, is_datetime=False):
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor (str): Cursor string from a previous response
+        sort_field (str): Sort field of the current request
+        sort_order (str): Sort order of the current request
+        is_datetime (bool): Whether the sort column holds datetimes
+
+    Returns:
+        tuple: (sort_value, last_id)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed, holds values of the
+            wrong type, or was issued for a different sort field/order
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        sort_value = _decode_value(payload['v'], is_datetime)
+        last_id = payload['id']
+        if type(last_id) is not int:
+            raise TypeError("Cursor id is not an integer")
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Cursor is malformed") from e
+
+    if payload.get('s') != sort_field or payload.get('o') != sort_order:
+        raise InvalidCursorError("Cursor does not match the requested sort and order")
+
+    return sort_value, last_id
+
+
+def apply_keyset(query, sort_column, id_column, sort_order, position=None,
+                 pinned=False):
+    """
+    Order a query by (sort_column, id) and seek past a cursor position
+
+    Args:
+        query: SQLAlchemy query to paginate
+        sort_column: Column used as the primary sort key
+        id_column: Primary key column used as a unique tiebreaker
+        sort_order (str): 'asc' or 'desc'
+        position (tuple): Optional (sort_value, last_id) from decode_cursor
+        pinned (bool): True when an equality filter fixes sort_column to a
+            single value, so ordering and seeking on id alone is equivalent
+            and lets the planner use a plain id range
+
+    Returns:
+        Query: Query with keyset ordering and seek predicate applied
+    """
+    direction = desc if sort_order == 'desc' else asc
+
+    if pinned:
+        if position is not None:
+            last_id = position[1]
+            if sort_order == 'desc':
+                query = query.filter(id_column < last_id)
+            else:
+                query = query.filter(id_column > last_id)
+        return query.order_by(direction(id_column))
+
+    if position is not None:
+        sort_value, last_id = position
+        key = tuple_(sort_column, id_column)
+        if sort_order == 'desc':
+            query = query.filter(key < tuple_(sort_value, last_id))
+        else:
+            query = query.filter(key > tuple_(sort_value, last_id))
+
+    return query.order_by(direction(sort_column), direction(id_column))
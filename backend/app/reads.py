@@ -0,0 +1,80 @@
+"""
+Read-only task queries
+
+The list and detail endpoints only serialize the rows they fetch, so they
+select just the needed columns with Core ``select()`` instead of loading
+Task entities. Results come back as SQLAlchemy ``Row`` objects: compact
+tuple-based views with attribute and mapping access that skip ORM
+hydration, the identity map and change tracking.
+"""
+
+from sqlalchemy import select
+
+from app.models import Task
+
+
+def task_columns(fields=None, extra=()):
+    """
+    Columns to select for a sparse fieldset
+
+    Args:
+        fields (list): Requested fields, or None for every field
+        extra (tuple): Additional fields the caller needs internally,
+            e.g. the sort key for cursor encoding
+
+    Returns:
+        list: Task columns; id always comes first
+    """
+    names = dict.fromkeys(('id',) + tuple(fields or Task.FIELDS) + tuple(extra))
+    return [getattr(Task, name) for name in names]
+
+
+def select_tasks(fields=None, extra=()):
+    """
+    Build a column SELECT over the tasks table
+
+    Args:
+        fields (list): Requested fields, or None for every field
+        extra (tuple): Additional fields to select
+
+    Returns:
+        Select: Statement to filter, order and execute with session.execute
+    """
+    return select(*task_columns(fields, extra)).select_from(Task)
+
+
+def fetch_task(session, task_id, fields=None, extra=()):
+    """
+    Read one task as a row view
+
+    Args:
+        session: SQLAlchemy session
+        task_id (int): Task id
+        fields (list): Requested fields, or None for every field
+        extra (tuple): Additional fields to select
+
+    Returns:
+        Row: The task's columns, or None if it does not exist
+    """
+    statement = select_tasks(fields, extra).where(Task.id == task_id)
+    return session.execute(statement).first()
+
+
+def task_row_dict(row, fields=None):
+    """
+    Convert a task row view to the dictionary Task.to_dict would return
+
+    Args:
+        row: Row selected with select_tasks
+        fields (list): Fields to include, or None for every field
+
+    Returns:
+        dict: Task data as dictionary
+    """
+    data = {}
+    for field in fields or Task.FIELDS:
+        value = getattr(row, field)
+        if field in Task.TIMESTAMP_FIELDS and value is not None:
+            value = value.isoformat()
+        data[field] = value
+    return data
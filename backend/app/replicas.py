@@ -0,0 +1,275 @@
+"""
+Read replicas with read-your-writes consistency
+
+With SQLALCHEMY_REPLICA_URIS set, GET and HEAD requests send their plain
+SELECTs to one of the replicas (replica_0, replica_1, ...), round robin,
+through the RoutingSession (see app.routing). Writes, and everything
+outside a request (jobs, the group-commit writer, CLI commands), use the
+primary. The replica engines belong to the router rather than being
+Flask-SQLAlchemy binds, so create_all, drop_all and migrations never touch
+them; SQLite file replicas get the primary's connection profile.
+
+Replicas are kept up to date by something outside the application:
+streaming replication, litestream, or SQLite file copies made with the
+backup API. They therefore lag behind the primary. Two mechanisms bound
+what a client can observe:
+
+- Pinning (read-your-writes): every write request sets a cookie that
+  sends the client's reads to the primary for REPLICA_PIN_SECONDS.
+  A client therefore sees its own writes even before the replicas do.
+  The cookie carries the time the pin ends. Values further in the
+  future than the window are ignored, so a client cannot pin itself
+  for good.
+- Lag checks: every REPLICA_LAG_CHECK_INTERVAL seconds the router
+  compares the tasks table write generation (see app.generation) of
+  the primary with that of each replica. Reads skip replicas that are
+  more than REPLICA_MAX_LAG seconds of writes behind, or unreachable.
+  With no healthy replica, reads use the primary.
+
+Generations travel with the data, so caches and ETags keyed on them stay
+coherent when a request is served from a replica.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from functools import wraps
+
+from flask import request
+
+from app.extensions import db
+from app.generation import current_generation
+from app.routing import READ_BIND
+from app.sqlite_profile import create_profiled_engine
+
+logger = logging.getLogger(__name__)
+
+# Requests whose reads may be served by a replica
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def is_pinned(cookie, pin_seconds, now=None):
+    """
+    Whether a pin cookie still sends the client's reads to the primary
+
+    Args:
+        cookie (str): Cookie value, the time the pin ends, or None
+        pin_seconds (float): Length of the pin window
+        now (float): Current time.time(), for tests
+
+    Returns:
+        bool: True while the pin is active
+    """
+    try:
+        until = float(cookie)
+    except (TypeError, ValueError):
+        return False
+    now = time.time() if now is None else now
+    return now < until <= now + pin_seconds
+
+
+class ReplicaRouter:
+    """
+    Chooses the replica for each read from those keeping up with the primary
+
+    Counters:
+        primary_reads: Routed requests sent to the primary because no
+            replica was healthy
+        pinned_reads: Requests sent to the primary by a pin cookie
+        reads (per replica): Requests served by the replica
+
+    Args:
+        primary: Engine of the primary database
+        replicas (dict): Replica name -> engine
+        max_lag (float): Seconds of primary writes a replica may be missing
+            and still serve reads
+        check_interval (float): Seconds between lag measurements
+    """
+
+    def __init__(self, primary, replicas, max_lag=30, check_interval=1):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.primary_reads = 0
+        self.pinned_reads = 0
+        self._status = {
+            name: {
+                'healthy': False, 'lag_seconds': None,
+                'generations_behind': None, 'reads': 0
+            }
+            for name in replicas
+        }
+        self._checked_at = None
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+
+    def check(self):
+        """
+        Measure how far each replica is behind the primary
+
+        A replica's lag is the time between the primary's last write and
+        the last write the replica has applied, 0 once it has caught up.
+        It is None when the replica cannot be reached, or has none of the
+        primary's writes.
+        """
+        with self.primary.connect() as connection:
+            generation, updated_at = current_generation(connection)
+
+        measured = {}
+        for name, engine in self.replicas.items():
+            try:
+                with engine.connect() as connection:
+                    replica_generation, replica_updated_at = current_generation(
+                        connection
+                    )
+            except Exception:
+                logger.warning('Replica %s is unreachable', name, exc_info=True)
+                measured[name] = (None, None)
+                continue
+            behind = max(generation - replica_generation, 0)
+            if behind == 0:
+                lag = 0.0
+            elif replica_updated_at is None:
+                lag = None
+            else:
+                lag = (updated_at - replica_updated_at).total_seconds()
+            measured[name] = (behind, lag)
+
+        with self._lock:
+            for name, (behind, lag) in measured.items():
+                status = self._status[name]
+                status['generations_behind'] = behind
+                status['lag_seconds'] = lag
+                status['healthy'] = lag is not None and lag <= self.max_lag
+            self._checked_at = time.monotonic()
+
+    def _check_if_due(self):
+        """
+        Re-measure lag every check_interval seconds
+
+        Only the first measurement blocks. After that one thread measures
+        while the others keep routing on the previous results.
+        """
+        checked_at = self._checked_at
+        due = checked_at is None or time.monotonic() - checked_at >= self.check_interval
+        if not due:
+            return
+        if not self._check_lock.acquire(blocking=checked_at is None):
+            return
+        try:
+            self.check()
+        except Exception:
+            logger.exception('Could not measure replica lag')
+        finally:
+            self._check_lock.release()
+
+    def choose(self):
+        """
+        Pick the replica for a request's reads, round robin over the healthy ones
+
+        Returns:
+            Engine: Replica engine, or None to read from the primary
+        """
+        self._check_if_due()
+        with self._lock:
+            healthy = [
+                name for name, status in self._status.items() if status['healthy']
+            ]
+            if not healthy:
+                self.primary_reads += 1
+                return None
+            name = healthy[next(self._turn) % len(healthy)]
+            self._status[name]['reads'] += 1
+        return self.replicas[name]
+
+    def count_pinned(self):
+        """Record a request sent to the primary by its pin cookie"""
+        with self._lock:
+            self.pinned_reads += 1
+
+    def stats(self):
+        """
+        Report lag and read counters
+
+        Returns:
+            dict: max_lag, primary_reads, pinned_reads and replicas, a list of
+                name, healthy, lag_seconds, generations_behind and reads
+        """
+        with self._lock:
+            return {
+                'max_lag': self.max_lag,
+                'primary_reads': self.primary_reads,
+                'pinned_reads': self.pinned_reads,
+                'replicas': [
+                    dict(name=name, **status) for name, status in self._status.items()
+                ]
+            }
+
+
+def read_from_primary(view):
+    """
+    Send a view's reads to the primary even when replicas are configured
+
+    For GET endpoints whose data is written outside the client's own
+    requests and must be current, such as job progress.
+    """
+    @wraps(view)
+    def route_to_primary(*args, **kwargs):
+        db.session.info.pop(READ_BIND, None)
+        return view(*args, **kwargs)
+    return route_to_primary
+
+
+def init_replicas(app):
+    """
+    Install the application's ReplicaRouter and the per-request routing
+
+    The router is kept in app.extensions['replica_router'].
+    """
+    uris = app.config['SQLALCHEMY_REPLICA_URIS']
+    if not uris:
+        return
+
+    replicas = {
+        f'replica_{index}': create_profiled_engine(app.config, uri)
+        for index, uri in enumerate(uris)
+    }
+    with app.app_context():
+        router = ReplicaRouter(
+            db.engine, replicas,
+            max_lag=app.config['REPLICA_MAX_LAG'],
+            check_interval=app.config['REPLICA_LAG_CHECK_INTERVAL']
+        )
+    app.extensions['replica_router'] = router
+    pin_seconds = app.config['REPLICA_PIN_SECONDS']
+    cookie_name = app.config['REPLICA_PIN_COOKIE']
+
+    @app.before_request
+    def route_reads():
+        if request.method not in READ_METHODS:
+            return
+        if is_pinned(request.cookies.get(cookie_name), pin_seconds):
+            router.count_pinned()
+            return
+        engine = router.choose()
+        if engine is not None:
+            db.session.info[READ_BIND] = engine
+
+    @app.after_request
+    def pin_writer(response):
+        if request.method not in READ_METHODS:
+            response.set_cookie(
+                cookie_name, f'{time.time() + pin_seconds:.3f}', max_age=pin_seconds,
+                httponly=True, samesite='Lax'
+            )
+        return response
+
+    @app.teardown_request
+    def end_read_routing(exc):
+        if db.session.info.pop(READ_BIND, None) is not None:
+            # End the read transaction so the replica connection goes back
+            # to its pool; the session only outlives the request in tests
+            db.session.rollback()
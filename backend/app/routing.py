@@ -0,0 +1,42 @@
+"""
+Session bind routing
+
+db.session is a RoutingSession. Two session.info entries redirect its
+statements away from the primary:
+
+- SHARD_BIND: every statement of the session runs on this engine. Task
+  views set it to the shard that owns the task (see app.sharding).
+- READ_BIND: plain SELECT statements run on this engine; GET requests set
+  it to a read replica (see app.replicas). Flushes, INSERT/UPDATE/DELETE,
+  SELECT ... FOR UPDATE and textual SQL still go to the primary.
+
+SHARD_BIND takes precedence.
+"""
+
+from flask_sqlalchemy.session import Session
+
+SHARD_BIND = 'shard_bind'
+READ_BIND = 'read_bind'
+
+
+def is_plain_read(clause):
+    """Whether a statement is a SELECT that takes no locks"""
+    return (
+        clause is not None
+        and getattr(clause, 'is_select', False)
+        and getattr(clause, '_for_update_arg', None) is None
+    )
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session honouring session.info[SHARD_BIND] and [READ_BIND]"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            shard_bind = self.info.get(SHARD_BIND)
+            if shard_bind is not None:
+                return shard_bind
+            read_bind = self.info.get(READ_BIND)
+            if read_bind is not None and not self._flushing and is_plain_read(clause):
+                return read_bind
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -0,0 +1,192 @@
+"""
+Full-text search for tasks
+
+Translates the ``search`` query parameter into an index-backed full-text
+query: FTS5 on SQLite and a tsvector/GIN expression on PostgreSQL. Other
+backends fall back to the original substring match. Every term is matched
+as a prefix so partially typed words in the search box still hit.
+"""
+
+import html
+import re
+
+from sqlalchemy import or_, func, select, literal_column, column, table, text
+
+from app.models import Task
+
+
+HIGHLIGHT_OPEN = '<mark>'
+HIGHLIGHT_CLOSE = '</mark>'
+
+# Private-use characters the database wraps matches in; snippets are
+# HTML-escaped before they become the markers above
+_MATCH_OPEN = '\ue000'
+_MATCH_CLOSE = '\ue001'
+
+# bm25 column weights (title, description): a title hit outranks a body hit
+BM25_WEIGHTS = (10.0, 1.0)
+
+_TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# External-content FTS5 table maintained by the triggers in app.models
+tasks_fts = table('tasks_fts', column('rowid'))
+
+
+def parse_terms(search_query):
+    """
+    Split a raw search string into word terms
+
+    Args:
+        search_query (str): Raw user input
+
+    Returns:
+        list: Word terms with punctuation and FTS operators stripped
+    """
+    return _TERM_PATTERN.findall(search_query)
+
+
+def supports_full_text(dialect_name):
+    """Return whether the backend has a full-text index for tasks"""
+    return dialect_name in ('sqlite', 'postgresql')
+
+
+def _fts5_query(terms):
+    """Build an FTS5 MATCH expression requiring every term as a prefix"""
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _tsquery(terms):
+    """Build a to_tsquery expression requiring every term as a prefix"""
+    return ' & '.join(f'{term.lower()}:*' for term in terms)
+
+
+def _tsvector():
+    """tsvector expression matching the ix_tasks_search GIN index"""
+    # Literals rather than bound parameters, so the expression is textually
+    # identical to the indexed one and the planner can use the GIN index
+    empty = literal_column("''")
+    document = (
+        func.coalesce(Task.title, empty)
+        .op('||')(literal_column("' '"))
+        .op('||')(func.coalesce(Task.description, empty))
+    )
+    return func.to_tsvector(literal_column("'simple'"), document)
+
+
+def _fts5_matches(terms):
+    """Subquery of (id, rank) for FTS5 rows matching the terms"""
+    return (
+        select(
+            tasks_fts.c.rowid.label('id'),
+            func.bm25(literal_column('tasks_fts'), *BM25_WEIGHTS).label('rank')
+        )
+        .select_from(tasks_fts)
+        .where(
+            text('tasks_fts MATCH :fts_query').bindparams(fts_query=_fts5_query(terms))
+        )
+        .subquery('fts_matches')
+    )
+
+
+def apply_search(query, search_query, dialect_name, rank=False):
+    """
+    Restrict a Task query to rows matching a search string
+
+    Args:
+        query: Task query to filter
+        search_query (str): Raw search string (already stripped)
+        dialect_name (str): Name of the active database dialect
+        rank (bool): Whether the caller will order by relevance
+
+    Returns:
+        tuple: (query, rank_order) where rank_order is an ORDER BY clause
+            for best-first relevance, or None when ranking is unavailable
+    """
+    terms = parse_terms(search_query)
+
+    if not terms or not supports_full_text(dialect_name):
+        search_pattern = f"%{search_query}%"
+        query = query.filter(or_(
+            Task.title.ilike(search_pattern),
+            Task.description.ilike(search_pattern)
+        ))
+        return query, None
+
+    if dialect_name == 'sqlite':
+        matches = _fts5_matches(terms)
+        if rank:
+            # bm25() returns lower values for better matches
+            query = query.join(matches, matches.c.id == Task.id)
+            return query, matches.c.rank.asc()
+        return query.filter(Task.id.in_(select(matches.c.id))), None
+
+    tsquery = func.to_tsquery(literal_column("'simple'"), _tsquery(terms))
+    query = query.filter(_tsvector().op('@@')(tsquery))
+    return query, func.ts_rank(_tsvector(), tsquery).desc()
+
+
+def highlight_tasks(session, task_ids, search_query, dialect_name):
+    """
+    Build highlighted title and description snippets for a page of tasks
+
+    Only the rows of the current page are highlighted, so the cost does not
+    grow with the number of matches. Snippets are HTML: the task text is
+    escaped and only the <mark> markers around matches are markup.
+
+    Args:
+        session: SQLAlchemy session
+        task_ids (list): Ids of the tasks on the current page
+        search_query (str): Raw search string
+        dialect_name (str): Name of the active database dialect
+
+    Returns:
+        dict: Mapping of task id to {'title': str, 'description': str}
+    """
+    terms = parse_terms(search_query)
+    if not task_ids or not terms or not supports_full_text(dialect_name):
+        return {}
+
+    if dialect_name == 'sqlite':
+        statement = text(
+            "SELECT rowid, "
+            "highlight(tasks_fts, 0, :open, :close), "
+            "snippet(tasks_fts, 1, :open, :close, '...', 16) "
+            "FROM tasks_fts WHERE tasks_fts MATCH :fts_query "
+            "AND rowid IN (SELECT value FROM json_each(:ids))"
+        ).bindparams(
+            open=_MATCH_OPEN,
+            close=_MATCH_CLOSE,
+            fts_query=_fts5_query(terms),
+            ids='[' + ','.join(str(int(task_id)) for task_id in task_ids) + ']'
+        )
+    else:
+        options = f'StartSel={_MATCH_OPEN}, StopSel={_MATCH_CLOSE}'
+        tsquery = func.to_tsquery(literal_column("'simple'"), _tsquery(terms))
+        statement = select(
+            Task.id,
+            func.ts_headline(
+                literal_column("'simple'"), Task.title, tsquery,
+                options + ', HighlightAll=true'
+            ),
+            func.ts_headline(
+                literal_column("'simple'"), func.coalesce(Task.description, ''),
+                tsquery,
+                options + ', MaxWords=16, MinWords=8'
+            )
+        ).where(Task.id.in_(task_ids))
+
+    return {
+        row[0]: {'title': _markup(row[1]), 'description': _markup(row[2]) or None}
+        for row in session.execute(statement)
+    }
+
+
+def _markup(snippet):
+    """HTML-escape a snippet and mark its matches"""
+    if not snippet:
+        return snippet
+    return (
+        html.escape(snippet)
+        .replace(_MATCH_OPEN, HIGHLIGHT_OPEN)
+        .replace(_MATCH_CLOSE, HIGHLIGHT_CLOSE)
+    )
@@ -0,0 +1,197 @@
+"""
+Horizontal sharding of tasks
+
+With SQLALCHEMY_SHARD_URIS set, tasks are spread over several databases
+(shards). Each shard has the full schema, so the counter, full-text and
+generation triggers keep working per shard. Jobs and idempotency keys stay
+on SQLALCHEMY_DATABASE_URI, which may itself be listed as shard 0.
+
+Ids: the shard key is the task id. Shard k owns the ids above
+k << SHARD_ID_BITS and below (k + 1) << SHARD_ID_BITS, so:
+- A single-task request goes straight to the shard owning its id, with no
+  directory to consult.
+- Ids never collide across shards.
+- An existing unsharded database keeps its ids as shard 0.
+- For up to 8192 shards, ids stay below 2 ** 53, so JavaScript clients read
+  them exactly.
+
+A new task goes to the next shard in round-robin order. Its id is
+allocated inside its INSERT, as one more than the largest id in the
+shard's range (see next_task_id). SQLite runs that under the shard's write
+lock. Other backends should give each shard a sequence starting at its
+floor instead.
+
+Fan-out: listings and stats query every shard in parallel, each on its
+own session, and merge the results:
+- Sorted pages: every shard returns its rows ordered by (sort key, id),
+  and a k-way merge of those runs yields the page.
+- Totals and stats: summed.
+- Write generation: the sum of the shards' generations. It rises with
+  every write to any shard, so ETags and the result cache stay valid.
+"""
+
+import heapq
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.generation import current_generation
+from app.models import Task
+from app.sqlite_profile import create_profiled_engine
+
+SHARD_ID_BITS = 40
+
+# session.info key holding the index of the shard a task view runs on
+SHARD_INDEX = 'shard_index'
+
+
+def shard_of(task_id):
+    """Index of the shard owning a task id"""
+    return task_id >> SHARD_ID_BITS
+
+
+def next_task_id(shard):
+    """
+    SQL expression for the next free id on a shard
+
+    Assigned to a new Task's id, it is evaluated inside the INSERT.
+
+    Args:
+        shard (int): Shard index
+
+    Returns:
+        ScalarSelect: One more than the shard's largest id, or than its floor
+    """
+    floor = shard << SHARD_ID_BITS
+    return (
+        select(func.coalesce(func.max(Task.id), floor) + 1)
+        .where(Task.id >= floor, Task.id < floor + (1 << SHARD_ID_BITS))
+        .scalar_subquery()
+    )
+
+
+def merge_sorted(runs, sort_field, sort_order):
+    """
+    k-way merge of row lists each ordered by (sort_field, id)
+
+    NULL sort values come first ascending and last descending, as in SQLite.
+
+    Args:
+        runs (list): One ordered list of rows per shard
+        sort_field (str): Field the rows are ordered by
+        sort_order (str): 'asc' or 'desc'
+
+    Returns:
+        iterator: The rows of every run in one order
+    """
+    def key(row):
+        value = getattr(row, sort_field)
+        return value is not None, value, row.id
+    return heapq.merge(*runs, key=key, reverse=sort_order == 'desc')
+
+
+def sum_counts(counts):
+    """
+    Add up per-shard count dicts
+
+    Args:
+        counts (list): {key: count} dicts
+
+    Returns:
+        dict: {key: total count}
+    """
+    totals = {}
+    for shard_counts in counts:
+        for key, count in shard_counts.items():
+            totals[key] = totals.get(key, 0) + count
+    return totals
+
+
+class ShardSet:
+    """
+    The task shards and a thread pool to query them in parallel
+
+    Args:
+        engines (list): Engine of each shard, by shard index
+        max_workers (int): Shards queried at once by one fan-out; all of them
+            by default
+    """
+
+    def __init__(self, engines, max_workers=None):
+        self.engines = engines
+        self.max_workers = max_workers or len(engines)
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def __len__(self):
+        return len(self.engines)
+
+    def next_shard(self):
+        """Index of the shard for a new task, round robin"""
+        return next(self._turn) % len(self.engines)
+
+    def _pool(self):
+        """The thread pool, created again in a forked child process"""
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix='shard'
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def fan_out(self, work):
+        """
+        Run work on every shard in parallel
+
+        Args:
+            work: Callable taking a session and the shard index
+
+        Returns:
+            list: work's result for each shard, in shard order
+        """
+        def run(shard):
+            with Session(self.engines[shard]) as session:
+                return work(session, shard)
+
+        if len(self.engines) == 1:
+            return [run(0)]
+        return list(self._pool().map(run, range(len(self.engines))))
+
+    def generation(self):
+        """
+        Combined tasks write generation of the shards
+
+        Returns:
+            tuple: (sum of generations, latest updated_at or None)
+        """
+        results = self.fan_out(lambda session, shard: current_generation(session))
+        updated = [updated_at for _, updated_at in results if updated_at is not None]
+        return sum(generation for generation, _ in results), max(updated, default=None)
+
+    def create_all(self, metadata):
+        """Create the tables (and triggers) of metadata on every shard"""
+        for engine in self.engines:
+            metadata.create_all(engine)
+
+
+def init_sharding(app):
+    """
+    Install the application's ShardSet from SQLALCHEMY_SHARD_URIS
+
+    It is kept in app.extensions['task_shards']; task views look there to
+    decide whether to route to a shard.
+    """
+    uris = app.config['SQLALCHEMY_SHARD_URIS']
+    if not uris:
+        return
+    app.extensions['task_shards'] = ShardSet(
+        [create_profiled_engine(app.config, uri) for uri in uris],
+        max_workers=app.config['SHARD_FANOUT_WORKERS']
+    )
@@ -0,0 +1,221 @@
+"""
+SQLite connection profile
+
+SQLite's defaults suit a single short-lived process. With them a
+multi-threaded server has several problems:
+- Readers block the writer and the writer blocks readers (rollback
+  journal).
+- Every commit waits for a full fsync (synchronous=FULL).
+- Each connection keeps only a 2 MB page cache.
+
+For file databases the profile:
+- applies the SQLITE_* pragmas to every new DBAPI connection from an
+  engine 'connect' event:
+  - WAL lets readers proceed alongside the writer.
+  - synchronous=NORMAL syncs at checkpoints rather than at every commit.
+    This stays durable against application crashes. A power loss can
+    drop the last transactions but does not corrupt the database.
+  - mmap_size and cache_size keep hot pages in memory.
+  - temp_store keeps sort and temporary tables off disk.
+  - busy_timeout makes a connection wait for the write lock instead of
+    failing at once with "database is locked".
+- sizes the connection pool for a threaded server (SQLITE_POOL_*).
+
+At startup a self-test reads the pragmas back and logs any the database
+did not accept, e.g. WAL on a network file system.
+
+In-memory databases and other backends are left untouched.
+"""
+
+import logging
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+# Pragma -> config key, in the order they are applied
+PROFILE_PRAGMAS = (
+    ('journal_mode', 'SQLITE_JOURNAL_MODE'),
+    ('synchronous', 'SQLITE_SYNCHRONOUS'),
+    ('busy_timeout', 'SQLITE_BUSY_TIMEOUT'),
+    ('cache_size', 'SQLITE_CACHE_SIZE'),
+    ('mmap_size', 'SQLITE_MMAP_SIZE'),
+    ('temp_store', 'SQLITE_TEMP_STORE'),
+)
+
+# Numbers PRAGMA reports for named settings
+NAMED_PRAGMA_VALUES = {
+    'synchronous': {'OFF': 0, 'NORMAL': 1, 'FULL': 2, 'EXTRA': 3},
+    'temp_store': {'DEFAULT': 0, 'FILE': 1, 'MEMORY': 2},
+}
+
+
+def is_file_database(url):
+    """
+    Whether a database URL points at an SQLite database file
+
+    Args:
+        url (str or URL): SQLAlchemy database URL
+
+    Returns:
+        bool: False for other backends and in-memory databases
+    """
+    url = make_url(url)
+    if url.get_backend_name() != 'sqlite':
+        return False
+    database = url.database or ''
+    return (
+        database not in ('', ':memory:')
+        and not database.startswith('file::memory:')
+        and url.query.get('mode') != 'memory'
+    )
+
+
+def profile_pragmas(config):
+    """
+    Pragmas configured for the profile
+
+    Args:
+        config: Application config
+
+    Returns:
+        list: (pragma, value) pairs for every setting that is not None
+    """
+    return [
+        (pragma, config[key]) for pragma, key in PROFILE_PRAGMAS
+        if config[key] is not None
+    ]
+
+
+def engine_options(config):
+    """
+    Pool settings for an SQLite file engine
+
+    SQLAlchemy pools file databases with a QueuePool. It is sized here so
+    that every request thread, the group-commit writer and job workers can
+    hold a connection without waiting. Each connection also gets its own
+    page cache of up to SQLITE_CACHE_SIZE.
+
+    Args:
+        config: Application config
+
+    Returns:
+        dict: create_engine keyword arguments
+    """
+    return {
+        'pool_size': config['SQLITE_POOL_SIZE'],
+        'max_overflow': config['SQLITE_POOL_MAX_OVERFLOW'],
+        'pool_timeout': config['SQLITE_POOL_TIMEOUT'],
+    }
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    """Set pragmas on a raw sqlite3 connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in pragmas:
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+    finally:
+        cursor.close()
+
+
+def _expected(pragma, value):
+    """The value PRAGMA reads back after being set to value"""
+    if isinstance(value, str):
+        value = NAMED_PRAGMA_VALUES.get(pragma, {}).get(value.upper(), value.lower())
+    return value
+
+
+def check_profile(engine, pragmas):
+    """
+    Read the pragmas back from a fresh connection
+
+    Args:
+        engine: SQLAlchemy engine with the profile installed
+        pragmas (list): (pragma, value) pairs from profile_pragmas
+
+    Returns:
+        dict: pragma -> (expected, actual) for every pragma that differs
+    """
+    mismatches = {}
+    with engine.connect() as connection:
+        for pragma, value in pragmas:
+            actual = connection.exec_driver_sql(f'PRAGMA {pragma}').scalar()
+            if isinstance(actual, str):
+                actual = actual.lower()
+            if actual != _expected(pragma, value):
+                mismatches[pragma] = (value, actual)
+    return mismatches
+
+
+def init_engine_options(app):
+    """
+    Add the profile's pool settings to SQLALCHEMY_ENGINE_OPTIONS
+
+    Must run before db.init_app creates the engine. Explicitly configured
+    engine options take precedence.
+    """
+    if not app.config['SQLITE_PROFILE_ENABLED']:
+        return
+    if not is_file_database(app.config['SQLALCHEMY_DATABASE_URI']):
+        return
+    options = engine_options(app.config)
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def install_profile(engine, pragmas):
+    """Apply pragmas to every connection the engine opens from now on"""
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
+
+
+def create_profiled_engine(config, uri):
+    """
+    Engine for a database the application manages outside Flask-SQLAlchemy
+    (read replicas, task shards), with the profile if it is an SQLite file
+
+    Args:
+        config: Application config
+        uri (str): Database URL
+
+    Returns:
+        Engine: The new engine
+    """
+    if not (config['SQLITE_PROFILE_ENABLED'] and is_file_database(uri)):
+        return create_engine(uri)
+    engine = create_engine(uri, **engine_options(config))
+    install_profile(engine, profile_pragmas(config))
+    return engine
+
+
+def init_sqlite_profile(app):
+    """
+    Install the profile on the application's SQLite file engines and
+    self-test it (SQLITE_SELF_TEST)
+
+    Results are kept in app.extensions['sqlite_profile'] as
+    {bind key: mismatches}.
+    """
+    if not app.config['SQLITE_PROFILE_ENABLED']:
+        return
+
+    pragmas = profile_pragmas(app.config)
+    results = {}
+    with app.app_context():
+        for key, engine in db.engines.items():
+            if not is_file_database(engine.url):
+                continue
+            install_profile(engine, pragmas)
+            if not app.config['SQLITE_SELF_TEST']:
+                continue
+            mismatches = check_profile(engine, pragmas)
+            for pragma, (expected, actual) in mismatches.items():
+                logger.warning('SQLite %s: PRAGMA %s is %r, expected %r',
+                               engine.url.database, pragma, actual, expected)
+            results[key] = mismatches
+    app.extensions['sqlite_profile'] = results
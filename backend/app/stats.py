@@ -0,0 +1,162 @@
+"""
+Task statistics
+
+Every statistic is derived from per-(completed, priority) counts. Those are
+read from the trigger-maintained task_counters table, a constant-size read;
+count_by_state computes the same numbers with one grouped scan of tasks,
+which verify_counters and rebuild_counters use to detect and repair drift.
+"""
+
+from sqlalchemy import delete, func, insert, select
+
+from app.filters import VALID_PRIORITIES
+from app.models import Task, TaskCounter
+
+
+def count_by_state(session):
+    """
+    Count tasks per (completed, priority) pair in a single scan
+
+    Args:
+        session: SQLAlchemy session
+
+    Returns:
+        dict: {(completed, priority): count}; completed and priority are
+            as stored, so either may be None
+    """
+    rows = session.execute(
+        select(Task.completed, Task.priority, func.count())
+        .group_by(Task.completed, Task.priority)
+    ).all()
+    return {(completed, priority): count for completed, priority, count in rows}
+
+
+def build_task_stats(counts):
+    """
+    Derive the stats document from per-state counts
+
+    Args:
+        counts (dict): Output of count_by_state
+
+    Returns:
+        dict: total/completed/pending counts, completion rate, the priority
+            breakdown and its split into pending and completed tasks
+    """
+    breakdown = {priority.lower(): 0 for priority in VALID_PRIORITIES}
+    pending_by_priority = dict(breakdown)
+    completed_by_priority = dict(breakdown)
+
+    total_tasks = 0
+    completed_tasks = 0
+    for (completed, priority), count in counts.items():
+        total_tasks += count
+        if completed:
+            completed_tasks += count
+
+        if priority in VALID_PRIORITIES:
+            key = priority.lower()
+            breakdown[key] += count
+            if completed:
+                completed_by_priority[key] += count
+            else:
+                pending_by_priority[key] += count
+
+    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+
+    return {
+        "total_tasks": total_tasks,
+        "completed_tasks": completed_tasks,
+        "pending_tasks": total_tasks - completed_tasks,
+        "completion_rate": round(completion_rate, 2),
+        "priority_breakdown": breakdown,
+        "pending_by_priority": pending_by_priority,
+        "completed_by_priority": completed_by_priority
+    }
+
+
+def _counter_key(completed, priority):
+    """Normalize a state the way the counter triggers store it"""
+    return bool(completed), priority or ''
+
+
+def read_counters(session):
+    """
+    Read the maintained per-state counts
+
+    Args:
+        session: SQLAlchemy session
+
+    Returns:
+        dict: {(completed, priority): count} for non-empty states; priority
+            is '' for tasks without one
+    """
+    rows = session.execute(
+        select(TaskCounter.completed, TaskCounter.priority, TaskCounter.task_count)
+        .where(TaskCounter.task_count != 0)
+    ).all()
+    return {(completed, priority): count for completed, priority, count in rows}
+
+
+def compute_task_stats(session):
+    """
+    Compute the stats document from the maintained counters
+
+    Args:
+        session: SQLAlchemy session
+
+    Returns:
+        dict: See build_task_stats
+    """
+    return build_task_stats(read_counters(session))
+
+
+def _scanned_counters(session):
+    """Per-state counts from a scan of tasks, keyed like read_counters"""
+    counts = {}
+    for (completed, priority), count in count_by_state(session).items():
+        key = _counter_key(completed, priority)
+        counts[key] = counts.get(key, 0) + count
+    return counts
+
+
+def verify_counters(session):
+    """
+    Compare the maintained counters with a scan of tasks
+
+    Args:
+        session: SQLAlchemy session
+
+    Returns:
+        dict: {(completed, priority): (stored, actual)} for every state whose
+            counter has drifted; empty when consistent
+    """
+    stored = read_counters(session)
+    actual = _scanned_counters(session)
+    return {
+        key: (stored.get(key, 0), actual.get(key, 0))
+        for key in set(stored) | set(actual)
+        if stored.get(key, 0) != actual.get(key, 0)
+    }
+
+
+def rebuild_counters(session):
+    """
+    Replace the counters with a fresh scan of tasks
+
+    The caller commits. On PostgreSQL, lock tasks first if writes may run
+    concurrently, or a write between the scan and the commit is lost.
+
+    Args:
+        session: SQLAlchemy session
+
+    Returns:
+        dict: The rebuilt {(completed, priority): count}
+    """
+    counts = _scanned_counters(session)
+    session.execute(delete(TaskCounter))
+    if counts:
+        session.execute(insert(TaskCounter), [
+            {'completed': completed, 'priority': priority, 'task_count': count}
+            for (completed, priority), count in counts.items()
+        ])
+    return counts
@@ -0,0 +1,188 @@
+"""
+Task throughput time series
+
+Tasks created and completed per hour are kept in the trigger-maintained
+task_activity table. A series is read from the rollup rows inside the
+requested range and summed into hour, day or week buckets, so its cost
+depends on the length of the range, never on the number of tasks.
+rebuild_activity recomputes the rollup from tasks, to backfill existing
+data or repair drift.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, insert, select, type_coerce
+
+from app.models import Task, TaskActivity
+from app.extensions import db
+
+
+TIMESERIES_BUCKETS = {
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1),
+}
+
+# Buckets returned when 'from' is omitted, and the most a request may ask for
+DEFAULT_TIMESERIES_POINTS = 30
+MAX_TIMESERIES_POINTS = 1000
+
+
+def bucket_start(moment, bucket):
+    """
+    Truncate a timestamp to the start of its bucket
+
+    Args:
+        moment (datetime): Naive UTC timestamp
+        bucket (str): 'hour', 'day' or 'week' (weeks start on Monday)
+
+    Returns:
+        datetime: Start of the bucket containing moment
+    """
+    start = moment.replace(minute=0, second=0, microsecond=0)
+    if bucket == 'hour':
+        return start
+    start = start.replace(hour=0)
+    if bucket == 'week':
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def parse_timestamp(raw):
+    """
+    Parse an ISO 8601 date or datetime query parameter
+
+    Args:
+        raw (str): e.g. '2026-10-01' or '2026-10-01T12:00:00Z'
+
+    Returns:
+        datetime: Naive UTC timestamp, or None if raw is empty
+
+    Raises:
+        ValueError: If raw is not an ISO 8601 date or datetime
+    """
+    if not raw:
+        return None
+    moment = datetime.fromisoformat(raw)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def timeseries_range(bucket, start=None, end=None):
+    """
+    Resolve the buckets covered by a request
+
+    Args:
+        bucket (str): Key of TIMESERIES_BUCKETS
+        start (datetime): Any moment in the first bucket, or None for
+            DEFAULT_TIMESERIES_POINTS buckets ending at end
+        end (datetime): Any moment in the last bucket, or None for now
+
+    Returns:
+        tuple: (first bucket start, exclusive end, number of buckets)
+    """
+    step = TIMESERIES_BUCKETS[bucket]
+    last = bucket_start(end or datetime.utcnow(), bucket)
+    if start is None:
+        first = last - step * (DEFAULT_TIMESERIES_POINTS - 1)
+    else:
+        first = bucket_start(start, bucket)
+    points = (last - first) // step + 1
+    return first, last + step, points
+
+
+def compute_timeseries(session, bucket, first, end):
+    """
+    Sum the hourly rollups into a dense series
+
+    Args:
+        session: SQLAlchemy session
+        bucket (str): Key of TIMESERIES_BUCKETS
+        first (datetime): Start of the first bucket
+        end (datetime): Exclusive end of the last bucket
+
+    Returns:
+        dict: bucket, from, to, points (one {start, created, completed}
+            per bucket, empty buckets included) and totals
+    """
+    step = TIMESERIES_BUCKETS[bucket]
+    sums = {}
+    moment = first
+    while moment < end:
+        sums[moment] = [0, 0]
+        moment += step
+
+    rows = session.execute(
+        select(TaskActivity.bucket_start, TaskActivity.created_count,
+               TaskActivity.completed_count)
+        .where(TaskActivity.bucket_start >= first, TaskActivity.bucket_start < end)
+    ).all()
+    for hour, created, completed in rows:
+        counts = sums[bucket_start(hour, bucket)]
+        counts[0] += created
+        counts[1] += completed
+
+    points = [
+        {'start': start.isoformat(), 'created': created, 'completed': completed}
+        for start, (created, completed) in sums.items()
+    ]
+    return {
+        'bucket': bucket,
+        'from': first.isoformat(),
+        'to': end.isoformat(),
+        'points': points,
+        'totals': {
+            'created': sum(point['created'] for point in points),
+            'completed': sum(point['completed'] for point in points),
+        }
+    }
+
+
+def _hour_bucket(column, dialect_name):
+    """SQL expression truncating a timestamp column to its hour"""
+    if dialect_name == 'postgresql':
+        return func.date_trunc('hour', column)
+    # Stored in the format the SQLite triggers write, read back as datetime
+    return type_coerce(func.strftime('%Y-%m-%d %H:00:00.000000', column), db.DateTime)
+
+
+def _scanned_activity(session):
+    """Hourly created/completed counts from a scan of tasks"""
+    dialect_name = session.get_bind().dialect.name
+    activity = {}
+    for column, position in ((Task.created_at, 0), (Task.completed_at, 1)):
+        hour = _hour_bucket(column, dialect_name)
+        rows = session.execute(
+            select(hour, func.count()).where(column.isnot(None)).group_by(hour)
+        ).all()
+        for start, count in rows:
+            activity.setdefault(start, [0, 0])[position] = count
+    return activity
+
+
+def rebuild_activity(session):
+    """
+    Replace the hourly rollups with a fresh scan of tasks
+
+    Used to backfill tasks written before the rollup existed. The caller
+    commits; as with rebuild_counters, concurrent writers should be held
+    off on PostgreSQL.
+
+    Args:
+        session: SQLAlchemy session
+
+    Returns:
+        int: Number of hourly rows written
+    """
+    activity = _scanned_activity(session)
+    session.execute(delete(TaskActivity))
+    if activity:
+        session.execute(insert(TaskActivity), [
+            {
+                'bucket_start': start, 'created_count': created,
+                'completed_count': completed
+            }
+            for start, (created, completed) in activity.items()
+        ])
+    return len(activity)
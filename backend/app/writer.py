@@ -0,0 +1,192 @@
+"""
+Group-commit write pipeline
+
+SQLite allows one writer at a time, so concurrent write requests queue on
+its lock (or fail with "database is locked") and each pays for its own
+commit. With WRITE_PIPELINE_ENABLED, request threads hand their writes to
+a single writer thread instead. The writer collects whatever arrives
+within WRITE_PIPELINE_MAX_DELAY seconds (up to WRITE_PIPELINE_MAX_BATCH
+writes), applies them in one transaction and commits once, then answers
+every caller.
+
+A write is a function of a session that flushes its changes and returns
+whatever the caller needs for its response, computed before the commit.
+If any write in a batch fails, the batch is rolled back and its writes are
+retried one transaction each, so a failing write only affects its caller.
+Writes must therefore be safe to run again after a rollback.
+
+Each process has its own writer, so several worker processes still share
+the database lock; the pipeline removes contention within a process.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from flask import current_app
+
+from app.extensions import db
+
+
+class GroupCommitWriter:
+    """
+    Single writer thread that commits queued writes in batches
+
+    Args:
+        app: Flask application whose context the writer thread runs in
+        max_batch (int): Most writes merged into one transaction
+        max_delay (float): Seconds to wait for more writes after the first
+    """
+
+    def __init__(self, app, max_batch=64, max_delay=0.002):
+        self.app = app
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self.batches = 0
+        self.writes = 0
+
+    def _ensure_started(self):
+        """Start the writer thread, again in a forked child process"""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._queue,), name='group-commit-writer',
+                daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, write):
+        """
+        Queue a write
+
+        Args:
+            write: Callable taking a session; it flushes its changes and
+                returns the caller's result
+
+        Returns:
+            Future: Resolved with write's result once its transaction has
+                committed, or with the exception it raised
+        """
+        self._ensure_started()
+        future = Future()
+        self._queue.put((write, future))
+        return future
+
+    def run(self, write, timeout=None):
+        """Queue a write and wait for its committed result"""
+        return self.submit(write).result(timeout)
+
+    def stop(self):
+        """Stop the writer thread after the writes already queued"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None or self._pid != os.getpid():
+                return
+            self._queue.put(None)
+        thread.join()
+
+    def _collect(self, jobs, first):
+        """Gather writes arriving within max_delay of the first one"""
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    job = jobs.get(timeout=remaining)
+                else:
+                    job = jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                jobs.put(None)
+                break
+            batch.append(job)
+        return batch
+
+    def _run(self, jobs):
+        """Writer thread main loop"""
+        with self.app.app_context():
+            while True:
+                first = jobs.get()
+                if first is None:
+                    return
+                self._commit(self._collect(jobs, first))
+
+    def _commit(self, batch):
+        """Apply a batch of writes in one transaction and resolve them"""
+        session = db.session
+        try:
+            results = [write(session) for write, future in batch]
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            session.close()
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+            else:
+                # Isolate the failing write: one transaction per write
+                for job in batch:
+                    self._commit([job])
+            return
+        session.close()
+
+        self.batches += 1
+        self.writes += len(batch)
+        for (write, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+def run_write(write):
+    """
+    Run a write through the application's pipeline, or inline without one
+
+    With the pipeline the request's session is closed first, so objects
+    loaded through it are detached. Inline, the write runs on the request's
+    session and is committed (or rolled back, re-raising its exception)
+    before returning.
+
+    Args:
+        write: Callable taking a session, as for GroupCommitWriter.submit
+
+    Returns:
+        The write's result, once committed
+    """
+    writer = current_app.extensions.get('task_writer')
+    if writer is not None:
+        # Hand the request's pooled connection back first: callers parked
+        # here must not hold the connections the writer needs
+        db.session.close()
+        return writer.run(write, current_app.config['WRITE_PIPELINE_TIMEOUT'])
+
+    try:
+        result = write(db.session)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return result
+
+
+def init_write_pipeline(app):
+    """
+    Install a GroupCommitWriter when WRITE_PIPELINE_ENABLED is set
+
+    Not with sharding: the writer's session would not know the shard a
+    request's write belongs to.
+    """
+    if app.config['WRITE_PIPELINE_ENABLED'] and not app.config['SQLALCHEMY_SHARD_URIS']:
+        app.extensions['task_writer'] = GroupCommitWriter(
+            app,
+            max_batch=app.config['WRITE_PIPELINE_MAX_BATCH'],
+            max_delay=app.config['WRITE_PIPELINE_MAX_DELAY']
+        )
@@ -16,8 +16,13 @@ class Config:
     
     # CORS settings
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:3000,http://127.0.0.1:3000').split(',')
-    CORS_METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS']
-    CORS_HEADERS = ['Content-Type', 'Authorization', 'X-Requested-With']
+    CORS_METHODS = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS']
+    CORS_HEADERS = [
+        'Content-Type', 'Authorization', 'X-Requested-With', 'Idempotency-Key',
+        'If-Match', 'If-None-Match', 'If-Modified-Since'
+    ]
+    # Response headers cross-origin clients may read (conditional requests)
+    CORS_EXPOSE_HEADERS = ['ETag', 'Last-Modified']
     
     # API settings
     API_VERSION = 'v1'
@@ -26,6 +31,87 @@ class Config:
     # Pagination settings
     TASKS_PER_PAGE = 20
     MAX_TASKS_PER_PAGE = 100
+    
+    # Number of filter combinations remembered by the 'cached' count strategy
+    TASK_COUNT_CACHE_SIZE = 1024
+    
+    # Rows fetched and encoded per chunk by GET /api/tasks/export
+    EXPORT_BATCH_SIZE = 1000
+    
+    # POST /api/tasks/bulk: tasks per request and rows per INSERT batch
+    BULK_MAX_TASKS = 10000
+    BULK_BATCH_SIZE = 1000
+    
+    # Bulk updates and deletes: ids per statement and transaction
+    BULK_UPDATE_CHUNK_SIZE = 5000
+    
+    # Group commit: single writer thread merging concurrent writes (SQLite)
+    WRITE_PIPELINE_ENABLED = False
+    WRITE_PIPELINE_MAX_BATCH = 64
+    WRITE_PIPELINE_MAX_DELAY = 0.002
+    WRITE_PIPELINE_TIMEOUT = 30
+    
+    # Background jobs (async=true bulk requests): concurrent jobs per
+    # process, and seconds without progress before a running job is resumed
+    JOBS_MAX_CONCURRENT = 2
+    JOBS_STALE_AFTER = 60
+    JOBS_RESUME_ON_START = True
+    
+    # Idempotency-Key replay: seconds keys are kept, stored responses held
+    # in memory, seconds a duplicate waits for the first request, and
+    # seconds without a heartbeat after which an unfinished first request
+    # is presumed dead (its process refreshes it every third of that)
+    IDEMPOTENCY_TTL = 24 * 60 * 60
+    IDEMPOTENCY_CACHE_SIZE = 1024
+    IDEMPOTENCY_WAIT_TIMEOUT = 30
+    IDEMPOTENCY_LOCK_TIMEOUT = 60
+    
+    # In-process cache of GET /api/tasks responses, invalidated by writes
+    TASK_RESULT_CACHE_ENABLED = False
+    TASK_RESULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+    
+    # Response compression (brotli is used when the package is installed)
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_SIZE = 1024
+    COMPRESSION_LEVEL = 6
+    COMPRESSION_BROTLI_QUALITY = 4
+    
+    # Encode JSON with orjson when installed (output identical to the stdlib)
+    FAST_JSON_ENABLED = True
+    
+    # SQLite file databases: pragmas applied to every connection (None
+    # leaves SQLite's default), pool sizing, and a startup check that the
+    # pragmas took effect. cache_size is in KiB when negative.
+    SQLITE_PROFILE_ENABLED = True
+    SQLITE_JOURNAL_MODE = 'WAL'
+    SQLITE_SYNCHRONOUS = 'NORMAL'
+    SQLITE_BUSY_TIMEOUT = 5000
+    SQLITE_CACHE_SIZE = -32 * 1024
+    SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+    SQLITE_TEMP_STORE = 'MEMORY'
+    SQLITE_POOL_SIZE = 10
+    SQLITE_POOL_MAX_OVERFLOW = 20
+    SQLITE_POOL_TIMEOUT = 30
+    SQLITE_SELF_TEST = True
+    
+    # Read replicas (comma-separated URLs; SQLite file copies work too).
+    # GET requests read from a replica at most REPLICA_MAX_LAG seconds of
+    # writes behind the primary, measured every REPLICA_LAG_CHECK_INTERVAL
+    # seconds; a client that wrote within REPLICA_PIN_SECONDS reads from
+    # the primary, pinned by the REPLICA_PIN_COOKIE cookie
+    SQLALCHEMY_REPLICA_URIS = [uri for uri in os.environ.get('REPLICA_DATABASE_URLS', '').split(',') if uri]
+    REPLICA_MAX_LAG = 30
+    REPLICA_LAG_CHECK_INTERVAL = 1
+    REPLICA_PIN_SECONDS = 5
+    REPLICA_PIN_COOKIE = 'primary_pin'
+    
+    # Horizontal sharding of tasks (comma-separated URLs, e.g. several
+    # SQLite files). The database above keeps jobs and idempotency keys and
+    # may be listed as shard 0. Listings and stats query up to
+    # SHARD_FANOUT_WORKERS shards at once (None: all). The write pipeline
+    # is not used while sharding
+    SQLALCHEMY_SHARD_URIS = [uri for uri in os.environ.get('SHARD_DATABASE_URLS', '').split(',') if uri]
+    SHARD_FANOUT_WORKERS = None
 
 
 class DevelopmentConfig(Config):
@@ -38,6 +124,10 @@ class DevelopmentConfig(Config):
         'sqlite:///todo_dev.db'
     )
     
+    # Smaller per-connection caches on developer machines
+    SQLITE_CACHE_SIZE = -8 * 1024
+    SQLITE_MMAP_SIZE = 64 * 1024 * 1024
+    
     # More verbose logging in development
     LOG_LEVEL = 'DEBUG'
 
@@ -52,6 +142,9 @@ class ProductionConfig(Config):
     # Security headers
     SEND_FILE_MAX_AGE_DEFAULT = timedelta(hours=1)
     
+    # Dashboards repeat the same listings between writes
+    TASK_RESULT_CACHE_ENABLED = True
+    
     # Logging
     LOG_LEVEL = 'WARNING'
     
@@ -66,6 +159,8 @@ class TestingConfig(Config):
     
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_REPLICA_URIS = []
+    SQLALCHEMY_SHARD_URIS = []
     WTF_CSRF_ENABLED = False
     
     # Disable logging during tests
@@ -0,0 +1,33 @@
+"""add table generations
+
+Revision ID: 5d9e0b3c71a8
+Revises: c52b7e19a4d3
+Create Date: 2026-10-18 12:00:00.000000
+
+Per-table write generation counter bumped by every write transaction and
+used to invalidate cached counts.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d9e0b3c71a8'
+down_revision = 'c52b7e19a4d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'table_generations',
+        sa.Column('table_name', sa.String(length=64), nullable=False),
+        sa.Column('generation', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade():
+    op.drop_table('table_generations')
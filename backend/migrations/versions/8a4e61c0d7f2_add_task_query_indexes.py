@@ -0,0 +1,56 @@
+"""add task query indexes
+
+Revision ID: 8a4e61c0d7f2
+Revises: 3f1c2a9d8b10
+Create Date: 2026-10-18 09:30:00.000000
+
+Indexes for the filter/sort shapes of GET /api/tasks and the counts of
+GET /api/tasks/stats:
+
+* (created_at, id), (updated_at, id), (title, id), (priority, id): every
+  sort order, including the id tiebreaker used by cursor pagination
+* (priority, created_at): priority filter + default sort
+* (completed, priority): completed filter + priority sort, and stats counts
+* partial indexes on created_at for pending and for completed tasks, which
+  serve the completed filter + default sort at half the size each
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e61c0d7f2'
+down_revision = '3f1c2a9d8b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_tasks_created_at_id', 'tasks', ['created_at', 'id'])
+    op.create_index('ix_tasks_updated_at_id', 'tasks', ['updated_at', 'id'])
+    op.create_index('ix_tasks_title_id', 'tasks', ['title', 'id'])
+    op.create_index('ix_tasks_priority_id', 'tasks', ['priority', 'id'])
+    op.create_index('ix_tasks_priority_created_at', 'tasks', ['priority', 'created_at'])
+    op.create_index('ix_tasks_completed_priority', 'tasks', ['completed', 'priority'])
+    op.create_index(
+        'ix_tasks_pending_created_at', 'tasks', ['created_at'],
+        sqlite_where=sa.text('completed = 0'),
+        postgresql_where=sa.text('completed = false')
+    )
+    op.create_index(
+        'ix_tasks_done_created_at', 'tasks', ['created_at'],
+        sqlite_where=sa.text('completed = 1'),
+        postgresql_where=sa.text('completed = true')
+    )
+
+
+def downgrade():
+    op.drop_index('ix_tasks_done_created_at', table_name='tasks')
+    op.drop_index('ix_tasks_pending_created_at', table_name='tasks')
+    op.drop_index('ix_tasks_completed_priority', table_name='tasks')
+    op.drop_index('ix_tasks_priority_created_at', table_name='tasks')
+    op.drop_index('ix_tasks_priority_id', table_name='tasks')
+    op.drop_index('ix_tasks_title_id', table_name='tasks')
+    op.drop_index('ix_tasks_updated_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_created_at_id', table_name='tasks')
@@ -0,0 +1,45 @@
+"""add jobs
+
+Revision ID: a41d7c2e9b56
+Revises: f3b8c1d5a902
+Create Date: 2026-10-18 15:00:00.000000
+
+Background jobs for async=true bulk requests, with their checkpoints so
+unfinished jobs resume after a restart.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41d7c2e9b56'
+down_revision = 'f3b8c1d5a902'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column('checkpoint', sa.JSON(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('progress_done', sa.Integer(), nullable=False),
+        sa.Column('progress_total', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_jobs_status_heartbeat_at', 'jobs', ['status', 'heartbeat_at'])
+
+
+def downgrade():
+    op.drop_index('ix_jobs_status_heartbeat_at', table_name='jobs')
+    op.drop_table('jobs')
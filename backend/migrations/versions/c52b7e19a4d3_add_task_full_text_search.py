@@ -0,0 +1,80 @@
+"""add task full-text search
+
+Revision ID: c52b7e19a4d3
+Revises: 8a4e61c0d7f2
+Create Date: 2026-10-18 11:00:00.000000
+
+SQLite: external-content FTS5 table over (title, description) kept in sync by
+insert/update/delete triggers, rebuilt from the existing rows.
+PostgreSQL: GIN index over the tsvector expression used by app.search.
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52b7e19a4d3'
+down_revision = '8a4e61c0d7f2'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description,
+        content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+POSTGRES_FTS_DDL = [
+    """
+    CREATE INDEX IF NOT EXISTS ix_tasks_search ON tasks USING GIN (
+        to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))
+    )
+    """,
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+        op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        for statement in POSTGRES_FTS_DDL:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS tasks_fts_au')
+        op.execute('DROP TRIGGER IF EXISTS tasks_fts_ad')
+        op.execute('DROP TRIGGER IF EXISTS tasks_fts_ai')
+        op.execute('DROP TABLE IF EXISTS tasks_fts')
+    elif dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_tasks_search')
@@ -0,0 +1,32 @@
+"""add task version
+
+Revision ID: c9a5e2d7f318
+Revises: b6e3f0a8d214
+Create Date: 2026-10-18 17:00:00.000000
+
+Per-task version counter for optimistic concurrency control. Existing
+tasks start at version 1.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9a5e2d7f318'
+down_revision = 'b6e3f0a8d214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'tasks',
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1')
+    )
+
+
+def downgrade():
+    # Plain ALTER TABLE (SQLite 3.35+): batch mode would recreate the table
+    # and drop the triggers defined on it
+    op.drop_column('tasks', 'version')
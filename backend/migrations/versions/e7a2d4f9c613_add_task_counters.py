@@ -0,0 +1,122 @@
+"""add task counters
+
+Revision ID: e7a2d4f9c613
+Revises: 5d9e0b3c71a8
+Create Date: 2026-10-18 13:00:00.000000
+
+Per-(completed, priority) task counts maintained by row triggers on tasks
+and backfilled from the existing rows.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a2d4f9c613'
+down_revision = '5d9e0b3c71a8'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_COUNTER_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS task_counters_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_counters (completed, priority, task_count)
+        VALUES (coalesce(new.completed, 0), coalesce(new.priority, ''), 1)
+        ON CONFLICT (completed, priority) DO UPDATE SET task_count = task_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_counters_ad AFTER DELETE ON tasks BEGIN
+        UPDATE task_counters SET task_count = task_count - 1
+        WHERE completed = coalesce(old.completed, 0) AND priority = coalesce(old.priority, '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_counters_au AFTER UPDATE OF completed, priority ON tasks
+    WHEN coalesce(old.completed, 0) <> coalesce(new.completed, 0)
+        OR coalesce(old.priority, '') <> coalesce(new.priority, '')
+    BEGIN
+        UPDATE task_counters SET task_count = task_count - 1
+        WHERE completed = coalesce(old.completed, 0) AND priority = coalesce(old.priority, '');
+        INSERT INTO task_counters (completed, priority, task_count)
+        VALUES (coalesce(new.completed, 0), coalesce(new.priority, ''), 1)
+        ON CONFLICT (completed, priority) DO UPDATE SET task_count = task_count + 1;
+    END
+    """,
+]
+
+POSTGRES_COUNTER_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION task_counters_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE task_counters SET task_count = task_count - 1
+            WHERE completed = coalesce(OLD.completed, false)
+                AND priority = coalesce(OLD.priority, '');
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO task_counters (completed, priority, task_count)
+            VALUES (coalesce(NEW.completed, false), coalesce(NEW.priority, ''), 1)
+            ON CONFLICT (completed, priority)
+            DO UPDATE SET task_count = task_counters.task_count + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER task_counters_insert_delete AFTER INSERT OR DELETE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION task_counters_apply()
+    """,
+    """
+    CREATE TRIGGER task_counters_update AFTER UPDATE OF completed, priority ON tasks
+    FOR EACH ROW WHEN (
+        coalesce(OLD.completed, false) IS DISTINCT FROM coalesce(NEW.completed, false)
+        OR coalesce(OLD.priority, '') IS DISTINCT FROM coalesce(NEW.priority, '')
+    )
+    EXECUTE FUNCTION task_counters_apply()
+    """,
+]
+
+
+def upgrade():
+    op.create_table(
+        'task_counters',
+        sa.Column('completed', sa.Boolean(), nullable=False),
+        sa.Column('priority', sa.String(length=10), nullable=False),
+        sa.Column('task_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('completed', 'priority')
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_COUNTER_DDL:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        op.execute('LOCK TABLE tasks IN SHARE MODE')
+        for statement in POSTGRES_COUNTER_DDL:
+            op.execute(statement)
+
+    op.execute(
+        """
+        INSERT INTO task_counters (completed, priority, task_count)
+        SELECT coalesce(completed, false), coalesce(priority, ''), count(*)
+        FROM tasks
+        GROUP BY coalesce(completed, false), coalesce(priority, '')
+        """
+    )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS task_counters_au')
+        op.execute('DROP TRIGGER IF EXISTS task_counters_ad')
+        op.execute('DROP TRIGGER IF EXISTS task_counters_ai')
+    elif dialect == 'postgresql':
+        op.execute('DROP TRIGGER IF EXISTS task_counters_update ON tasks')
+        op.execute('DROP TRIGGER IF EXISTS task_counters_insert_delete ON tasks')
+        op.execute('DROP FUNCTION IF EXISTS task_counters_apply()')
+    op.drop_table('task_counters')
@@ -0,0 +1,160 @@
+"""add task activity rollups
+
+Revision ID: f3b8c1d5a902
+Revises: e7a2d4f9c613
+Create Date: 2026-10-18 14:00:00.000000
+
+Hourly created/completed task counts maintained by row triggers on tasks
+and backfilled from the existing rows.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8c1d5a902'
+down_revision = 'e7a2d4f9c613'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_ACTIVITY_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS task_activity_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_activity (bucket_start, created_count, completed_count)
+        SELECT strftime('%Y-%m-%d %H:00:00.000000', new.created_at), 1, 0
+        WHERE new.created_at IS NOT NULL
+        ON CONFLICT (bucket_start) DO UPDATE SET created_count = created_count + 1;
+        INSERT INTO task_activity (bucket_start, created_count, completed_count)
+        SELECT strftime('%Y-%m-%d %H:00:00.000000', new.completed_at), 0, 1
+        WHERE new.completed_at IS NOT NULL
+        ON CONFLICT (bucket_start) DO UPDATE SET completed_count = completed_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_activity_ad AFTER DELETE ON tasks BEGIN
+        UPDATE task_activity SET created_count = created_count - 1
+        WHERE bucket_start = strftime('%Y-%m-%d %H:00:00.000000', old.created_at);
+        UPDATE task_activity SET completed_count = completed_count - 1
+        WHERE bucket_start = strftime('%Y-%m-%d %H:00:00.000000', old.completed_at);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_activity_au_created AFTER UPDATE OF created_at ON tasks
+    WHEN old.created_at IS NOT new.created_at
+    BEGIN
+        UPDATE task_activity SET created_count = created_count - 1
+        WHERE bucket_start = strftime('%Y-%m-%d %H:00:00.000000', old.created_at);
+        INSERT INTO task_activity (bucket_start, created_count, completed_count)
+        SELECT strftime('%Y-%m-%d %H:00:00.000000', new.created_at), 1, 0
+        WHERE new.created_at IS NOT NULL
+        ON CONFLICT (bucket_start) DO UPDATE SET created_count = created_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_activity_au_completed AFTER UPDATE OF completed_at ON tasks
+    WHEN old.completed_at IS NOT new.completed_at
+    BEGIN
+        UPDATE task_activity SET completed_count = completed_count - 1
+        WHERE bucket_start = strftime('%Y-%m-%d %H:00:00.000000', old.completed_at);
+        INSERT INTO task_activity (bucket_start, created_count, completed_count)
+        SELECT strftime('%Y-%m-%d %H:00:00.000000', new.completed_at), 0, 1
+        WHERE new.completed_at IS NOT NULL
+        ON CONFLICT (bucket_start) DO UPDATE SET completed_count = completed_count + 1;
+    END
+    """,
+]
+
+POSTGRES_ACTIVITY_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION task_activity_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.created_at IS DISTINCT FROM NEW.created_at) THEN
+            UPDATE task_activity SET created_count = created_count - 1
+            WHERE bucket_start = date_trunc('hour', OLD.created_at);
+        END IF;
+        IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.completed_at IS DISTINCT FROM NEW.completed_at) THEN
+            UPDATE task_activity SET completed_count = completed_count - 1
+            WHERE bucket_start = date_trunc('hour', OLD.completed_at);
+        END IF;
+        IF NEW.created_at IS NOT NULL AND (TG_OP = 'INSERT' OR
+                (TG_OP = 'UPDATE' AND OLD.created_at IS DISTINCT FROM NEW.created_at)) THEN
+            INSERT INTO task_activity (bucket_start, created_count, completed_count)
+            VALUES (date_trunc('hour', NEW.created_at), 1, 0)
+            ON CONFLICT (bucket_start)
+            DO UPDATE SET created_count = task_activity.created_count + 1;
+        END IF;
+        IF NEW.completed_at IS NOT NULL AND (TG_OP = 'INSERT' OR
+                (TG_OP = 'UPDATE' AND OLD.completed_at IS DISTINCT FROM NEW.completed_at)) THEN
+            INSERT INTO task_activity (bucket_start, created_count, completed_count)
+            VALUES (date_trunc('hour', NEW.completed_at), 0, 1)
+            ON CONFLICT (bucket_start)
+            DO UPDATE SET completed_count = task_activity.completed_count + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER task_activity_changes
+    AFTER INSERT OR DELETE OR UPDATE OF created_at, completed_at ON tasks
+    FOR EACH ROW EXECUTE FUNCTION task_activity_apply()
+    """,
+]
+
+# Hour truncation per dialect, matching the triggers
+HOUR_BUCKET = {
+    'sqlite': "strftime('%Y-%m-%d %H:00:00.000000', {column})",
+    'postgresql': "date_trunc('hour', {column})",
+}
+
+
+def upgrade():
+    op.create_table(
+        'task_activity',
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('created_count', sa.Integer(), nullable=False),
+        sa.Column('completed_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('bucket_start')
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_ACTIVITY_DDL:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        op.execute('LOCK TABLE tasks IN SHARE MODE')
+        for statement in POSTGRES_ACTIVITY_DDL:
+            op.execute(statement)
+    else:
+        return
+
+    created = HOUR_BUCKET[dialect].format(column='created_at')
+    completed = HOUR_BUCKET[dialect].format(column='completed_at')
+    op.execute(
+        f"""
+        INSERT INTO task_activity (bucket_start, created_count, completed_count)
+        SELECT bucket_start, sum(created_count), sum(completed_count) FROM (
+            SELECT {created} AS bucket_start, 1 AS created_count, 0 AS completed_count
+            FROM tasks WHERE created_at IS NOT NULL
+            UNION ALL
+            SELECT {completed}, 0, 1
+            FROM tasks WHERE completed_at IS NOT NULL
+        ) AS activity
+        GROUP BY bucket_start
+        """
+    )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS task_activity_au_completed')
+        op.execute('DROP TRIGGER IF EXISTS task_activity_au_created')
+        op.execute('DROP TRIGGER IF EXISTS task_activity_ad')
+        op.execute('DROP TRIGGER IF EXISTS task_activity_ai')
+    elif dialect == 'postgresql':
+        op.execute('DROP TRIGGER IF EXISTS task_activity_changes ON tasks')
+        op.execute('DROP FUNCTION IF EXISTS task_activity_apply()')
+    op.drop_table('task_activity')
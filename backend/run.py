@@ -5,7 +5,13 @@ Run this file to start the development server.
 """
 
 import os
+import click
+from sqlalchemy import text
 from app import create_app, db
+from app.stats import verify_counters, rebuild_counters
+from app.timeseries import rebuild_activity
+from app.idempotency import purge_expired
+from app.sqlite_profile import check_profile, is_file_database, profile_pragmas
 
 # Create Flask application
 app = create_app()
@@ -13,8 +19,11 @@ app = create_app()
 
 @app.cli.command()
 def init_db():
-    """Initialize the database with tables."""
+    """Initialize the database (and any task shards) with tables."""
     db.create_all()
+    shards = app.extensions.get('task_shards')
+    if shards is not None:
+        shards.create_all(db.metadata)
     print("Database initialized!")
 
 
@@ -26,6 +35,82 @@ def reset_db():
     print("Database reset!")
 
 
+@app.cli.command()
+def analyze_db():
+    """Refresh planner statistics (used by count=estimated)."""
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+    print("Database statistics refreshed!")
+
+
+@app.cli.command('verify-counters')
+@click.option('--repair', is_flag=True, help='Rebuild the counters if they have drifted.')
+def verify_counters_command(repair):
+    """Check task_counters against the tasks table."""
+    drift = verify_counters(db.session)
+    if not drift:
+        print("Task counters are consistent!")
+        return
+    
+    for (completed, priority), (stored, actual) in sorted(drift.items()):
+        state = 'completed' if completed else 'pending'
+        print(f"Drift in {state}/{priority or '(none)'}: stored {stored}, actual {actual}")
+    
+    if repair:
+        rebuild_counters(db.session)
+        db.session.commit()
+        print("Task counters rebuilt!")
+    else:
+        raise SystemExit(1)
+
+
+@app.cli.command('rebuild-counters')
+def rebuild_counters_command():
+    """Rebuild task_counters from the tasks table."""
+    rebuild_counters(db.session)
+    db.session.commit()
+    print("Task counters rebuilt!")
+
+
+@app.cli.command('backfill-activity')
+def backfill_activity_command():
+    """Rebuild the hourly task_activity rollups from the tasks table."""
+    hours = rebuild_activity(db.session)
+    db.session.commit()
+    print(f"Task activity backfilled ({hours} hours)!")
+
+
+@app.cli.command('purge-idempotency-keys')
+def purge_idempotency_keys_command():
+    """Delete expired idempotency keys and their stored responses."""
+    purged = purge_expired(db.session)
+    db.session.commit()
+    print(f"Purged {purged} expired idempotency keys!")
+
+
+@app.cli.command('check-sqlite')
+def check_sqlite_command():
+    """Check that the configured SQLite pragmas are in effect."""
+    if not app.config['SQLITE_PROFILE_ENABLED']:
+        print("The SQLite profile is disabled.")
+        return
+    
+    pragmas = profile_pragmas(app.config)
+    failed = False
+    for engine in db.engines.values():
+        if not is_file_database(engine.url):
+            continue
+        mismatches = check_profile(engine, pragmas)
+        for pragma, (expected, actual) in mismatches.items():
+            print(f"{engine.url.database}: PRAGMA {pragma} is {actual!r}, expected {expected!r}")
+        if not mismatches:
+            print(f"{engine.url.database}: SQLite profile in effect!")
+        failed = failed or bool(mismatches)
+    
+    if failed:
+        raise SystemExit(1)
+
+
 if __name__ == '__main__':
     # Create database tables if they don't exist
     with app.app_context():
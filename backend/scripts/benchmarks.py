@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for the Flask Todo application
+
+Each benchmark seeds a throwaway SQLite database file and drives the API
+through the Flask test client, so results measure the application code and
+the database rather than the network.
+
+Usage:
+    python scripts/benchmarks.py export --rows 100000 --format csv
+    python scripts/benchmarks.py compression --sizes 20 100 1000
+    python scripts/benchmarks.py reads --sizes 1000 100000
+    python scripts/benchmarks.py bulk-create --tasks 5000
+    python scripts/benchmarks.py bulk-update --tasks 50000
+    python scripts/benchmarks.py contention --threads 16 --writes 100
+    python scripts/benchmarks.py single-update --tasks 10000 --requests 2000
+    python scripts/benchmarks.py sqlite-profile --threads 8 --requests 500 --write-ratio 0.2
+"""
+
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+# Add the backend directory to the path so we can import our app
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app import create_app, db
+from app.compression import available_codings, compress_bytes
+from app.models import Task
+from app.reads import select_tasks, task_row_dict
+from app.serialization import serialize_tasks
+
+
+SEED_BATCH_SIZE = 10000
+
+# Seconds PUT /api/tasks/bulk may take per 50,000 tasks (the target of
+# the set-based bulk update) before the bulk-update benchmark fails
+BULK_UPDATE_BUDGET = 1.0
+PRIORITIES = ['High', 'Medium', 'Low']
+
+
+def benchmark_app(database_path, **settings):
+    """
+    Create an application bound to a SQLite database file
+
+    Args:
+        database_path (str): Path of the database file
+        settings: Configuration overrides
+
+    Returns:
+        Flask: Application with its tables created
+    """
+    app = create_app('testing', {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database_path}', **settings
+    })
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def seed_tasks(app, count):
+    """
+    Insert count tasks in batches, bypassing the unit of work
+
+    Args:
+        app: Application from benchmark_app
+        count (int): Number of tasks to insert
+    """
+    now = datetime.utcnow()
+    with app.app_context():
+        for start in range(0, count, SEED_BATCH_SIZE):
+            db.session.execute(Task.__table__.insert(), [
+                {
+                    'title': f'Benchmark task {i}',
+                    'description': f'Description for benchmark task {i}',
+                    'priority': PRIORITIES[i % 3],
+                    'completed': i % 4 == 0,
+                    'created_at': now,
+                    'updated_at': now,
+                    'completed_at': now if i % 4 == 0 else None
+                }
+                for i in range(start, min(start + SEED_BATCH_SIZE, count))
+            ])
+        db.session.commit()
+
+
+def peak_rss_mb():
+    """Return the process's peak resident set size in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _report(label, rows, elapsed, size, rss_before):
+    """Print one benchmark result line"""
+    print(f"   {label:<12} {rows / elapsed:>12,.0f} rows/s  "
+          f"{size / (1024 * 1024):>8.1f} MB  "
+          f"peak RSS +{peak_rss_mb() - rss_before:.1f} MB")
+
+
+def benchmark_export(rows, export_format, batch_size, compare):
+    """
+    Measure throughput and memory of GET /api/tasks/export
+
+    The streamed response is consumed chunk by chunk. With compare, the
+    same rows are then serialized the way GET /api/tasks does (ORM objects,
+    to_dict, one JSON document) for contrast. The streaming run goes first
+    because peak RSS only ever grows.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        app = benchmark_app(os.path.join(directory, 'benchmark.db'))
+        app.config['EXPORT_BATCH_SIZE'] = batch_size
+
+        print(f"📦 Seeding {rows:,} tasks...")
+        seed_tasks(app, rows)
+
+        print(f"⏱  Export ({export_format}, batch size {batch_size}):")
+        client = app.test_client()
+
+        rss_before = peak_rss_mb()
+        start = time.perf_counter()
+        response = client.get(f'/api/tasks/export?format={export_format}', buffered=False)
+        size = sum(len(chunk) for chunk in response.response)
+        response.close()
+        _report('streaming', rows, time.perf_counter() - start, size, rss_before)
+
+        if compare:
+            from flask import json
+
+            rss_before = peak_rss_mb()
+            start = time.perf_counter()
+            with app.app_context():
+                body = json.dumps([task.to_dict() for task in Task.query.order_by(Task.id)])
+            _report('in-memory', rows, time.perf_counter() - start, len(body), rss_before)
+
+
+def benchmark_compression(sizes, repeat):
+    """
+    Compare CPU time against bytes saved when compressing task listings
+
+    For each page size the identity GET /api/tasks body is compressed with
+    every available coding at a few levels around the configured default.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        app = benchmark_app(os.path.join(directory, 'benchmark.db'))
+        seed_tasks(app, max(sizes))
+        client = app.test_client()
+
+        settings = [('gzip', 'COMPRESSION_LEVEL', level) for level in (1, 6, 9)]
+        if 'br' in available_codings():
+            settings += [('br', 'COMPRESSION_BROTLI_QUALITY', quality) for quality in (1, 4, 11)]
+
+        print(f"{'tasks':>6} {'coding':<8} {'body KB':>9} {'sent KB':>9} "
+              f"{'saved':>7} {'ms/resp':>9} {'MB/s':>8}")
+        for size in sizes:
+            body = client.get(f'/api/tasks?per_page={size}').get_data()
+            for coding, setting, level in settings:
+                config = dict(app.config, **{setting: level})
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    encoded = compress_bytes(body, coding, config)
+                elapsed = (time.perf_counter() - start) / repeat
+                print(f"{size:>6} {coding + '-' + str(level):<8} {len(body) / 1024:>9.1f} "
+                      f"{len(encoded) / 1024:>9.1f} {1 - len(encoded) / len(body):>7.1%} "
+                      f"{elapsed * 1000:>9.2f} {len(body) / elapsed / (1024 * 1024):>8.1f}")
+
+
+def _measure(function):
+    """
+    Run function twice: once timed, once under tracemalloc
+
+    Returns:
+        tuple: (seconds, peak traced bytes)
+    """
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def benchmark_reads(sizes):
+    """
+    Compare ORM hydration with Core row views for task reads
+
+    For each size the same rows are loaded as Task entities and as Core
+    rows, then serialized (to_dict vs task_row_dict, and serialize_tasks).
+    Per-row time and peak traced memory of holding the result are reported.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        app = benchmark_app(os.path.join(directory, 'benchmark.db'))
+        seed_tasks(app, max(sizes))
+
+        with app.app_context():
+            paths = [
+                ('orm load', lambda n: Task.query.order_by(Task.id).limit(n).all()),
+                ('core load', lambda n: db.session.execute(
+                    select_tasks().order_by(Task.id).limit(n)).all()),
+                ('orm dicts', lambda n: [task.to_dict() for task in
+                                         Task.query.order_by(Task.id).limit(n)]),
+                ('core dicts', lambda n: [task_row_dict(row) for row in db.session.execute(
+                    select_tasks().order_by(Task.id).limit(n))]),
+                ('orm json', lambda n: serialize_tasks(
+                    Task.query.order_by(Task.id).limit(n).all())),
+                ('core json', lambda n: serialize_tasks(db.session.execute(
+                    select_tasks().order_by(Task.id).limit(n)).all())),
+            ]
+
+            print(f"{'rows':>8} {'path':<11} {'us/row':>8} {'bytes/row':>10}")
+            for size in sizes:
+                for label, path in paths:
+                    def run():
+                        # Start each run with an empty identity map
+                        db.session.expunge_all()
+                        return path(size)
+
+                    elapsed, peak = _measure(run)
+                    print(f"{size:>8} {label:<11} {elapsed / size * 1e6:>8.2f} "
+                          f"{peak / size:>10,.0f}")
+
+
+def benchmark_bulk_create(count, batch_sizes):
+    """
+    Compare task creation throughput of POST /api/tasks and /api/tasks/bulk
+
+    count tasks are created one request at a time, then through the bulk
+    endpoint (ids only) at each batch size, each run on a fresh database.
+    """
+    payload = [
+        {'title': f'Imported task {i}', 'description': f'Description {i}',
+         'priority': PRIORITIES[i % 3], 'completed': i % 4 == 0}
+        for i in range(count)
+    ]
+
+    def run(label, requests):
+        with tempfile.TemporaryDirectory() as directory:
+            app = benchmark_app(os.path.join(directory, 'benchmark.db'))
+            client = app.test_client()
+            start = time.perf_counter()
+            for url, body in requests:
+                assert client.post(url, json=body).status_code == 201
+            elapsed = time.perf_counter() - start
+        print(f"   {label:<22} {count / elapsed:>10,.0f} tasks/s  {elapsed:>8.2f} s")
+
+    print(f"⏱  Creating {count:,} tasks:")
+    run('single POST', [('/api/tasks', task) for task in payload])
+    for batch_size in batch_sizes:
+        run(f'bulk, {batch_size} per request', [
+            ('/api/tasks/bulk?return=ids', {'tasks': payload[start:start + batch_size]})
+            for start in range(0, count, batch_size)
+        ])
+
+
+def benchmark_bulk_update(count):
+    """
+    Time PUT /api/tasks/bulk over count seeded tasks
+
+    Every task is completed with the default response (all updated tasks)
+    and then reopened with return=minimal. Both runs are checked against
+    BULK_UPDATE_BUDGET, and neither meets it yet: at 50,000 tasks on a
+    SQLite file return=minimal measured 0.95-1.0 s and return=tasks
+    1.2-1.6 s. Of each UPDATE, about 0.45 s is maintaining the six tasks
+    indexes over the updated columns and 0.3 s the counter and activity
+    triggers; return=tasks adds reading back and encoding 13 MB of tasks.
+
+    Returns:
+        bool: Whether both runs finished within the budget
+    """
+    within_budget = True
+    with tempfile.TemporaryDirectory() as directory:
+        app = benchmark_app(os.path.join(directory, 'benchmark.db'))
+        seed_tasks(app, count)
+        client = app.test_client()
+        task_ids = list(range(1, count + 1))
+
+        print(f"⏱  Updating {count:,} tasks:")
+        for label, query, completed in (('tasks', '', True), ('minimal', '?return=minimal', False)):
+            start = time.perf_counter()
+            response = client.put(f'/api/tasks/bulk{query}', json={
+                'task_ids': task_ids, 'updates': {'completed': completed, 'priority': 'High'}
+            })
+            elapsed = time.perf_counter() - start
+            assert response.status_code == 200
+            budget = BULK_UPDATE_BUDGET * count / 50000
+            over = elapsed > budget
+            within_budget = within_budget and not over
+            print(f"   return={label:<8} {elapsed * 1000:>8.0f} ms  "
+                  f"{count / elapsed:>10,.0f} tasks/s  {len(response.data) / 1024:>8.0f} KB"
+                  f"  (budget {budget * 1000:.0f} ms){'  OVER' if over else ''}")
+    return within_budget
+
+
+def benchmark_contention(threads, writes):
+    """
+    Measure concurrent single-task writes with and without group commit
+
+    threads request threads each create writes tasks and then update each
+    of them, all against one SQLite file. Failed requests (e.g. "database
+    is locked" turned into 500s) are counted.
+    """
+    def run(label, **settings):
+        with tempfile.TemporaryDirectory() as directory:
+            app = benchmark_app(os.path.join(directory, 'benchmark.db'), **settings)
+            failures = []
+
+            def worker(index):
+                client = app.test_client()
+                for i in range(writes):
+                    response = client.post('/api/tasks', json={'title': f'Task {index}-{i}'})
+                    if response.status_code != 201:
+                        failures.append(response.status_code)
+                        continue
+                    task_id = json.loads(response.data)['task']['id']
+                    response = client.put(f'/api/tasks/{task_id}', json={'completed': True})
+                    if response.status_code != 200:
+                        failures.append(response.status_code)
+
+            workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+            start = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+            total = threads * writes * 2
+            writer = app.extensions.get('task_writer')
+            batching = ''
+            if writer is not None:
+                batching = f"  {writer.writes / max(writer.batches, 1):>5.1f} writes/commit"
+                writer.stop()
+            print(f"   {label:<14} {total / elapsed:>8,.0f} writes/s  "
+                  f"{len(failures):>5} failed{batching}")
+
+    print(f"⏱  {threads} threads x {writes} creates + updates:")
+    run('direct')
+    run('group commit', WRITE_PIPELINE_ENABLED=True)
+
+
+def benchmark_single_update(count, requests):
+    """
+    Compare per-request latency of PUT and PATCH /api/tasks/<id>
+
+    Each method toggles completed on requests random tasks out of count
+    seeded ones, the most frequent write in practice. Both run a single
+    UPDATE ... RETURNING, which matches on version when the body sends one
+    (these bodies do not) and increments it. The two should be level; a gap
+    is overhead in one of the views.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        app = benchmark_app(os.path.join(directory, 'benchmark.db'))
+        seed_tasks(app, count)
+        client = app.test_client()
+        rng = random.Random(42)
+        task_ids = [rng.randint(1, count) for _ in range(requests)]
+
+        print(f"⏱  {requests:,} completion toggles over {count:,} tasks:")
+        print(f"   {'method':<7} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        # Interleave the methods so both see the same database state and drift
+        latencies = {'put': [], 'patch': []}
+        for i, task_id in enumerate(task_ids):
+            for method in latencies:
+                start = time.perf_counter()
+                response = getattr(client, method)(f'/api/tasks/{task_id}', json={'completed': i % 2 == 0})
+                latencies[method].append(time.perf_counter() - start)
+                assert response.status_code == 200
+
+        for method, samples in latencies.items():
+            samples.sort()
+
+            def percentile(fraction):
+                return samples[min(int(len(samples) * fraction), len(samples) - 1)] * 1000
+
+            print(f"   {method.upper():<7} {sum(samples) / len(samples) * 1000:>8.3f} "
+                  f"{percentile(0.5):>8.3f} {percentile(0.95):>8.3f} {percentile(0.99):>8.3f}")
+
+
+def benchmark_sqlite_profile(count, threads, requests, write_ratio):
+    """
+    Compare a concurrent read/write mix with SQLite defaults and the profile
+
+    threads request threads each send requests requests against count
+    seeded tasks: a write_ratio share are PATCH completion toggles, the
+    rest GET /api/tasks pages. Failed requests (e.g. "database is locked"
+    turned into 500s) are counted.
+    """
+    def run(label, **settings):
+        with tempfile.TemporaryDirectory() as directory:
+            app = benchmark_app(os.path.join(directory, 'benchmark.db'), **settings)
+            seed_tasks(app, count)
+            latencies = {'read': [], 'write': []}
+            failures = []
+
+            def worker(index):
+                client = app.test_client()
+                rng = random.Random(index)
+                for _ in range(requests):
+                    task_id = rng.randint(1, count)
+                    kind = 'write' if rng.random() < write_ratio else 'read'
+                    start = time.perf_counter()
+                    if kind == 'write':
+                        response = client.patch(f'/api/tasks/{task_id}',
+                                                json={'completed': rng.random() < 0.5})
+                    else:
+                        response = client.get(f'/api/tasks?page={task_id % 50 + 1}&per_page=20')
+                    latencies[kind].append(time.perf_counter() - start)
+                    if response.status_code != 200:
+                        failures.append(response.status_code)
+
+            workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+            start = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+            def percentile(samples, fraction):
+                samples = sorted(samples)
+                return samples[min(int(len(samples) * fraction), len(samples) - 1)] * 1000 if samples else 0
+
+            print(f"   {label:<9} {threads * requests / elapsed:>8,.0f} req/s "
+                  f"{percentile(latencies['read'], 0.95):>9.2f} {percentile(latencies['write'], 0.95):>9.2f} "
+                  f"{len(failures):>7}")
+
+    print(f"⏱  {threads} threads x {requests} requests, {write_ratio:.0%} writes, {count:,} tasks:")
+    print(f"   {'profile':<9} {'throughput':>14} {'read p95':>9} {'write p95':>9} {'failed':>7}")
+    run('defaults', SQLITE_PROFILE_ENABLED=False)
+    run('tuned', SQLITE_PROFILE_ENABLED=True)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Flask Todo App Benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='Streaming export throughput and memory')
+    export_parser.add_argument('--rows', type=int, default=100000)
+    export_parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    export_parser.add_argument('--batch-size', type=int, default=1000)
+    export_parser.add_argument('--compare', action='store_true',
+                               help='Also serialize the rows in memory for contrast')
+
+    compression_parser = subparsers.add_parser('compression',
+                                               help='CPU cost vs bytes saved by compression')
+    compression_parser.add_argument('--sizes', type=int, nargs='+', default=[20, 100, 1000])
+    compression_parser.add_argument('--repeat', type=int, default=20)
+
+    reads_parser = subparsers.add_parser('reads', help='ORM hydration vs Core row views')
+    reads_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000])
+
+    bulk_parser = subparsers.add_parser('bulk-create',
+                                        help='Single vs bulk task creation throughput')
+    bulk_parser.add_argument('--tasks', type=int, default=5000)
+    bulk_parser.add_argument('--batch-sizes', type=int, nargs='+', default=[100, 1000, 5000])
+
+    bulk_update_parser = subparsers.add_parser('bulk-update',
+                                               help='Set-based PUT /api/tasks/bulk latency')
+    bulk_update_parser.add_argument('--tasks', type=int, default=50000)
+
+    contention_parser = subparsers.add_parser('contention',
+                                              help='Concurrent writes with and without group commit')
+    contention_parser.add_argument('--threads', type=int, default=16)
+    contention_parser.add_argument('--writes', type=int, default=100)
+
+    single_update_parser = subparsers.add_parser('single-update',
+                                                 help='PUT vs single-statement PATCH latency')
+    single_update_parser.add_argument('--tasks', type=int, default=10000)
+    single_update_parser.add_argument('--requests', type=int, default=2000)
+
+    profile_parser = subparsers.add_parser('sqlite-profile',
+                                           help='Read/write mix with SQLite defaults vs the profile')
+    profile_parser.add_argument('--tasks', type=int, default=10000)
+    profile_parser.add_argument('--threads', type=int, default=8)
+    profile_parser.add_argument('--requests', type=int, default=500)
+    profile_parser.add_argument('--write-ratio', type=float, default=0.2)
+
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        benchmark_export(args.rows, args.format, args.batch_size, args.compare)
+    elif args.command == 'compression':
+        benchmark_compression(args.sizes, args.repeat)
+    elif args.command == 'reads':
+        benchmark_reads(args.sizes)
+    elif args.command == 'bulk-create':
+        benchmark_bulk_create(args.tasks, args.batch_sizes)
+    elif args.command == 'bulk-update':
+        if not benchmark_bulk_update(args.tasks):
+            sys.exit(1)
+    elif args.command == 'contention':
+        benchmark_contention(args.threads, args.writes)
+    elif args.command == 'single-update':
+        benchmark_single_update(args.tasks, args.requests)
+    elif args.command == 'sqlite-profile':
+        benchmark_sqlite_profile(args.tasks, args.threads, args.requests, args.write_ratio)
@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app import create_app, db
 from app.models import Task
+from app.stats import compute_task_stats
 
 
 def init_database():
@@ -164,28 +165,22 @@ def show_database_stats():
     """Show database statistics"""
     app = create_app()
     with app.app_context():
-        total_tasks = Task.query.count()
-        completed_tasks = Task.query.filter(Task.completed == True).count()
-        pending_tasks = total_tasks - completed_tasks
+        stats = compute_task_stats(db.session)
         
         print(f"📊 Database Statistics:")
-        print(f"   Total tasks: {total_tasks}")
-        print(f"   Completed: {completed_tasks}")
-        print(f"   Pending: {pending_tasks}")
+        print(f"   Total tasks: {stats['total_tasks']}")
+        print(f"   Completed: {stats['completed_tasks']}")
+        print(f"   Pending: {stats['pending_tasks']}")
         
-        if total_tasks > 0:
-            completion_rate = (completed_tasks / total_tasks) * 100
-            print(f"   Completion rate: {completion_rate:.1f}%")
+        if stats['total_tasks'] > 0:
+            print(f"   Completion rate: {stats['completion_rate']:.1f}%")
             
-            # Priority breakdown
-            high_priority = Task.query.filter(Task.priority == 'High').count()
-            medium_priority = Task.query.filter(Task.priority == 'Medium').count()
-            low_priority = Task.query.filter(Task.priority == 'Low').count()
-            
-            print(f"   Priority breakdown:")
-            print(f"     High: {high_priority}")
-            print(f"     Medium: {medium_priority}")
-            print(f"     Low: {low_priority}")
+            # Priority breakdown, split by completion status
+            print(f"   Priority breakdown (pending / completed):")
+            for priority, count in stats['priority_breakdown'].items():
+                print(f"     {priority.capitalize()}: {count} "
+                      f"({stats['pending_by_priority'][priority]} / "
+                      f"{stats['completed_by_priority'][priority]})")
 
 
 def run_development_server():
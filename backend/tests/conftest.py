@@ -0,0 +1,65 @@
+"""
+Shared pytest fixtures for the backend test suite
+"""
+
+import pytest
+from sqlalchemy import event
+from app import create_app, db
+
+
+@pytest.fixture
+def app():
+    """Create application for testing"""
+    app = create_app('testing')
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def make_app():
+    """
+    Factory for applications on the testing configuration with settings
+    overridden, e.g. make_app(SQLALCHEMY_DATABASE_URI=...)
+
+    Overrides apply to the new application only; the config registry is
+    left untouched.
+    """
+    def make(**overrides):
+        return create_app('testing', overrides)
+    return make
+
+
+@pytest.fixture
+def client(app):
+    """Create test client"""
+    return app.test_client()
+
+
+@pytest.fixture
+def statements(app):
+    """Capture every statement sent to the database"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    yield captured
+    event.remove(db.engine, 'before_cursor_execute', capture)
+
+
+@pytest.fixture
+def task_selects(app):
+    """Capture SELECT statements issued against the tasks table"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and 'FROM tasks' in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', capture)
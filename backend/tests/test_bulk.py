@@ -0,0 +1,237 @@
+"""
+Tests for the batched bulk write endpoints
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import Task
+from app.stats import verify_counters
+
+
+@pytest.fixture
+def task_ids(app):
+    """Ids of five pending tasks and one completed a while ago"""
+    for i in range(5):
+        db.session.add(Task(title=f'Task {i}'))
+    db.session.add(Task(title='Done', completed=True, completed_at=datetime(2026, 1, 1)))
+    db.session.commit()
+    return [task.id for task in Task.query.order_by(Task.id)]
+
+
+@pytest.fixture
+def updates(app):
+    """Capture UPDATE statements against tasks"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('UPDATE tasks '):
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', capture)
+
+
+@pytest.fixture
+def inserts(app):
+    """Capture INSERT statements against tasks with their parameter counts"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT INTO tasks '):
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', capture)
+
+
+def _tasks(count, **fields):
+    return [dict({'title': f'Imported {i}'}, **fields) for i in range(count)]
+
+
+class TestBulkCreate:
+    """Test POST /api/tasks/bulk"""
+
+    def test_creates_all(self, client):
+        """Tasks are created in request order like POST /api/tasks would"""
+        response = client.post('/api/tasks/bulk', json={'tasks': [
+            {'title': ' First ', 'description': ' About ', 'priority': 'High'},
+            {'title': 'Second', 'completed': True},
+        ]})
+        assert response.status_code == 201
+        data = json.loads(response.data)
+        assert data['created'] == 2 and data['failed'] == 0
+
+        first, second = [result['task'] for result in data['results']]
+        assert first['id'] < second['id']
+        assert first['title'] == 'First' and first['description'] == 'About'
+        assert second['priority'] == 'Medium' and second['completed_at'] is not None
+        assert second == Task.query.get(second['id']).to_dict()
+
+    def test_batched(self, client, app, inserts):
+        """Rows go out in multi-row INSERT batches"""
+        app.config['BULK_BATCH_SIZE'] = 100
+        response = client.post('/api/tasks/bulk?return=ids', json={'tasks': _tasks(250)})
+
+        ids = json.loads(response.data)['ids']
+        assert len(ids) == 250 and ids == sorted(ids)
+        assert len(inserts) == 3
+        assert Task.query.count() == 250
+        assert verify_counters(db.session) == {}
+
+    def test_atomic_rejects_all(self, client):
+        """One invalid task fails the whole request by default"""
+        response = client.post('/api/tasks/bulk', json={'tasks': [
+            {'title': 'Good'}, {'title': ''}, {'title': 'Bad', 'priority': 'Urgent'}, 'nope',
+        ]})
+        assert response.status_code == 422
+        details = json.loads(response.data)['error']['details']
+        assert set(details) == {'1', '2', '3'}
+        assert 'priority' in details['2']
+        assert Task.query.count() == 0
+
+    def test_partial(self, client):
+        """atomic=false creates the valid tasks and reports the rest"""
+        response = client.post('/api/tasks/bulk?atomic=false&return=ids', json={'tasks': [
+            {'title': 'Good'}, {'title': 42}, {'title': 'Also good'},
+        ]})
+        assert response.status_code == 207
+        data = json.loads(response.data)
+        assert data['created'] == 2 and data['failed'] == 1
+        assert data['ids'][1] is None and None not in (data['ids'][0], data['ids'][2])
+        assert data['errors'] == [{'index': 1, 'errors': {'title': 'Title must be a string'}}]
+
+    @pytest.mark.parametrize('body, query, code', [
+        ({}, '', 'INVALID_REQUEST'),
+        ({'tasks': []}, '', 'INVALID_REQUEST'),
+        ({'tasks': [{'title': 'x'}]}, 'return=everything', 'INVALID_RETURN'),
+    ])
+    def test_invalid_request(self, client, body, query, code):
+        """Malformed requests are rejected before validation"""
+        response = client.post(f'/api/tasks/bulk?{query}', json=body)
+        assert response.status_code == 400
+        assert json.loads(response.data)['error']['code'] == code
+
+    def test_too_many(self, client, app):
+        """Requests above BULK_MAX_TASKS are rejected"""
+        app.config['BULK_MAX_TASKS'] = 5
+        response = client.post('/api/tasks/bulk', json={'tasks': _tasks(6)})
+        assert json.loads(response.data)['error']['code'] == 'TOO_MANY_TASKS'
+
+
+class TestBulkUpdate:
+    """Test PUT /api/tasks/bulk"""
+
+    def test_set_based(self, client, task_ids, updates):
+        """All tasks are changed by one UPDATE and returned in id order"""
+        response = client.put('/api/tasks/bulk', json={
+            'task_ids': task_ids[::-1] + [9999], 'updates': {'completed': True, 'priority': 'High'}
+        })
+        assert response.status_code == 200
+        tasks = json.loads(response.data)['tasks']
+
+        assert len(updates) == 1
+        assert [task['id'] for task in tasks] == task_ids
+        assert all(task['completed'] and task['priority'] == 'High' for task in tasks)
+        assert tasks == [Task.query.get(task_id).to_dict() for task_id in task_ids]
+        assert verify_counters(db.session) == {}
+
+    def test_completed_at(self, client, task_ids):
+        """Existing completion times are kept; reopening clears them"""
+        response = client.put('/api/tasks/bulk', json={
+            'task_ids': task_ids, 'updates': {'completed': True}
+        })
+        tasks = json.loads(response.data)['tasks']
+        assert tasks[-1]['completed_at'] == '2026-01-01T00:00:00'
+        assert tasks[0]['completed_at'] != '2026-01-01T00:00:00'
+
+        response = client.put('/api/tasks/bulk', json={
+            'task_ids': task_ids, 'updates': {'completed': False}
+        })
+        assert all(task['completed_at'] is None for task in json.loads(response.data)['tasks'])
+
+    def test_chunked(self, client, app, task_ids, updates):
+        """Long id lists are split into separately committed chunks"""
+        app.config['BULK_UPDATE_CHUNK_SIZE'] = 2
+        response = client.put('/api/tasks/bulk?return=minimal', json={
+            'task_ids': task_ids, 'updates': {'title': ' Renamed '}
+        })
+        assert json.loads(response.data) == {'updated': 6, 'ids': task_ids}
+        assert len(updates) == 3
+        assert {task.title for task in Task.query} == {'Renamed'}
+
+    @pytest.mark.parametrize('body, status_code', [
+        ({'task_ids': 'all', 'updates': {}}, 400),
+        ({'task_ids': [1], 'updates': {'priority': 'Urgent'}}, 422),
+        ({'task_ids': [1], 'updates': {'version': 3}}, 400),
+        ({'task_ids': [1], 'updates': {'completed': True, 'version': 3}}, 400),
+        ({'task_ids': [1], 'updates': {}}, 400),
+        ({'task_ids': [1], 'updates': ['completed']}, 400),
+    ])
+    def test_invalid(self, client, task_ids, body, status_code):
+        """Bad ids and updates are rejected without touching any task"""
+        assert client.put('/api/tasks/bulk', json=body).status_code == status_code
+        assert {task.version for task in Task.query} == {1}
+
+
+@pytest.fixture
+def mixed_tasks(app):
+    """Tasks spread over priorities, completion states and topics"""
+    layout = [
+        ('Cleanup old branches', 'Low', False), ('Cleanup the wiki', 'Low', False),
+        ('Write docs', 'Low', False), ('Cleanup logs', 'High', False),
+        ('Ship release', 'High', True), ('Fix bug', 'Medium', True),
+    ]
+    for title, priority, completed in layout:
+        db.session.add(Task(title=title, priority=priority, completed=completed))
+    db.session.commit()
+
+
+class TestFilterMutations:
+    """Test POST /api/tasks/bulk/update and /api/tasks/bulk/delete"""
+
+    def test_update_matching(self, client, app, mixed_tasks, updates):
+        """Every matching task is updated, one chunk per statement"""
+        app.config['BULK_UPDATE_CHUNK_SIZE'] = 1
+        response = client.post('/api/tasks/bulk/update?priority=Low&search=cleanup&completed=false',
+                               json={'updates': {'completed': True}})
+        assert json.loads(response.data) == {'action': 'update', 'dry_run': False, 'affected': 2}
+        assert len(updates) == 2
+
+        done = {task.title for task in Task.query.filter_by(completed=True)}
+        assert done == {'Cleanup old branches', 'Cleanup the wiki', 'Ship release', 'Fix bug'}
+        assert all(task.completed_at for task in Task.query.filter(Task.title.like('Cleanup the%')))
+        assert verify_counters(db.session) == {}
+
+    def test_delete_matching(self, client, mixed_tasks):
+        """Deleting by filter removes exactly the matching tasks"""
+        response = client.post('/api/tasks/bulk/delete?completed=true')
+        assert json.loads(response.data)['affected'] == 2
+        assert Task.query.count() == 4
+        assert verify_counters(db.session) == {}
+
+    def test_dry_run(self, client, mixed_tasks):
+        """A dry run counts without writing"""
+        response = client.post('/api/tasks/bulk/delete?priority=Low&dry_run=true')
+        assert json.loads(response.data) == {'action': 'delete', 'dry_run': True, 'matched': 3}
+        assert Task.query.count() == 6
+
+    def test_requires_filter(self, client, mixed_tasks):
+        """Touching every task needs an explicit all=true"""
+        response = client.post('/api/tasks/bulk/delete')
+        assert response.status_code == 400
+        assert json.loads(response.data)['error']['code'] == 'MISSING_FILTER'
+
+        response = client.post('/api/tasks/bulk/update?all=true', json={'updates': {'priority': 'Low'}})
+        assert json.loads(response.data)['affected'] == 6
+
+    def test_invalid_updates(self, client, mixed_tasks):
+        """Updates are validated like PUT /api/tasks/<id>"""
+        response = client.post('/api/tasks/bulk/update?all=true', json={'updates': {'priority': 'Urgent'}})
+        assert response.status_code == 422
+        assert client.post('/api/tasks/bulk/update?all=true', json={}).status_code == 400
@@ -0,0 +1,117 @@
+"""
+Tests for the GET /api/tasks result cache
+"""
+
+import json
+
+import pytest
+from app import db
+from app.cache import ResultCache
+from app.models import Task
+
+
+@pytest.fixture
+def cached_app(app):
+    """Application with the result cache switched on"""
+    app.config['TASK_RESULT_CACHE_ENABLED'] = True
+    for i in range(10):
+        db.session.add(Task(title=f'Task {i}', priority='High' if i % 2 else 'Low'))
+    db.session.commit()
+    return app
+
+
+def _stats(client):
+    """Return the result cache counters"""
+    return json.loads(client.get('/api/cache/stats').data)['task_results']
+
+
+class TestResultCache:
+    """Test the cache container"""
+
+    def test_lru_eviction_by_bytes(self):
+        """The least recently used bodies go first once max_bytes is exceeded"""
+        cache = ResultCache(max_bytes=10)
+        cache.set('a', 1, b'aaaa')
+        cache.set('b', 1, b'bbbb')
+        assert cache.get('a', 1) == b'aaaa'
+
+        cache.set('c', 1, b'cccc')
+        assert cache.get('b', 1) is None
+        assert cache.get('a', 1) == b'aaaa'
+        assert cache.stats()['evictions'] == 1
+        assert cache.stats()['bytes'] == 8
+
+    def test_generation_invalidates(self):
+        """Entries from older generations are misses and are not stored"""
+        cache = ResultCache()
+        cache.set('a', 1, b'old')
+        assert cache.get('a', 2) is None
+
+        cache.set('b', 2, b'new')
+        cache.set('a', 1, b'late')
+        assert cache.get('a', 1) is None
+        assert cache.stats()['entries'] == 1
+
+    def test_oversized_body_skipped(self):
+        """A body larger than the whole cache is never stored"""
+        cache = ResultCache(max_bytes=2)
+        cache.set('a', 1, b'abc')
+        assert cache.stats()['entries'] == 0
+
+
+class TestTaskListingCache:
+    """Test caching of GET /api/tasks"""
+
+    def test_repeat_served_without_task_queries(self, cached_app, client, task_selects):
+        """A repeated listing returns the same body without touching tasks"""
+        first = client.get('/api/tasks?priority=High&per_page=3')
+        assert first.headers['X-Cache'] == 'MISS'
+
+        task_selects.clear()
+        second = client.get('/api/tasks?priority=High&per_page=3')
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.data == first.data
+        assert task_selects == []
+
+        stats = _stats(client)
+        assert (stats['hits'], stats['misses']) == (1, 1)
+
+    def test_parameters_are_part_of_the_key(self, cached_app, client):
+        """Different filters, pages or fieldsets are cached separately"""
+        client.get('/api/tasks?priority=High')
+        assert client.get('/api/tasks?priority=Low').headers['X-Cache'] == 'MISS'
+        assert client.get('/api/tasks?priority=High&page=2').headers['X-Cache'] == 'MISS'
+        assert client.get('/api/tasks?priority=High&fields=id').headers['X-Cache'] == 'MISS'
+
+    @pytest.mark.parametrize('write', ['create', 'update', 'delete', 'bulk'])
+    def test_writes_invalidate(self, cached_app, client, write):
+        """Every write endpoint invalidates cached listings"""
+        before = json.loads(client.get('/api/tasks').data)
+        task_id = before['tasks'][0]['id']
+
+        if write == 'create':
+            client.post('/api/tasks', data=json.dumps({'title': 'New'}),
+                        content_type='application/json')
+        elif write == 'update':
+            client.put(f'/api/tasks/{task_id}', data=json.dumps({'title': 'Renamed'}),
+                       content_type='application/json')
+        elif write == 'delete':
+            client.delete(f'/api/tasks/{task_id}')
+        else:
+            client.put('/api/tasks/bulk',
+                       data=json.dumps({'task_ids': [task_id], 'updates': {'title': 'Renamed'}}),
+                       content_type='application/json')
+
+        response = client.get('/api/tasks')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert json.loads(response.data) != before
+
+    def test_disabled_by_default(self, app, client):
+        """Without the config switch nothing is cached"""
+        client.get('/api/tasks')
+        client.get('/api/tasks')
+
+        assert 'X-Cache' not in client.get('/api/tasks').headers
+        stats = _stats(client)
+        assert stats['enabled'] is False
+        assert stats['entries'] == 0
@@ -0,0 +1,95 @@
+"""
+Tests for negotiated response compression
+"""
+
+import gzip
+import json
+import zlib
+
+import pytest
+from app import db
+from app.compression import brotli
+from app.models import Task
+
+
+@pytest.fixture
+def many_tasks(app):
+    """Enough tasks for a listing well above the compression threshold"""
+    for i in range(50):
+        db.session.add(Task(title=f'Task {i}', description='Repetitive description ' * 5))
+    db.session.commit()
+
+
+class TestCompression:
+    """Test Accept-Encoding negotiation"""
+
+    def test_gzip_listing(self, client, many_tasks):
+        """Large listings are gzipped and decode to the identity body"""
+        plain = client.get('/api/tasks')
+        response = client.get('/api/tasks', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert int(response.headers['Content-Length']) < len(plain.data) / 4
+        assert gzip.decompress(response.data) == plain.data
+
+    @pytest.mark.skipif(brotli is None, reason='brotli is not installed')
+    def test_brotli_preferred(self, client, many_tasks):
+        """Brotli wins when the client accepts both"""
+        plain = client.get('/api/tasks')
+        response = client.get('/api/tasks', headers={'Accept-Encoding': 'gzip, deflate, br'})
+
+        assert response.headers['Content-Encoding'] == 'br'
+        assert brotli.decompress(response.data) == plain.data
+
+    def test_quality_values_respected(self, client, many_tasks):
+        """Codings refused with q=0 are never used"""
+        response = client.get('/api/tasks', headers={'Accept-Encoding': 'br;q=0, gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+
+        response = client.get('/api/tasks', headers={'Accept-Encoding': 'identity'})
+        assert 'Content-Encoding' not in response.headers
+
+    def test_small_responses_untouched(self, client, many_tasks):
+        """Bodies below COMPRESSION_MIN_SIZE are sent as-is"""
+        response = client.get('/api/tasks?per_page=1&fields=id',
+                              headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+        assert json.loads(response.data)['tasks']
+
+    def test_disabled(self, app, client, many_tasks):
+        """COMPRESSION_ENABLED switches compression off"""
+        app.config['COMPRESSION_ENABLED'] = False
+        response = client.get('/api/tasks', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+
+    def test_streamed_export(self, app, client, many_tasks):
+        """Streamed responses are compressed chunk by chunk"""
+        app.config['EXPORT_BATCH_SIZE'] = 10
+        plain = client.get('/api/tasks/export')
+
+        response = client.get('/api/tasks/export', headers={'Accept-Encoding': 'gzip'},
+                              buffered=False)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in response.headers
+
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunks = [decoder.decompress(chunk) for chunk in response.response]
+        response.close()
+
+        # Every batch is flushed, so it decodes without waiting for the next
+        assert [chunk.count(b'\n') for chunk in chunks if chunk] == [10] * 5
+        assert b''.join(chunks) == plain.data
+
+    def test_etag_per_encoding(self, client, many_tasks):
+        """Compressed representations get their own ETag and still revalidate"""
+        identity = client.get('/api/tasks').headers['ETag']
+        response = client.get('/api/tasks', headers={'Accept-Encoding': 'gzip'})
+        etag = response.headers['ETag']
+        assert etag != identity
+
+        response = client.get('/api/tasks', headers={
+            'Accept-Encoding': 'gzip', 'If-None-Match': etag
+        })
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
@@ -0,0 +1,176 @@
+"""
+Tests for ETag / Last-Modified conditional requests
+"""
+
+import json
+
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import Task
+
+
+@pytest.fixture
+def tasks(app):
+    """A few tasks, created through the session so the generation advances"""
+    for i in range(3):
+        db.session.add(Task(title=f'Task {i}'))
+    db.session.commit()
+    return [task.id for task in Task.query.order_by(Task.id)]
+
+
+@pytest.mark.parametrize('url', ['/api/tasks?priority=Medium', '/api/tasks/stats'])
+class TestCollectionValidators:
+    """Test the listing and stats endpoints"""
+
+    def test_not_modified_without_reading_tasks(self, client, tasks, task_selects, url):
+        """A matching If-None-Match returns 304 without querying tasks"""
+        response = client.get(url)
+        etag = response.headers['ETag']
+        assert response.headers['Last-Modified']
+
+        task_selects.clear()
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+        assert task_selects == []
+
+    def test_if_modified_since(self, client, tasks, url):
+        """Last-Modified can be used as a validator too"""
+        last_modified = client.get(url).headers['Last-Modified']
+        response = client.get(url, headers={'If-Modified-Since': last_modified})
+        assert response.status_code == 304
+
+    def test_write_changes_etag(self, client, tasks, url):
+        """Any committed write yields a new ETag and a full response"""
+        etag = client.get(url).headers['ETag']
+        client.delete(f'/api/tasks/{tasks[0]}')
+
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+
+@pytest.mark.parametrize('count', ['estimated', 'cached'])
+def test_approximate_counts_get_weak_etags(client, tasks, count):
+    """Listings whose total may change without a write have weak ETags"""
+    url = f'/api/tasks?count={count}'
+    first = client.get(url)
+    second = client.get(url)
+    assert first.headers['ETag'].startswith('W/')
+    assert second.headers['ETag'] == first.headers['ETag']
+
+    response = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == first.headers['ETag']
+    assert not client.get('/api/tasks?count=exact').headers['ETag'].startswith('W/')
+
+
+class TestTaskValidators:
+    """Test GET/PUT/DELETE /api/tasks/<id>"""
+
+    def test_not_modified_without_hydration(self, client, tasks, task_selects):
+        """A 304 for a single task reads only its updated_at"""
+        etag = client.get(f'/api/tasks/{tasks[0]}').headers['ETag']
+
+        task_selects.clear()
+        response = client.get(f'/api/tasks/{tasks[0]}', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert len(task_selects) == 1
+        assert 'tasks.title' not in task_selects[0]
+
+    def test_plain_get_reads_once(self, client, tasks, task_selects):
+        """Without validators the task is loaded by a single query"""
+        response = client.get(f'/api/tasks/{tasks[0]}')
+        assert response.status_code == 200
+        assert response.headers['ETag']
+        assert len(task_selects) == 1
+
+    def test_fieldsets_have_distinct_etags(self, client, tasks):
+        """Different representations of a task never share an ETag"""
+        full = client.get(f'/api/tasks/{tasks[0]}').headers['ETag']
+        sparse = client.get(f'/api/tasks/{tasks[0]}?fields=id').headers['ETag']
+        assert full != sparse
+
+    def test_update_changes_etag(self, client, tasks):
+        """The ETag returned by PUT is the task's new ETag"""
+        etag = client.get(f'/api/tasks/{tasks[0]}').headers['ETag']
+        response = client.put(f'/api/tasks/{tasks[0]}',
+                              data=json.dumps({'title': 'Renamed'}),
+                              content_type='application/json')
+        assert response.headers['ETag'] != etag
+        assert client.get(f'/api/tasks/{tasks[0]}').headers['ETag'] == response.headers['ETag']
+
+    def test_if_match_update(self, client, tasks):
+        """PUT with a stale If-Match is rejected with 412"""
+        etag = client.get(f'/api/tasks/{tasks[0]}').headers['ETag']
+
+        response = client.put(f'/api/tasks/{tasks[0]}',
+                              data=json.dumps({'title': 'First'}),
+                              content_type='application/json',
+                              headers={'If-Match': etag})
+        assert response.status_code == 200
+
+        response = client.put(f'/api/tasks/{tasks[0]}',
+                              data=json.dumps({'title': 'Second'}),
+                              content_type='application/json',
+                              headers={'If-Match': etag})
+        assert response.status_code == 412
+        assert json.loads(response.data)['error']['code'] == 'PRECONDITION_FAILED'
+        assert db.session.get(Task, tasks[0]).title == 'First'
+
+    def test_if_match_delete(self, client, tasks):
+        """DELETE honours If-Match, including the * wildcard"""
+        response = client.delete(f'/api/tasks/{tasks[0]}', headers={'If-Match': '"stale"'})
+        assert response.status_code == 412
+
+        response = client.delete(f'/api/tasks/{tasks[0]}', headers={'If-Match': '*'})
+        assert response.status_code == 204
+
+    @pytest.mark.parametrize('method', ['put', 'delete'])
+    def test_if_match_checked_by_the_write(self, client, tasks, method):
+        """A change landing after the If-Match check still fails the write"""
+        etag = client.get(f'/api/tasks/{tasks[0]}').headers['ETag']
+
+        raced = []
+
+        def concurrent_write(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith(('UPDATE tasks', 'DELETE FROM tasks')) and not raced:
+                raced.append(statement)
+                cursor.connection.execute(
+                    "UPDATE tasks SET title = 'Concurrent', "
+                    "updated_at = '2030-01-01 00:00:00.000000' WHERE id = ?",
+                    (tasks[0],)
+                )
+
+        event.listen(db.engine, 'before_cursor_execute', concurrent_write)
+        try:
+            response = getattr(client, method)(f'/api/tasks/{tasks[0]}', json={'title': 'Mine'},
+                                               headers={'If-Match': etag})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', concurrent_write)
+        assert raced
+        assert response.status_code == 412
+        assert response.headers['ETag'] == client.get(f'/api/tasks/{tasks[0]}').headers['ETag']
+        assert db.session.get(Task, tasks[0]).title == 'Concurrent'
+
+    def test_if_match_missing_task(self, client, tasks):
+        """A conditional write to a missing task is a 404"""
+        response = client.put('/api/tasks/999', json={'title': 'Gone'}, headers={'If-Match': '*'})
+        assert response.status_code == 404
+
+
+def test_cors_preflight(client):
+    """Cross-origin clients may send validators and read the ETag"""
+    response = client.options('/api/tasks/1', headers={
+        'Origin': 'http://localhost:3000',
+        'Access-Control-Request-Method': 'PUT',
+        'Access-Control-Request-Headers': 'content-type, if-match, if-none-match'
+    })
+    allowed = response.headers['Access-Control-Allow-Headers'].lower()
+    assert {'content-type', 'if-match', 'if-none-match'} <= set(allowed.split(', '))
+
+    response = client.get('/api/tasks', headers={'Origin': 'http://localhost:3000'})
+    exposed = response.headers['Access-Control-Expose-Headers'].lower()
+    assert {'etag', 'last-modified'} <= set(exposed.split(', '))
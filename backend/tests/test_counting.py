@@ -0,0 +1,155 @@
+"""
+Tests for the count strategies of GET /api/tasks and write generations
+"""
+
+import json
+
+import pytest
+from sqlalchemy import text, update
+from app import db
+from app.generation import current_generation
+from app.models import Task
+
+
+@pytest.fixture
+def counted_tasks(app):
+    """Thirty tasks: a third completed, priorities evenly spread"""
+    priorities = ['High', 'Medium', 'Low']
+    for i in range(30):
+        db.session.add(Task(
+            title=f'Task {i}',
+            priority=priorities[i % 3],
+            completed=i % 3 == 0
+        ))
+    db.session.commit()
+    return 30
+
+
+def _pagination(client, query):
+    """Return the pagination block for a query string"""
+    response = client.get(f'/api/tasks?{query}')
+    assert response.status_code == 200
+    return json.loads(response.data)['pagination']
+
+
+class TestCountStrategies:
+    """Test the count= parameter"""
+
+    def test_exact_is_default(self, client, counted_tasks):
+        """Without count= the exact total is reported"""
+        pagination = _pagination(client, 'per_page=10')
+        assert pagination['total'] == counted_tasks
+        assert pagination['count_strategy'] == 'exact'
+
+    def test_none_skips_total(self, client, counted_tasks):
+        """count=none omits the total but still knows whether more pages exist"""
+        pagination = _pagination(client, 'count=none&per_page=10&page=3')
+        assert pagination['total'] is None
+        assert pagination['pages'] is None
+        assert pagination['count_strategy'] == 'none'
+        assert pagination['has_next'] is False
+
+        assert _pagination(client, 'count=none&per_page=10&page=2')['has_next'] is True
+
+    def test_estimated_without_statistics_falls_back(self, client, counted_tasks):
+        """Before ANALYZE there is nothing to estimate from"""
+        pagination = _pagination(client, 'count=estimated&completed=true')
+        assert pagination['count_strategy'] == 'exact'
+        assert pagination['total'] == 10
+
+    def test_estimated_uses_statistics(self, client, counted_tasks):
+        """After ANALYZE the estimate comes from sqlite_stat1"""
+        db.session.execute(text('ANALYZE'))
+        db.session.commit()
+
+        pagination = _pagination(client, 'count=estimated&completed=true')
+        assert pagination['count_strategy'] == 'estimated'
+        assert pagination['total'] == 10
+
+        pagination = _pagination(client, 'count=estimated&priority=High')
+        assert pagination['count_strategy'] == 'estimated'
+        assert pagination['total'] == 10
+
+    def test_cached_invalidated_by_writes(self, client, counted_tasks):
+        """Cached counts are reused until a write commits"""
+        first = _pagination(client, 'count=cached&priority=High')
+        assert first['count_strategy'] == 'exact'
+
+        second = _pagination(client, 'count=cached&priority=High')
+        assert second['count_strategy'] == 'cached'
+        assert second['total'] == first['total']
+
+        client.post('/api/tasks',
+                    data=json.dumps({'title': 'New', 'priority': 'High'}),
+                    content_type='application/json')
+
+        third = _pagination(client, 'count=cached&priority=High')
+        assert third['count_strategy'] == 'exact'
+        assert third['total'] == first['total'] + 1
+
+    def test_cursor_mode_defaults_to_no_count(self, client, counted_tasks):
+        """Cursor pages skip the count unless one is requested"""
+        assert _pagination(client, 'cursor=')['count_strategy'] == 'none'
+
+        pagination = _pagination(client, 'cursor=&count=exact')
+        assert pagination['total'] == counted_tasks
+
+    def test_invalid_strategy(self, client):
+        """Unknown strategies are rejected"""
+        response = client.get('/api/tasks?count=sometimes')
+        assert response.status_code == 400
+        assert json.loads(response.data)['error']['code'] == 'INVALID_COUNT_STRATEGY'
+
+
+class TestWriteGenerations:
+    """Test the tasks table write generation"""
+
+    def test_unit_of_work_writes_bump(self, client, counted_tasks):
+        """Create, update, delete and bulk update each bump the generation"""
+        generation, _ = current_generation(db.session)
+
+        response = client.post('/api/tasks',
+                               data=json.dumps({'title': 'Bump'}),
+                               content_type='application/json')
+        task_id = json.loads(response.data)['task']['id']
+        assert current_generation(db.session)[0] == generation + 1
+
+        client.put(f'/api/tasks/{task_id}',
+                   data=json.dumps({'completed': True}),
+                   content_type='application/json')
+        assert current_generation(db.session)[0] == generation + 2
+
+        client.put('/api/tasks/bulk',
+                   data=json.dumps({'task_ids': [task_id], 'updates': {'priority': 'Low'}}),
+                   content_type='application/json')
+        assert current_generation(db.session)[0] == generation + 3
+
+        client.delete(f'/api/tasks/{task_id}')
+        assert current_generation(db.session)[0] == generation + 4
+
+    def test_set_based_statements_bump(self, app, counted_tasks):
+        """UPDATE statements executed through the session bump once per commit"""
+        generation, _ = current_generation(db.session)
+
+        db.session.execute(update(Task).values(priority='Low'))
+        db.session.execute(update(Task).values(priority='High'))
+        db.session.commit()
+
+        assert current_generation(db.session)[0] == generation + 1
+
+    def test_reads_do_not_bump(self, client, counted_tasks):
+        """Listing tasks leaves the generation untouched"""
+        generation, _ = current_generation(db.session)
+        client.get('/api/tasks')
+        db.session.commit()
+        assert current_generation(db.session)[0] == generation
+
+    def test_rollback_discards_bump(self, app, counted_tasks):
+        """A rolled back write does not advance the generation"""
+        generation, _ = current_generation(db.session)
+
+        db.session.add(Task(title='Discarded'))
+        db.session.flush()
+        db.session.rollback()
+
+        assert current_generation(db.session)[0] == generation
@@ -0,0 +1,83 @@
+"""
+Tests for the streaming export endpoint GET /api/tasks/export
+"""
+
+import csv
+import io
+import json
+
+import pytest
+from app import db
+from app.models import Task
+
+
+@pytest.fixture
+def export_tasks(app):
+    """Tasks including CSV-hostile titles and multi-line descriptions"""
+    for i in range(7):
+        db.session.add(Task(
+            title=f'Task, "{i}"',
+            description=f'Line one\nLine two {i}' if i % 2 else None,
+            priority='High' if i < 3 else 'Low',
+            completed=i % 2 == 0
+        ))
+    db.session.commit()
+    return 7
+
+
+class TestExport:
+    """Test NDJSON and CSV export"""
+
+    def test_ndjson_matches_task_representation(self, app, client, export_tasks):
+        """Each NDJSON line equals the task's API representation"""
+        response = client.get('/api/tasks/export')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert response.is_streamed
+
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        expected = [task.to_dict() for task in Task.query.order_by(Task.id)]
+        assert lines == expected
+
+    def test_csv_round_trip(self, client, export_tasks):
+        """CSV output parses back to the exported values"""
+        response = client.get('/api/tasks/export?format=csv')
+        assert response.mimetype == 'text/csv'
+        assert 'tasks.csv' in response.headers['Content-Disposition']
+
+        rows = list(csv.DictReader(io.StringIO(response.data.decode())))
+        assert len(rows) == export_tasks
+        assert rows[0]['title'] == 'Task, "0"'
+        assert rows[1]['description'] == 'Line one\nLine two 1'
+        assert rows[0]['completed'] == 'true'
+        assert rows[0]['completed_at'] == ''
+
+    def test_filters_and_fields(self, client, export_tasks):
+        """Export honours the listing filters and a column subset"""
+        response = client.get('/api/tasks/export?format=csv&priority=High&completed=true'
+                              '&fields=id,title')
+        rows = list(csv.reader(io.StringIO(response.data.decode())))
+
+        assert rows[0] == ['id', 'title']
+        assert [row[1] for row in rows[1:]] == ['Task, "0"', 'Task, "2"']
+
+    def test_search_filter(self, client, export_tasks):
+        """The search filter uses the same matching as the listing"""
+        response = client.get('/api/tasks/export?search=line&fields=id')
+        ids = [json.loads(line)['id'] for line in response.data.decode().splitlines()]
+        assert len(ids) == 3
+
+    def test_streams_in_batches(self, app, client, export_tasks):
+        """Rows are produced in chunks of EXPORT_BATCH_SIZE"""
+        app.config['EXPORT_BATCH_SIZE'] = 2
+        response = client.get('/api/tasks/export', buffered=False)
+        chunks = [chunk for chunk in response.response if chunk]
+        response.close()
+
+        assert [chunk.count(b'\n') for chunk in chunks] == [2, 2, 2, 1]
+
+    def test_invalid_format(self, client):
+        """Unknown formats are rejected"""
+        response = client.get('/api/tasks/export?format=xml')
+        assert response.status_code == 400
+        assert json.loads(response.data)['error']['code'] == 'INVALID_FORMAT'
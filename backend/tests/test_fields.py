@@ -0,0 +1,90 @@
+"""
+Tests for sparse fieldsets on GET /api/tasks and GET /api/tasks/<id>
+"""
+
+import json
+
+import pytest
+from app import db
+from app.models import Task
+
+
+@pytest.fixture
+def described_tasks(app):
+    """Tasks with long descriptions that list views never show"""
+    for i in range(5):
+        db.session.add(Task(
+            title=f'Task {i}',
+            description='Long description ' * 50,
+            priority='High' if i % 2 else 'Low',
+            completed=i == 0
+        ))
+    db.session.commit()
+
+
+class TestSparseFieldsets:
+    """Test the fields= parameter"""
+
+    def test_list_serializes_only_requested_fields(self, client, described_tasks):
+        """Each task carries exactly the requested keys"""
+        response = client.get('/api/tasks?fields=id,title,priority,completed')
+        assert response.status_code == 200
+
+        tasks = json.loads(response.data)['tasks']
+        assert len(tasks) == 5
+        for task in tasks:
+            assert set(task) == {'id', 'title', 'priority', 'completed'}
+
+    def test_list_does_not_load_description(self, client, described_tasks, task_selects):
+        """Unrequested Text columns are left out of the SELECT"""
+        client.get('/api/tasks?fields=id,title')
+
+        page_query = task_selects[-1]
+        assert 'tasks.title' in page_query
+        assert 'tasks.description' not in page_query
+
+    def test_timestamps_are_serialized(self, client, described_tasks):
+        """Requested timestamps keep their ISO 8601 format"""
+        response = client.get('/api/tasks?fields=title,created_at')
+        task = json.loads(response.data)['tasks'][0]
+
+        assert set(task) == {'title', 'created_at'}
+        assert 'T' in task['created_at']
+
+    def test_cursor_mode_without_sort_field(self, client, described_tasks):
+        """Cursors still work when the sort key is not a requested field"""
+        response = client.get('/api/tasks?fields=title&sort=created_at&cursor=&per_page=2')
+        data = json.loads(response.data)
+        assert set(data['tasks'][0]) == {'title'}
+
+        cursor = data['pagination']['next_cursor']
+        response = client.get(f'/api/tasks?fields=title&sort=created_at&cursor={cursor}&per_page=2')
+        assert response.status_code == 200
+
+    def test_single_task(self, client, described_tasks, task_selects):
+        """GET /api/tasks/<id> honours the fieldset"""
+        task_id = Task.query.first().id
+        db.session.expunge_all()
+        task_selects.clear()
+
+        response = client.get(f'/api/tasks/{task_id}?fields=title,completed')
+        assert response.status_code == 200
+        assert json.loads(response.data)['task'] == {
+            'title': 'Task 0', 'completed': True
+        }
+        assert 'tasks.description' not in task_selects[-1]
+
+    def test_unknown_field_rejected(self, client, described_tasks):
+        """Unknown field names return 400"""
+        response = client.get('/api/tasks?fields=id,secret')
+        assert response.status_code == 400
+        assert json.loads(response.data)['error']['code'] == 'INVALID_FIELDS'
+
+        response = client.get('/api/tasks/1?fields=,')
+        assert response.status_code == 400
+
+    def test_full_representation_unchanged(self, client, described_tasks):
+        """Without fields= every key is returned as before"""
+        response = client.get('/api/tasks')
+        task = json.loads(response.data)['tasks'][0]
+        assert set(task) == set(Task.FIELDS)
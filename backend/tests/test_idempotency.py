@@ -0,0 +1,187 @@
+"""
+Tests for Idempotency-Key replay on task-creating and bulk endpoints
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Response
+from app import db
+from app.idempotency import (
+    IdempotencyInProgress, IdempotencyKeyReused, IdempotencyStore, purge_expired
+)
+from app.models import IdempotencyKey, Task
+
+
+def _post(client, url, body, key):
+    return client.post(url, json=body, headers={'Idempotency-Key': key})
+
+
+class TestIdempotentEndpoints:
+    """Test the Idempotency-Key header on write endpoints"""
+
+    def test_retry_replays(self, client, app, statements):
+        """A retry gets the first response without touching tasks"""
+        first = _post(client, '/api/tasks', {'title': 'Once'}, 'key-1')
+        assert first.status_code == 201
+
+        for clear_memory in (False, True):
+            if clear_memory:
+                app.extensions['idempotency_store'].clear()
+            del statements[:]
+            retry = _post(client, '/api/tasks', {'title': 'Once'}, 'key-1')
+            assert retry.status_code == 201
+            assert retry.data == first.data
+            assert retry.headers['Idempotent-Replayed'] == 'true'
+            if not clear_memory:
+                assert statements == []
+
+        assert statements and all('idempotency_keys' in s for s in statements)
+        assert Task.query.count() == 1
+
+    def test_without_key(self, client):
+        """Requests without the header are not deduplicated"""
+        client.post('/api/tasks', json={'title': 'Twice'})
+        client.post('/api/tasks', json={'title': 'Twice'})
+        assert Task.query.count() == 2
+
+    def test_bulk_paths(self, client):
+        """Bulk endpoints replay too, and keys are scoped per endpoint"""
+        body = {'tasks': [{'title': 'A'}, {'title': 'B'}]}
+        first = _post(client, '/api/tasks/bulk?return=ids', body, 'shared')
+        retry = _post(client, '/api/tasks/bulk?return=ids', body, 'shared')
+        assert retry.data == first.data and Task.query.count() == 2
+
+        assert _post(client, '/api/tasks', {'title': 'C'}, 'shared').status_code == 201
+        assert Task.query.count() == 3
+
+        response = client.post('/api/tasks/bulk/delete?search=A', headers={'Idempotency-Key': 'del'})
+        assert json.loads(response.data)['affected'] == 1
+        client.post('/api/tasks', json={'title': 'A again'})
+        response = client.post('/api/tasks/bulk/delete?search=A', headers={'Idempotency-Key': 'del'})
+        assert json.loads(response.data)['affected'] == 1
+        assert Task.query.filter(Task.title == 'A again').count() == 1
+
+    def test_key_reused(self, client):
+        """The same key with a different body is rejected"""
+        _post(client, '/api/tasks', {'title': 'One'}, 'key-2')
+        response = _post(client, '/api/tasks', {'title': 'Other'}, 'key-2')
+        assert response.status_code == 422
+        assert json.loads(response.data)['error']['code'] == 'IDEMPOTENCY_KEY_REUSED'
+
+    def test_invalid_key(self, client):
+        """Keys must be 1 to 255 characters"""
+        response = _post(client, '/api/tasks', {'title': 'One'}, 'k' * 256)
+        assert response.status_code == 400
+        assert json.loads(response.data)['error']['code'] == 'INVALID_IDEMPOTENCY_KEY'
+
+    def test_expired_key(self, client):
+        """An expired key is forgotten and runs the request again"""
+        _post(client, '/api/tasks', {'title': 'Old'}, 'key-3')
+        db.session.query(IdempotencyKey).update({'expires_at': datetime(2000, 1, 1)})
+        db.session.commit()
+        client.application.extensions['idempotency_store'].clear()
+
+        assert 'Idempotent-Replayed' not in _post(client, '/api/tasks', {'title': 'Old'}, 'key-3').headers
+        assert Task.query.count() == 2
+
+    def test_purge_expired(self, client):
+        """purge_expired deletes only expired keys"""
+        _post(client, '/api/tasks', {'title': 'One'}, 'keep')
+        _post(client, '/api/tasks', {'title': 'Two'}, 'drop')
+        db.session.query(IdempotencyKey).filter_by(key='drop').update(
+            {'expires_at': datetime(2000, 1, 1)}
+        )
+        assert purge_expired(db.session) == 1
+        db.session.commit()
+        assert [row.key for row in IdempotencyKey.query] == ['keep']
+
+
+@pytest.fixture
+def file_app(make_app, tmp_path):
+    """Application on a SQLite file, shared by several threads"""
+    app = make_app(SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path / "idempotency.db"}')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+def _claim_in_thread(app, store, results, fingerprint='f'):
+    def claim():
+        with app.app_context():
+            try:
+                results.append(store.claim(db.session, 'POST /api/tasks', 'key', fingerprint))
+            except Exception as e:
+                results.append(e)
+    thread = threading.Thread(target=claim)
+    thread.start()
+    return thread
+
+
+class TestIdempotencyStore:
+    """Test IdempotencyStore claims across threads and processes"""
+
+    def test_duplicate_waits_for_first(self, file_app):
+        """A concurrent duplicate in the same process waits for the response"""
+        store = IdempotencyStore()
+        assert store.claim(db.session, 'POST /api/tasks', 'key', 'f') is None
+
+        results = []
+        thread = _claim_in_thread(file_app, store, results)
+        time.sleep(0.1)
+        assert results == []
+
+        store.complete(db.session, 'POST /api/tasks', 'key', 'f', Response(b'{}', status=201))
+        thread.join(5)
+        assert results[0].status_code == 201 and results[0].body == b'{}'
+
+    def test_other_process_polls(self, file_app):
+        """A duplicate in another process polls the pending row"""
+        first, second = IdempotencyStore(), IdempotencyStore(poll_interval=0.01)
+        assert first.claim(db.session, 'POST /api/tasks', 'key', 'f') is None
+
+        results = []
+        thread = _claim_in_thread(file_app, second, results)
+        time.sleep(0.1)
+        first.complete(db.session, 'POST /api/tasks', 'key', 'f', Response(b'[]', status=200))
+        thread.join(5)
+        assert results[0].body == b'[]'
+
+    def test_wait_timeout(self, file_app):
+        """Waiting gives up after wait_timeout"""
+        first, second = IdempotencyStore(), IdempotencyStore(wait_timeout=0.1, poll_interval=0.01)
+        first.claim(db.session, 'POST /api/tasks', 'key', 'f')
+        with pytest.raises(IdempotencyInProgress):
+            second.claim(db.session, 'POST /api/tasks', 'key', 'f')
+        with pytest.raises(IdempotencyKeyReused):
+            second.claim(db.session, 'POST /api/tasks', 'key', 'g')
+
+    def test_slow_request_keeps_its_key(self, file_app):
+        """A retry during a request running past lock_timeout is not re-executed"""
+        first = IdempotencyStore(lock_timeout=0.2, heartbeat_interval=0.05)
+        retrying = IdempotencyStore(wait_timeout=0.1, lock_timeout=0.2, poll_interval=0.01)
+        assert first.claim(db.session, 'POST /api/tasks', 'key', 'f') is None
+
+        time.sleep(0.5)
+        with pytest.raises(IdempotencyInProgress):
+            retrying.claim(db.session, 'POST /api/tasks', 'key', 'f')
+
+        first.complete(db.session, 'POST /api/tasks', 'key', 'f', Response(b'{}', status=201))
+        assert retrying.claim(db.session, 'POST /api/tasks', 'key', 'f').status_code == 201
+
+    def test_abandoned_claims(self, file_app):
+        """Abandoned and stale pending keys can be claimed again"""
+        store = IdempotencyStore(lock_timeout=60)
+        store.claim(db.session, 'POST /api/tasks', 'key', 'f')
+        store.abandon(db.session, 'POST /api/tasks', 'key')
+        assert store.claim(db.session, 'POST /api/tasks', 'key', 'f') is None
+
+        db.session.query(IdempotencyKey).update(
+            {'created_at': datetime.utcnow() - timedelta(minutes=5)}
+        )
+        db.session.commit()
+        assert IdempotencyStore().claim(db.session, 'POST /api/tasks', 'key', 'f') is None
@@ -0,0 +1,160 @@
+"""
+Query plan tests for the tasks table indexes
+
+Loads a realistically sized table, replays the filter/sort matrix of
+GET /api/tasks plus the task counter verification, and checks with EXPLAIN QUERY PLAN
+that SQLite answers every statement from an index instead of a full scan.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, text
+from app import create_app, db
+from app.models import Task
+from app.stats import verify_counters
+
+
+ROW_COUNT = 100_000
+
+
+@pytest.fixture(scope='module')
+def large_app():
+    """Application whose database holds ROW_COUNT tasks with fresh statistics"""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        _load_tasks()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def large_client(large_app):
+    """Test client bound to the large application"""
+    return large_app.test_client()
+
+
+def _load_tasks():
+    """Bulk load ROW_COUNT tasks and refresh planner statistics"""
+    rng = random.Random(42)
+    base = datetime(2024, 1, 1)
+    rows = []
+    for i in range(ROW_COUNT):
+        created = base + timedelta(seconds=i * 37)
+        completed = rng.random() < 0.3
+        rows.append({
+            'title': f'Task {rng.randrange(50_000)}',
+            'description': 'Generated for query plan tests',
+            'priority': rng.choice(['High', 'Medium', 'Low']),
+            'completed': completed,
+            'created_at': created,
+            'updated_at': created + timedelta(minutes=rng.randrange(600)),
+            'completed_at': created + timedelta(hours=1) if completed else None
+        })
+    db.session.execute(Task.__table__.insert(), rows)
+    db.session.commit()
+    db.session.execute(text('ANALYZE'))
+
+
+@pytest.fixture
+def captured_selects(large_app):
+    """Record every SELECT against tasks issued while the fixture is active"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and 'tasks' in statement:
+            statements.append((statement, parameters))
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', capture)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', capture)
+
+
+def _plan(statement, parameters):
+    """Return the EXPLAIN QUERY PLAN detail lines for a statement"""
+    raw = db.engine.raw_connection()
+    try:
+        rows = raw.cursor().execute(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+    finally:
+        raw.close()
+    return [row[-1] for row in rows]
+
+
+def _assert_indexed(statement, parameters):
+    """Fail if any step of the plan scans the tasks table without an index"""
+    plan = _plan(statement, parameters)
+    full_scans = [step for step in plan if step.strip() == 'SCAN tasks']
+    assert not full_scans, f'Full table scan for {statement!r}: {plan}'
+    assert any('INDEX' in step for step in plan), plan
+    return plan
+
+
+FILTERS = [
+    {},
+    {'completed': 'true'},
+    {'completed': 'false'},
+    {'priority': 'High'},
+    {'priority': 'Low', 'completed': 'false'},
+]
+SORTS = ['created_at', 'updated_at', 'title', 'priority']
+
+
+class TestTaskIndexes:
+    """Test that the API query shapes are served by indexes"""
+
+    @pytest.mark.parametrize('cursor', [False, True])
+    def test_list_matrix_uses_indexes(self, large_client, captured_selects, cursor):
+        """Every filter/sort combination of GET /api/tasks is index-backed"""
+        for filters in FILTERS:
+            for sort in SORTS:
+                params = {**filters, 'sort': sort, 'order': 'desc', 'per_page': 50}
+                if cursor:
+                    params['cursor'] = ''
+                captured_selects.clear()
+
+                response = large_client.get('/api/tasks', query_string=params)
+                assert response.status_code == 200
+                if cursor:
+                    # Also check the seek predicate used by deeper pages
+                    params['cursor'] = response.get_json()['pagination']['next_cursor']
+                    response = large_client.get('/api/tasks', query_string=params)
+                    assert response.status_code == 200
+
+                assert captured_selects
+                for statement, parameters in captured_selects:
+                    _assert_indexed(statement, parameters)
+
+    @pytest.mark.parametrize('filters', [{}, {'completed': 'true'}, {'priority': 'High'}])
+    def test_default_sort_avoids_sorting(self, large_client, captured_selects, filters):
+        """The default created_at ordering is read straight from an index"""
+        large_client.get('/api/tasks', query_string={**filters, 'per_page': 50})
+
+        page_query = captured_selects[-1]
+        plan = _assert_indexed(*page_query)
+        assert not any('TEMP B-TREE' in step for step in plan), plan
+
+    def test_pending_filter_uses_partial_index(self, large_client, captured_selects):
+        """Listing pending tasks by creation date uses the partial index"""
+        large_client.get('/api/tasks?completed=false&per_page=50')
+
+        plan = _assert_indexed(*captured_selects[-1])
+        assert any('ix_tasks_pending_created_at' in step for step in plan), plan
+
+    def test_stats_do_not_read_tasks(self, large_client, captured_selects):
+        """GET /api/tasks/stats is answered from task_counters alone"""
+        response = large_client.get('/api/tasks/stats')
+        assert response.status_code == 200
+        assert json.loads(response.data)['stats']['total_tasks'] == ROW_COUNT
+        assert captured_selects == []
+
+    def test_counter_verification_uses_index(self, large_app, captured_selects):
+        """The grouped scan behind verify_counters is index-backed"""
+        assert verify_counters(db.session) == {}
+
+        assert captured_selects
+        for statement, parameters in captured_selects:
+            _assert_indexed(statement, parameters)
@@ -6,27 +6,9 @@ Tests the complete API functionality including CORS headers.
 
 import json
 import pytest
-from app import create_app, db
 from app.models import Task
 
 
-@pytest.fixture
-def app():
-    """Create application for testing"""
-    app = create_app('testing')
-    
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.drop_all()
-
-
-@pytest.fixture
-def client(app):
-    """Create test client"""
-    return app.test_client()
-
-
 @pytest.fixture
 def sample_task():
     """Sample task data for testing"""
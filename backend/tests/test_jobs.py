@@ -0,0 +1,173 @@
+"""
+Tests for background jobs and the async=true bulk endpoints
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from app import db
+from app.jobs import JOB_HANDLERS
+from app.models import Job, Task
+from app.stats import verify_counters
+
+
+@pytest.fixture
+def jobs_app(make_app, tmp_path):
+    """Application on a SQLite file, shared by request and job threads"""
+    app = make_app(
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path / "jobs.db"}',
+        JOBS_MAX_CONCURRENT=1,
+        JOBS_STALE_AFTER=30
+    )
+    with app.app_context():
+        db.create_all()
+        yield app
+        app.extensions['job_runner'].shutdown()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(jobs_app):
+    return jobs_app.test_client()
+
+
+@pytest.fixture
+def runner(jobs_app):
+    return jobs_app.extensions['job_runner']
+
+
+def _wait(client, location, timeout=10):
+    """Poll a job until it has finished"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = json.loads(client.get(location).data)['job']
+        if job['status'] in ('succeeded', 'failed'):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f'{location} did not finish')
+
+
+def _seed(count, **fields):
+    db.session.add_all(Task(title=f'Task {i}', **fields) for i in range(count))
+    db.session.commit()
+    return [task.id for task in Task.query.order_by(Task.id)]
+
+
+class TestAsyncBulkEndpoints:
+    """Test async=true on the bulk endpoints and GET /api/jobs/<id>"""
+
+    def test_bulk_create(self, client, jobs_app):
+        """Valid tasks are inserted in batches; rejected ones are reported"""
+        jobs_app.config['BULK_BATCH_SIZE'] = 2
+        response = client.post('/api/tasks/bulk?async=true&atomic=false', json={'tasks': [
+            {'title': 'One'}, {'title': ''}, {'title': 'Two', 'completed': True}, {'title': 'Three'},
+        ]})
+        assert response.status_code == 202
+        assert response.headers['Location'] == f"/api/jobs/{json.loads(response.data)['job']['id']}"
+
+        job = _wait(client, response.headers['Location'])
+        assert job['status'] == 'succeeded'
+        assert job['progress'] == {'done': 3, 'total': 3, 'percent': 100.0}
+        assert job['result']['created'] == 3 and job['result']['failed'] == 1
+        assert job['result']['ids'][1] is None
+        assert [Task.query.get(i).title for i in job['result']['ids'] if i] == ['One', 'Two', 'Three']
+        assert verify_counters(db.session) == {}
+
+    def test_bulk_update(self, client, jobs_app):
+        """Chunks are applied and counted as progress"""
+        jobs_app.config['BULK_UPDATE_CHUNK_SIZE'] = 2
+        task_ids = _seed(5)
+        response = client.put('/api/tasks/bulk?async=true', json={
+            'task_ids': task_ids + [9999], 'updates': {'completed': True}
+        })
+        assert response.status_code == 202
+
+        job = _wait(client, response.headers['Location'])
+        assert job['result'] == {'updated': 5, 'version_conflicts': []}
+        assert job['progress']['done'] == 6
+        assert job['items_per_second'] is not None
+        assert Task.query.filter_by(completed=True).count() == 5
+
+    def test_filter_delete(self, client):
+        """Filter mutations count their total before starting"""
+        _seed(3, priority='Low')
+        _seed(2, priority='High')
+        response = client.post('/api/tasks/bulk/delete?priority=Low&async=true')
+
+        job = _wait(client, response.headers['Location'])
+        assert job['result'] == {'action': 'delete', 'affected': 3}
+        assert job['progress']['total'] == 3
+        assert Task.query.count() == 2
+
+    def test_validation_is_synchronous(self, client):
+        """Invalid requests are rejected before a job is queued"""
+        response = client.put('/api/tasks/bulk?async=true', json={
+            'task_ids': [1], 'updates': {'priority': 'Urgent'}
+        })
+        assert response.status_code == 422
+        assert Job.query.count() == 0
+
+    def test_unknown_job(self, client):
+        """Unknown job ids are 404"""
+        response = client.get('/api/jobs/missing')
+        assert response.status_code == 404
+        assert json.loads(response.data)['error']['code'] == 'JOB_NOT_FOUND'
+
+
+class TestJobRunner:
+    """Test JobRunner scheduling, resume and failure handling"""
+
+    def test_resumes_from_checkpoint(self, jobs_app, runner, client):
+        """An abandoned job continues after its last committed step"""
+        jobs_app.config['BULK_UPDATE_CHUNK_SIZE'] = 2
+        task_ids = _seed(4)
+        db.session.add(Job(
+            id='abandoned', kind='bulk_update', status='running',
+            params={'task_ids': task_ids, 'updates': {'title': 'Renamed'}},
+            checkpoint={'position': 2, 'updated': 2}, progress_done=2, progress_total=4,
+            started_at=datetime.utcnow() - timedelta(minutes=5),
+            heartbeat_at=datetime.utcnow() - timedelta(minutes=5)
+        ))
+        db.session.commit()
+
+        assert runner.resume(db.session) == ['abandoned']
+        job = _wait(client, '/api/jobs/abandoned')
+        assert job['result'] == {'updated': 4, 'version_conflicts': []}
+        assert job['progress']['done'] == 4
+        titles = [Task.query.get(task_id).title for task_id in task_ids]
+        assert titles == ['Task 0', 'Task 1', 'Renamed', 'Renamed']
+
+    def test_live_jobs_not_resumed(self, runner):
+        """Running jobs with a recent heartbeat belong to another worker"""
+        db.session.add(Job(id='live', kind='bulk_update', status='running', params={},
+                           heartbeat_at=datetime.utcnow()))
+        db.session.commit()
+        assert runner.resume(db.session) == []
+
+    def test_concurrency_cap(self, runner, client, monkeypatch):
+        """Jobs beyond JOBS_MAX_CONCURRENT wait in the queue"""
+        release = threading.Event()
+        monkeypatch.setitem(JOB_HANDLERS, 'test_blocking', lambda context: release.wait(5) and {})
+
+        first = runner.enqueue(db.session, 'test_blocking', {}).id
+        second = runner.enqueue(db.session, 'test_blocking', {}).id
+        time.sleep(0.2)
+        statuses = [json.loads(client.get(f'/api/jobs/{job_id}').data)['job']['status']
+                    for job_id in (first, second)]
+        assert statuses == ['running', 'queued']
+
+        release.set()
+        assert _wait(client, f'/api/jobs/{second}')['status'] == 'succeeded'
+
+    def test_failure_recorded(self, runner, client, monkeypatch):
+        """A handler exception fails the job with its message"""
+        def failing(context):
+            raise ValueError('boom')
+        monkeypatch.setitem(JOB_HANDLERS, 'test_failing', failing)
+
+        job_id = runner.enqueue(db.session, 'test_failing', {}).id
+        job = _wait(client, f'/api/jobs/{job_id}')
+        assert job['status'] == 'failed' and job['error'] == 'boom'
@@ -0,0 +1,106 @@
+"""
+Tests for keyset (cursor) pagination on GET /api/tasks
+"""
+
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from app import db
+from app.models import Task
+
+
+@pytest.fixture
+def many_tasks(app):
+    """Insert tasks with duplicate sort keys to exercise the id tiebreaker"""
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    priorities = ['High', 'Medium', 'Low']
+    for i in range(23):
+        db.session.add(Task(
+            title=f'Task {i % 5}',
+            priority=priorities[i % 3],
+            completed=i % 4 == 0,
+            created_at=base + timedelta(minutes=i // 3),
+            updated_at=base + timedelta(minutes=i // 2)
+        ))
+    db.session.commit()
+    return 23
+
+
+def _walk(client, params):
+    """Follow next_cursor until exhausted and return the ids seen"""
+    seen = []
+    cursor = ''
+    while True:
+        response = client.get('/api/tasks', query_string={**params, 'cursor': cursor})
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        seen.extend(task['id'] for task in data['tasks'])
+        assert data['pagination']['mode'] == 'cursor'
+        if not data['pagination']['has_next']:
+            assert data['pagination']['next_cursor'] is None
+            return seen
+        cursor = data['pagination']['next_cursor']
+
+
+class TestCursorPagination:
+    """Test cursor pagination mode"""
+
+    @pytest.mark.parametrize('sort', ['created_at', 'updated_at', 'title', 'priority'])
+    @pytest.mark.parametrize('order', ['asc', 'desc'])
+    def test_walk_matches_full_ordering(self, client, many_tasks, sort, order):
+        """Walking every cursor page yields each task exactly once, in order"""
+        ids = _walk(client, {'sort': sort, 'order': order, 'per_page': 4})
+
+        key = lambda task: (getattr(task, sort), task.id)
+        expected = sorted(Task.query.all(), key=key, reverse=(order == 'desc'))
+        assert ids == [task.id for task in expected]
+
+    def test_walk_with_filters(self, client, many_tasks):
+        """Filters apply to every cursor page"""
+        ids = _walk(client, {'priority': 'High', 'completed': 'false', 'per_page': 2})
+
+        expected = Task.query.filter_by(priority='High', completed=False).count()
+        assert len(ids) == len(set(ids)) == expected
+
+    def test_offset_mode_unchanged(self, client, many_tasks):
+        """Requests without cursor keep the page/per_page contract"""
+        response = client.get('/api/tasks?page=2&per_page=10')
+        data = json.loads(response.data)
+
+        assert data['pagination']['total'] == many_tasks
+        assert data['pagination']['page'] == 2
+        assert 'next_cursor' not in data['pagination']
+
+    def test_cursor_for_other_sort_rejected(self, client, many_tasks):
+        """A cursor issued for one sort cannot be replayed against another"""
+        response = client.get('/api/tasks?cursor=&sort=title&per_page=2')
+        cursor = json.loads(response.data)['pagination']['next_cursor']
+
+        response = client.get(f'/api/tasks?cursor={cursor}&sort=created_at&per_page=2')
+        assert response.status_code == 400
+        assert json.loads(response.data)['error']['code'] == 'INVALID_CURSOR'
+
+    def test_malformed_cursor_rejected(self, client):
+        """Garbage cursors return 400 instead of 500"""
+        response = client.get('/api/tasks?cursor=not-a-cursor')
+        assert response.status_code == 400
+        assert json.loads(response.data)['error']['code'] == 'INVALID_CURSOR'
+
+    @pytest.mark.parametrize('sort, value, last_id', [
+        ('title', [1, 2], 1),
+        ('title', {'a': 1}, 1),
+        ('title', True, 1),
+        ('title', 'Task 1', '1'),
+        ('title', 'Task 1', 1.5),
+        ('created_at', 5, 1),
+        ('created_at', 'yesterday', 1),
+    ])
+    def test_mistyped_cursor_rejected(self, client, many_tasks, sort, value, last_id):
+        """Well-formed cursors holding values of the wrong type are 400s"""
+        payload = {'s': sort, 'o': 'desc', 'v': value, 'id': last_id}
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        response = client.get('/api/tasks', query_string={'cursor': cursor, 'sort': sort})
+        assert response.status_code == 400
+        assert json.loads(response.data)['error']['code'] == 'INVALID_CURSOR'
@@ -0,0 +1,97 @@
+"""
+Tests for single-statement partial updates (PATCH /api/tasks/<id>)
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from app import db
+from app.models import Task
+from app.stats import verify_counters
+
+
+@pytest.fixture
+def tasks(app):
+    """A pending task and one completed at a known time"""
+    pending = Task(title='Pending')
+    done = Task(title='Done', completed=True, completed_at=datetime(2026, 1, 1))
+    db.session.add_all([pending, done])
+    db.session.commit()
+    return pending.id, done.id
+
+
+def _patch(client, task_id, body, **kwargs):
+    return client.patch(f'/api/tasks/{task_id}', json=body, **kwargs)
+
+
+class TestPatchTask:
+    """Test PATCH /api/tasks/<id>"""
+
+    def test_single_statement(self, client, tasks, statements):
+        """The task is updated and returned by one UPDATE ... RETURNING"""
+        pending_id, _ = tasks
+        response = _patch(client, pending_id, {'completed': True})
+        assert response.status_code == 200
+
+        updates = [s for s in statements if s.startswith('UPDATE tasks ')]
+        assert len(updates) == 1 and 'RETURNING' in updates[0]
+        assert not [s for s in statements if 'FROM tasks' in s]
+
+    def test_matches_put(self, client, tasks):
+        """Responses and ETags are the ones PUT and GET produce"""
+        pending_id, _ = tasks
+        response = _patch(client, pending_id, {'title': ' Renamed ', 'priority': 'Low'})
+        task = json.loads(response.data)['task']
+        assert task == Task.query.get(pending_id).to_dict()
+        assert task['title'] == 'Renamed' and task['description'] is None
+
+        assert response.headers['ETag'] == client.get(f'/api/tasks/{pending_id}').headers['ETag']
+
+    def test_completed_at_transitions(self, client, tasks):
+        """Completing stamps completed_at once; reopening clears it"""
+        pending_id, done_id = tasks
+        completed = json.loads(_patch(client, pending_id, {'completed': True}).data)['task']
+        assert completed['completed_at'] is not None
+
+        again = json.loads(_patch(client, done_id, {'completed': True}).data)['task']
+        assert again['completed_at'] == '2026-01-01T00:00:00'
+
+        reopened = json.loads(_patch(client, done_id, {'completed': False}).data)['task']
+        assert reopened['completed'] is False and reopened['completed_at'] is None
+        assert verify_counters(db.session) == {}
+
+    def test_not_found(self, client, tasks):
+        """A missing task is a 404"""
+        response = _patch(client, 9999, {'completed': True})
+        assert response.status_code == 404
+        assert json.loads(response.data)['error']['code'] == 'TASK_NOT_FOUND'
+
+    @pytest.mark.parametrize('body, status_code', [
+        (None, 400),
+        ({'priority': 'Urgent'}, 422),
+        ({'title': '   '}, 422),
+    ])
+    def test_invalid(self, client, tasks, body, status_code):
+        """Bodies are validated like PUT"""
+        assert _patch(client, tasks[0], body).status_code == status_code
+
+    @pytest.mark.parametrize('method', ['put', 'patch'])
+    @pytest.mark.parametrize('body', [[1], 'done', 5])
+    def test_non_object_body(self, client, tasks, method, body):
+        """PUT and PATCH reject JSON bodies that are not objects"""
+        response = getattr(client, method)(f'/api/tasks/{tasks[0]}', json=body)
+        assert response.status_code == 400
+        assert json.loads(response.data)['error']['code'] == 'INVALID_JSON'
+
+    def test_if_match(self, client, tasks):
+        """A stale If-Match is rejected with the current ETag"""
+        pending_id, _ = tasks
+        etag = client.get(f'/api/tasks/{pending_id}').headers['ETag']
+        fresh = _patch(client, pending_id, {'priority': 'Low'}, headers={'If-Match': etag})
+        assert fresh.status_code == 200
+
+        stale = _patch(client, pending_id, {'priority': 'High'}, headers={'If-Match': etag})
+        assert stale.status_code == 412
+        assert stale.headers['ETag'] == fresh.headers['ETag']
+        assert Task.query.get(pending_id).priority == 'Low'
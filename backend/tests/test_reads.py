@@ -0,0 +1,78 @@
+"""
+Tests for the ORM-bypass read path of the list and detail endpoints
+"""
+
+import json
+
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import Task
+from app.reads import fetch_task, select_tasks, task_row_dict
+
+
+@pytest.fixture
+def tasks(app):
+    """A handful of tasks"""
+    for i in range(5):
+        db.session.add(Task(title=f'Task {i}', description=f'About {i}', completed=i == 0))
+    db.session.commit()
+    return Task.query.order_by(Task.id).all()
+
+
+@pytest.fixture
+def entity_loads(app):
+    """Count Task entities hydrated by the ORM"""
+    loads = []
+
+    def record(target, context):
+        loads.append(target.id)
+
+    event.listen(Task, 'load', record)
+    yield loads
+    event.remove(Task, 'load', record)
+
+
+class TestRowViews:
+    """Test the read helpers"""
+
+    def test_row_dict_matches_to_dict(self, tasks):
+        """Row views serialize exactly like entities"""
+        rows = db.session.execute(select_tasks().order_by(Task.id)).all()
+        assert [task_row_dict(row) for row in rows] == [task.to_dict() for task in tasks]
+
+        row = fetch_task(db.session, tasks[0].id, ['title', 'completed_at'])
+        assert task_row_dict(row, ['title', 'completed_at']) == \
+            tasks[0].to_dict(['title', 'completed_at'])
+
+    def test_sparse_select(self, tasks):
+        """Only the requested columns, the id and extras are selected"""
+        statement = str(select_tasks(['title'], extra=('created_at',)))
+        assert 'tasks.id' in statement and 'tasks.created_at' in statement
+        assert 'tasks.description' not in statement
+
+    def test_missing_task(self, app):
+        """Fetching an unknown id returns None"""
+        assert fetch_task(db.session, 12345) is None
+
+
+class TestEndpointsSkipHydration:
+    """Test that read endpoints never build Task entities"""
+
+    @pytest.mark.parametrize('url', [
+        '/api/tasks',
+        '/api/tasks?cursor=&per_page=2',
+        '/api/tasks?search=about&highlight=true',
+    ])
+    def test_listing(self, client, tasks, entity_loads, url):
+        """Listings are built from row views"""
+        response = client.get(url)
+        assert response.status_code == 200
+        assert json.loads(response.data)['tasks']
+        assert entity_loads == []
+
+    def test_detail(self, client, tasks, entity_loads):
+        """The detail endpoint is built from a row view"""
+        response = client.get(f'/api/tasks/{tasks[0].id}')
+        assert json.loads(response.data)['task'] == tasks[0].to_dict()
+        assert entity_loads == []
@@ -0,0 +1,159 @@
+"""
+Tests for read-replica routing with SQLite file copies as replicas
+"""
+
+import json
+import sqlite3
+import time
+import uuid
+
+import pytest
+from app import create_app, db
+from app.models import Job, Task
+from app.replicas import is_pinned
+
+
+@pytest.fixture
+def paths(tmp_path):
+    """Database files of the primary and two replicas"""
+    return [str(tmp_path / name) for name in ('primary.db', 'replica0.db', 'replica1.db')]
+
+
+def replicate(paths, replicas=(1, 2)):
+    """Copy the primary into replicas with the SQLite backup API"""
+    source = sqlite3.connect(paths[0])
+    for index in replicas:
+        target = sqlite3.connect(paths[index])
+        source.backup(target)
+        target.close()
+    source.close()
+
+
+def replica_settings(paths):
+    """Settings for a primary at paths[0] replicated to the other paths"""
+    return {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{paths[0]}',
+        'SQLALCHEMY_REPLICA_URIS': [f'sqlite:///{path}' for path in paths[1:]],
+        'REPLICA_LAG_CHECK_INTERVAL': 0,
+    }
+
+
+@pytest.fixture
+def app(make_app, paths):
+    """Application with one task, replicated to both replicas"""
+    app = make_app(**replica_settings(paths))
+    with app.app_context():
+        db.create_all()
+        db.session.add(Task(title='Replicated'))
+        db.session.commit()
+        replicate(paths)
+        yield app
+        db.session.remove()
+
+
+def add_task(title):
+    """Write a task to the primary only"""
+    task = Task(title=title)
+    db.session.add(task)
+    db.session.commit()
+    return task.id
+
+
+def titles(client):
+    return [task['title'] for task in json.loads(client.get('/api/tasks').data)['tasks']]
+
+
+class TestReadRouting:
+    """Test which database requests read from"""
+
+    def test_reads_use_replicas(self, app, paths):
+        """GET requests read replicas until they catch up"""
+        add_task('Primary only')
+        assert titles(app.test_client()) == ['Replicated']
+
+        replicate(paths)
+        assert sorted(titles(app.test_client())) == ['Primary only', 'Replicated']
+
+    def test_round_robin(self, app, paths):
+        """Reads alternate between healthy replicas"""
+        add_task('Second')
+        replicate(paths, replicas=(1,))
+        client = app.test_client()
+        assert sorted(len(titles(client)) for _ in range(2)) == [1, 2]
+
+        stats = app.extensions['replica_router'].stats()
+        assert [replica['reads'] for replica in stats['replicas']] == [1, 1]
+
+    def test_read_your_writes(self, app):
+        """A client that wrote reads the primary; others still see replicas"""
+        writer, other = app.test_client(), app.test_client()
+        response = writer.post('/api/tasks', json={'title': 'Mine'})
+        task_id = json.loads(response.data)['task']['id']
+        assert 'primary_pin' in response.headers['Set-Cookie']
+
+        assert writer.get(f'/api/tasks/{task_id}').status_code == 200
+        assert other.get(f'/api/tasks/{task_id}').status_code == 404
+        assert app.extensions['replica_router'].stats()['pinned_reads'] == 1
+
+    def test_pin_window(self):
+        """Expired pins, and pins beyond the window, are ignored"""
+        now = 1000.0
+        assert is_pinned('1004.5', 5, now)
+        assert not is_pinned('999', 5, now)
+        assert not is_pinned('2000', 5, now)
+        assert not is_pinned('forever', 5, now)
+        assert not is_pinned(None, 5, now)
+
+    def test_lagging_replicas_skipped(self, app):
+        """Reads fall back to the primary when every replica lags too far"""
+        add_task('Fresh')
+        app.extensions['replica_router'].max_lag = 0
+        assert sorted(titles(app.test_client())) == ['Fresh', 'Replicated']
+        assert app.extensions['replica_router'].stats()['primary_reads'] == 1
+
+    def test_jobs_read_primary(self, app):
+        """Job progress is always read from the primary"""
+        job = Job(id=uuid.uuid4().hex, kind='bulk_create', status='queued', params={})
+        db.session.add(job)
+        db.session.commit()
+        assert app.test_client().get(f'/api/jobs/{job.id}').status_code == 200
+
+    def test_unreachable_replica(self, make_app, paths, tmp_path):
+        """A replica that cannot be opened is skipped"""
+        paths[2] = str(tmp_path / 'missing' / 'replica.db')
+        app = make_app(**replica_settings(paths))
+        with app.app_context():
+            db.create_all()
+            add_task('Only')
+            replicate(paths, replicas=(1,))
+            assert titles(app.test_client()) == ['Only']
+
+            stats = app.extensions['replica_router'].stats()['replicas']
+            assert [replica['healthy'] for replica in stats] == [True, False]
+            db.session.remove()
+
+
+class TestReplicaStats:
+    """Test GET /api/replicas/stats"""
+
+    def test_lag(self, app, paths):
+        """Lag is reported in write generations and seconds"""
+        client = app.test_client()
+        replicas = json.loads(client.get('/api/replicas/stats').data)['replication']['replicas']
+        assert [(r['generations_behind'], r['lag_seconds']) for r in replicas] == [(0, 0), (0, 0)]
+
+        add_task('Behind')
+        time.sleep(0.01)
+        add_task('Further behind')
+        replicas = json.loads(client.get('/api/replicas/stats').data)['replication']['replicas']
+        assert [r['generations_behind'] for r in replicas] == [2, 2]
+        assert all(r['lag_seconds'] > 0 for r in replicas)
+
+        replicate(paths)
+        replicas = json.loads(client.get('/api/replicas/stats').data)['replication']['replicas']
+        assert [r['generations_behind'] for r in replicas] == [0, 0]
+
+    def test_disabled(self):
+        """Without replicas the endpoint says so"""
+        response = create_app('testing').test_client().get('/api/replicas/stats')
+        assert json.loads(response.data)['replication'] == {'enabled': False, 'replicas': []}
@@ -0,0 +1,147 @@
+"""
+Tests for full-text search on GET /api/tasks
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import flask_migrate
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import Task
+
+
+@pytest.fixture
+def searchable_tasks(app):
+    """Tasks with overlapping words in titles and descriptions"""
+    tasks = [
+        ('Buy groceries', 'Milk, eggs and bread'),
+        ('Write quarterly report', 'Include the groceries budget'),
+        ('Groceries for the party', 'Chips and groceries for guests'),
+        ('Café meeting', 'Discuss the résumé'),
+        ('Plan vacation', None),
+    ]
+    for title, description in tasks:
+        db.session.add(Task(title=title, description=description))
+    db.session.commit()
+
+
+def _titles(client, query):
+    """Return the titles of tasks returned for a query string"""
+    response = client.get(f'/api/tasks?{query}')
+    assert response.status_code == 200
+    return [task['title'] for task in json.loads(response.data)['tasks']]
+
+
+class TestFullTextSearch:
+    """Test search backed by the full-text index"""
+
+    def test_prefix_match(self, client, searchable_tasks):
+        """Partially typed words match"""
+        titles = _titles(client, 'search=groc')
+        assert sorted(titles) == [
+            'Buy groceries', 'Groceries for the party', 'Write quarterly report'
+        ]
+
+    def test_all_terms_required(self, client, searchable_tasks):
+        """Every term must match somewhere in the task"""
+        assert _titles(client, 'search=groc milk') == ['Buy groceries']
+
+    def test_diacritics_ignored(self, client, searchable_tasks):
+        """Accented and unaccented spellings match each other"""
+        assert _titles(client, 'search=resume') == ['Café meeting']
+        assert _titles(client, 'search=café') == ['Café meeting']
+
+    def test_relevance_sort(self, client, searchable_tasks):
+        """Title matches rank above description-only matches"""
+        titles = _titles(client, 'search=groceries&sort=relevance')
+        assert sorted(titles[:2]) == ['Buy groceries', 'Groceries for the party']
+        assert titles[2] == 'Write quarterly report'
+
+    def test_relevance_requires_search(self, client):
+        """Relevance sort without a search query is rejected"""
+        response = client.get('/api/tasks?sort=relevance')
+        assert response.status_code == 400
+        assert json.loads(response.data)['error']['code'] == 'INVALID_SORT_FIELD'
+
+    def test_highlight(self, client, searchable_tasks):
+        """highlight=true adds marked-up title and description snippets"""
+        response = client.get('/api/tasks?search=milk&highlight=true')
+        task = json.loads(response.data)['tasks'][0]
+
+        assert task['highlight']['title'] == 'Buy groceries'
+        assert '<mark>Milk</mark>' in task['highlight']['description']
+
+    def test_highlight_escapes_task_text(self, client):
+        """Markup in task text is escaped; only the markers are HTML"""
+        client.post('/api/tasks', json={
+            'title': '<script>alert(1)</script> milk',
+            'description': 'Buy <b>milk</b> & "eggs"'
+        })
+        response = client.get('/api/tasks?search=milk&highlight=true')
+        highlight = json.loads(response.data)['tasks'][0]['highlight']
+
+        assert highlight['title'] == (
+            '&lt;script&gt;alert(1)&lt;/script&gt; <mark>milk</mark>'
+        )
+        assert highlight['description'] == (
+            'Buy &lt;b&gt;<mark>milk</mark>&lt;/b&gt; &amp; &quot;eggs&quot;'
+        )
+
+    def test_index_follows_writes(self, client, searchable_tasks):
+        """Updates and deletes are reflected through the sync triggers"""
+        task = Task.query.filter_by(title='Plan vacation').first()
+        client.put(f'/api/tasks/{task.id}',
+                   data=json.dumps({'title': 'Plan holiday'}),
+                   content_type='application/json')
+        assert _titles(client, 'search=vacation') == []
+        assert _titles(client, 'search=holiday') == ['Plan holiday']
+
+        client.delete(f'/api/tasks/{task.id}')
+        assert _titles(client, 'search=holiday') == []
+
+    def test_punctuation_only_query(self, client, searchable_tasks):
+        """Queries without word characters fall back to a substring match"""
+        assert _titles(client, 'search=%22') == []
+
+    def test_search_uses_full_text_index(self, app, client, searchable_tasks):
+        """The search query reads the FTS index instead of scanning tasks"""
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if 'MATCH' in statement and 'count' not in statement:
+                statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            client.get('/api/tasks?search=groc')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+        statement, parameters = statements[0]
+        raw = db.engine.raw_connection()
+        try:
+            plan = [row[-1] for row in raw.cursor().execute(
+                f'EXPLAIN QUERY PLAN {statement}', parameters
+            )]
+        finally:
+            raw.close()
+
+        assert any('VIRTUAL TABLE INDEX' in step for step in plan), plan
+        assert 'SCAN tasks' not in plan, plan
+
+
+def test_autogenerate_keeps_search_index(app, tmp_path):
+    """Autogenerated migrations leave the FTS5 table and its shadow tables alone"""
+    directory = tmp_path / 'migrations'
+    shutil.copytree(
+        Path(__file__).parents[1] / 'migrations', directory,
+        ignore=shutil.ignore_patterns('__pycache__')
+    )
+    flask_migrate.stamp(directory=str(directory))
+    revisions = sorted((directory / 'versions').glob('*.py'))
+
+    flask_migrate.migrate(directory=str(directory), message='no changes')
+    assert sorted((directory / 'versions').glob('*.py')) == revisions
@@ -0,0 +1,181 @@
+"""
+Parity tests for the fast JSON provider and the bulk task serializer
+
+Every fast path must produce exactly the bytes of to_dict + jsonify with
+Flask's DefaultJSONProvider.
+"""
+
+import json
+import uuid
+from datetime import datetime, date
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+from app import db
+from app import serialization
+from app.models import Task
+from app.serialization import FastJSONProvider, RawJSON, encode_object, serialize_tasks
+
+
+TITLES = [
+    'Plain title',
+    'Ünïcödé tïtle – with dash',
+    'Emoji 🚀 and CJK 漢字',
+    'Quotes "double" and \\backslash\\',
+    'Control \x00\x1f\t\n\r\b\f chars',
+    'Slash / and <html> & ampersand',
+    '%s %d format-like',
+]
+
+
+@pytest.fixture
+def parity_tasks(app):
+    """Tasks covering escaping, None values and timestamp precision"""
+    for i, title in enumerate(TITLES):
+        task = Task(
+            title=title,
+            description=None if i % 2 else f'Description {title}',
+            priority=['High', 'Medium', 'Low'][i % 3],
+            completed=i % 2 == 0
+        )
+        if task.completed:
+            task.completed_at = datetime(2026, 1, 2, 3, 4, 5, 0 if i % 4 else 123456)
+        db.session.add(task)
+    db.session.commit()
+    return Task.query.order_by(Task.id).all()
+
+
+@pytest.fixture
+def default_provider(app):
+    """Flask's stock provider for the same application"""
+    return DefaultJSONProvider(app)
+
+
+def _jsonify_bytes(provider, obj):
+    """Bytes of provider.response(obj) (what jsonify returns)"""
+    return provider.response(obj).get_data()
+
+
+class TestFastJSONProvider:
+    """Test FastJSONProvider against DefaultJSONProvider"""
+
+    @pytest.mark.parametrize('obj', [
+        {'b': 1, 'a': [1, 2, {'z': None, 'y': True}], 'c': 'text'},
+        [{'title': title} for title in TITLES],
+        {'stats': {'completion_rate': 33.33, 'total': 0, 'ratio': 100.0}},
+        {'when': datetime(2026, 1, 2, 3, 4, 5), 'day': date(2026, 1, 2)},
+        {'id': uuid.UUID('12345678-1234-5678-1234-567812345678')},
+        {1: 'int key', 2: 'sorted'},
+        {'big': 2 ** 70},
+        [],
+        None,
+    ])
+    def test_response_bytes(self, app, default_provider, obj):
+        """Responses are byte-identical to the default provider's"""
+        fast = FastJSONProvider(app)
+        assert _jsonify_bytes(fast, obj) == _jsonify_bytes(default_provider, obj)
+
+    def test_response_bytes_without_orjson(self, app, default_provider, monkeypatch):
+        """The fallback is the standard library itself"""
+        monkeypatch.setattr(serialization, 'orjson', None)
+        obj = [{'title': title} for title in TITLES]
+        assert _jsonify_bytes(FastJSONProvider(app), obj) == _jsonify_bytes(default_provider, obj)
+
+    def test_debug_mode_indents(self, app, default_provider):
+        """Debug responses keep the stdlib's indented form"""
+        app.debug = True
+        obj = {'tasks': [{'title': 'A'}]}
+        assert _jsonify_bytes(FastJSONProvider(app), obj) == _jsonify_bytes(default_provider, obj)
+
+    def test_loads(self, app):
+        """Request bodies decode the same way"""
+        fast = FastJSONProvider(app)
+        body = json.dumps({'title': 'Ünïcödé', 'completed': False, 'n': 1.5})
+        assert fast.loads(body) == json.loads(body)
+        assert fast.loads(body.encode('utf-8')) == json.loads(body)
+
+        with pytest.raises(ValueError):
+            fast.loads('{not json')
+
+    def test_installed_on_app(self, app):
+        """The factory installs the fast provider"""
+        assert isinstance(app.json, FastJSONProvider)
+
+
+class TestSerializeTasks:
+    """Test serialize_tasks against to_dict + jsonify"""
+
+    @pytest.mark.parametrize('fields', [
+        None,
+        ['id', 'title'],
+        ['completed_at', 'completed', 'description'],
+        ['created_at'],
+    ])
+    def test_matches_to_dict(self, default_provider, parity_tasks, fields):
+        """The array equals the compact, sorted encoding of to_dict output"""
+        expected = default_provider.dumps(
+            [task.to_dict(fields) for task in parity_tasks], separators=(',', ':')
+        ).encode('utf-8')
+        assert serialize_tasks(parity_tasks, fields) == expected
+
+    def test_stdlib_fallback(self, monkeypatch, default_provider, parity_tasks):
+        """Without orjson the same bytes come from the standard library"""
+        monkeypatch.setattr(serialization, 'orjson', None)
+        expected = default_provider.dumps(
+            [task.to_dict() for task in parity_tasks], separators=(',', ':')
+        ).encode('utf-8')
+        assert serialize_tasks(parity_tasks) == expected
+
+    def test_expired_attributes_are_loaded(self, default_provider, parity_tasks):
+        """Tasks expired by a commit are refreshed rather than skipped"""
+        db.session.commit()
+        assert serialize_tasks(parity_tasks[:1]) == default_provider.dumps(
+            [parity_tasks[0].to_dict()], separators=(',', ':')
+        ).encode('utf-8')
+
+    def test_core_rows(self, default_provider, parity_tasks):
+        """Core rows with field-named columns serialize like ORM objects"""
+        rows = db.session.execute(
+            db.select(*[getattr(Task, name) for name in Task.FIELDS]).order_by(Task.id)
+        ).all()
+        assert serialize_tasks(rows) == serialize_tasks(parity_tasks)
+
+    def test_empty(self):
+        """No rows encode as an empty array"""
+        assert serialize_tasks([]) == b'[]'
+
+    def test_encode_object(self, app, default_provider, parity_tasks):
+        """Embedded fragments produce the same document as jsonify"""
+        pagination = {'total': len(parity_tasks), 'has_next': False, 'next_cursor': None}
+        body = encode_object(app.json, {
+            'tasks': serialize_tasks(parity_tasks),
+            'pagination': pagination
+        })
+        expected = _jsonify_bytes(default_provider, {
+            'tasks': [task.to_dict() for task in parity_tasks],
+            'pagination': pagination
+        })
+        assert body + b'\n' == expected
+        assert isinstance(serialize_tasks(parity_tasks), RawJSON)
+
+
+class TestListingParity:
+    """Test GET /api/tasks against the original serialization"""
+
+    @pytest.mark.parametrize('query, fields', [
+        ('per_page=100', None),
+        ('per_page=3&page=2&fields=id,title,completed_at', ['id', 'title', 'completed_at']),
+        ('cursor=&per_page=4&sort=title&order=asc', None),
+    ])
+    def test_listing_bytes(self, client, default_provider, parity_tasks, query, fields):
+        """The fast listing body equals to_dict + jsonify of the same page"""
+        response = client.get(f'/api/tasks?{query}')
+        data = json.loads(response.data)
+        tasks = [db.session.get(Task, task['id']) for task in data['tasks']]
+        assert tasks
+
+        expected = _jsonify_bytes(default_provider, {
+            'tasks': [task.to_dict(fields) for task in tasks],
+            'pagination': data['pagination']
+        })
+        assert response.data == expected
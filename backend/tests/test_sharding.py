@@ -0,0 +1,177 @@
+"""
+Tests for horizontal sharding of tasks over SQLite files
+"""
+
+import json
+from collections import namedtuple
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app import db
+from app.models import Task
+from app.sharding import SHARD_ID_BITS, merge_sorted, shard_of
+from app.stats import verify_counters
+
+SHARDS = 3
+
+
+@pytest.fixture
+def app(make_app, tmp_path):
+    """Application with tasks sharded over three SQLite files"""
+    app = make_app(
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path / "primary.db"}',
+        SQLALCHEMY_SHARD_URIS=[
+            f'sqlite:///{tmp_path / f"shard{i}.db"}' for i in range(SHARDS)
+        ]
+    )
+    with app.app_context():
+        db.create_all()
+        app.extensions['task_shards'].create_all(db.metadata)
+        yield app
+        db.session.remove()
+
+
+def _create(client, title, **fields):
+    response = client.post('/api/tasks', json=dict(fields, title=title))
+    assert response.status_code == 201
+    return json.loads(response.data)['task']
+
+
+def _shard_titles(app, shard):
+    with Session(app.extensions['task_shards'].engines[shard]) as session:
+        return session.execute(select(Task.title).order_by(Task.id)).scalars().all()
+
+
+class TestShardedTasks:
+    """Test placement and single-task routes"""
+
+    def test_placement(self, client, app):
+        """New tasks go round robin; ids carry their shard and never collide"""
+        tasks = [_create(client, f'Task {i}') for i in range(6)]
+        assert [shard_of(task['id']) for task in tasks] == [0, 1, 2, 0, 1, 2]
+        assert [task['id'] & ((1 << SHARD_ID_BITS) - 1) for task in tasks] == [1, 1, 1, 2, 2, 2]
+        assert _shard_titles(app, 1) == ['Task 1', 'Task 4']
+
+        with Session(db.engine) as session:
+            assert session.query(Task).count() == 0
+
+    def test_single_task_routes(self, client, app):
+        """GET, PUT, PATCH and DELETE go to the task's shard"""
+        task = [_create(client, f'Task {i}') for i in range(3)][2]
+        url = f"/api/tasks/{task['id']}"
+        assert json.loads(client.get(url).data)['task']['title'] == 'Task 2'
+
+        assert client.put(url, json={'title': 'Renamed', 'version': 1}).status_code == 200
+        patched = json.loads(client.patch(url, json={'completed': True}).data)['task']
+        assert patched['version'] == 3 and patched['completed']
+        assert _shard_titles(app, 2) == ['Renamed']
+        with Session(app.extensions['task_shards'].engines[2]) as session:
+            assert verify_counters(session) == {}
+
+        assert client.delete(url).status_code == 204
+        assert client.get(url).status_code == 404
+
+    @pytest.mark.parametrize('task_id', [1 << SHARD_ID_BITS | 99, SHARDS << SHARD_ID_BITS | 1])
+    def test_missing(self, client, task_id):
+        """Unknown ids, and ids of shards that do not exist, are 404s"""
+        _create(client, 'Task')
+        assert client.get(f'/api/tasks/{task_id}').status_code == 404
+
+    def test_idempotent_create(self, client):
+        """Idempotency keys stay on the primary, so a retry is replayed"""
+        headers = {'Idempotency-Key': 'once'}
+        first = client.post('/api/tasks', json={'title': 'Once'}, headers=headers)
+        retry = client.post('/api/tasks', json={'title': 'Once'}, headers=headers)
+        assert retry.data == first.data
+        assert retry.headers['Idempotent-Replayed'] == 'true'
+
+    def test_unsupported_endpoint(self, client):
+        """Endpoints needing one tasks table are rejected"""
+        response = client.post('/api/tasks/bulk', json={'tasks': [{'title': 'A'}]})
+        assert response.status_code == 501
+        assert json.loads(response.data)['error']['code'] == 'NOT_SUPPORTED_WITH_SHARDING'
+
+
+class TestFanOut:
+    """Test merged listings and summed stats"""
+
+    @pytest.fixture
+    def titles(self, client):
+        titles = ['delta', 'alpha', 'foxtrot', 'charlie', 'echo', 'bravo', 'golf']
+        for i, title in enumerate(titles):
+            _create(client, title, priority=['High', 'Low'][i % 2])
+        return sorted(titles)
+
+    def test_sorted_page(self, client, titles):
+        """One page holds the first rows across every shard"""
+        body = json.loads(client.get('/api/tasks?sort=title&order=asc&per_page=3').data)
+        assert [task['title'] for task in body['tasks']] == titles[:3]
+        assert body['pagination']['total'] == 7
+        assert body['pagination']['pages'] == 3
+
+    @pytest.mark.parametrize('order', ['asc', 'desc'])
+    def test_page_by_page(self, client, titles, order):
+        """Offset pages and cursor pages both walk every task in order"""
+        expected = titles if order == 'asc' else titles[::-1]
+        by_offset = []
+        for page in range(1, 4):
+            body = json.loads(client.get(
+                f'/api/tasks?sort=title&order={order}&per_page=3&page={page}'
+            ).data)
+            by_offset += [task['title'] for task in body['tasks']]
+        assert by_offset == expected
+
+        by_cursor, cursor = [], ''
+        while cursor is not None:
+            body = json.loads(client.get(
+                f'/api/tasks?sort=title&order={order}&per_page=3&cursor={cursor}&fields=title'
+            ).data)
+            by_cursor += [task['title'] for task in body['tasks']]
+            cursor = body['pagination']['next_cursor']
+        assert by_cursor == expected
+
+    def test_filters(self, client, titles):
+        """Filters apply on every shard"""
+        body = json.loads(client.get('/api/tasks?priority=Low&sort=title&order=asc').data)
+        assert [task['title'] for task in body['tasks']] == ['alpha', 'bravo', 'charlie']
+        assert body['pagination']['total'] == 3
+
+    def test_stats(self, client, titles):
+        """Stats are summed over the shards"""
+        tasks = json.loads(client.get('/api/tasks').data)['tasks']
+        for task in tasks[:2]:
+            client.patch(f"/api/tasks/{task['id']}", json={'completed': True})
+
+        stats = json.loads(client.get('/api/tasks/stats').data)['stats']
+        assert stats['total_tasks'] == 7
+        assert stats['completed_tasks'] == 2
+        assert stats['priority_breakdown'] == {'high': 4, 'medium': 0, 'low': 3}
+
+    def test_etag_follows_every_shard(self, client, titles):
+        """A write to any shard changes the listing ETag"""
+        etag = client.get('/api/tasks/stats').headers['ETag']
+        assert client.get('/api/tasks/stats', headers={'If-None-Match': etag}).status_code == 304
+
+        _create(client, 'hotel')
+        assert client.get('/api/tasks/stats', headers={'If-None-Match': etag}).status_code == 200
+
+    def test_relevance_rejected(self, client):
+        """Relevance sort cannot be merged across shards"""
+        response = client.get('/api/tasks?search=alpha&sort=relevance')
+        assert response.status_code == 400
+
+
+def test_merge_sorted():
+    """The merge orders by (value, id) with NULLs first ascending"""
+    Row = namedtuple('Row', 'id title')
+    runs = [
+        [Row(3, None), Row(1, 'a'), Row(4, 'c')],
+        [Row(2, None), Row(5, 'a'), Row(6, 'b')],
+    ]
+    merged = merge_sorted(runs, 'title', 'asc')
+    assert [row.id for row in merged] == [2, 3, 1, 5, 6, 4]
+
+    descending = [run[::-1] for run in runs]
+    merged = merge_sorted(descending, 'title', 'desc')
+    assert [row.id for row in merged] == [4, 6, 5, 1, 3, 2]
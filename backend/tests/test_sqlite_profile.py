@@ -0,0 +1,74 @@
+"""
+Tests for the SQLite connection profile
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from app import db
+from app.sqlite_profile import check_profile, is_file_database, profile_pragmas
+from config import TestingConfig
+
+
+@pytest.fixture
+def file_app(make_app, tmp_path):
+    """Application on a SQLite file with the default profile"""
+    app = make_app(
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path / "profile.db"}',
+        SQLITE_POOL_SIZE=3
+    )
+    with app.app_context():
+        yield app
+
+
+def _pragma(connection, name):
+    return connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+
+
+class TestSqliteProfile:
+    """Test pragmas, pooling and the startup self-test"""
+
+    def test_every_connection(self, file_app):
+        """Each pooled connection gets the pragmas"""
+        with db.engine.connect() as first, db.engine.connect() as second:
+            for connection in (first, second):
+                assert _pragma(connection, 'journal_mode') == 'wal'
+                assert _pragma(connection, 'synchronous') == 1
+                assert _pragma(connection, 'temp_store') == 2
+                assert _pragma(connection, 'cache_size') == -32 * 1024
+                assert _pragma(connection, 'busy_timeout') == 5000
+
+    def test_pool(self, file_app):
+        """The pool is sized from config"""
+        assert db.engine.pool.size() == 3
+
+    def test_self_test_passes(self, file_app):
+        """The startup self-test found every pragma in effect"""
+        assert file_app.extensions['sqlite_profile'] == {None: {}}
+
+    def test_self_test_reports_mismatches(self, tmp_path):
+        """Pragmas that did not take effect are reported"""
+        engine = create_engine(f'sqlite:///{tmp_path / "plain.db"}')
+        mismatches = check_profile(engine, [('journal_mode', 'WAL'), ('temp_store', 'MEMORY')])
+        assert mismatches == {'journal_mode': ('WAL', 'delete'), 'temp_store': ('MEMORY', 0)}
+
+    def test_memory_database_untouched(self, app):
+        """In-memory databases keep their defaults and pool"""
+        assert app.extensions['sqlite_profile'] == {}
+        assert type(db.engine.pool).__name__ == 'StaticPool'
+
+    def test_unset_pragmas_skipped(self):
+        """A None setting leaves SQLite's default"""
+        settings = {key: getattr(TestingConfig, key) for key in dir(TestingConfig) if key.isupper()}
+        settings['SQLITE_MMAP_SIZE'] = None
+        assert 'mmap_size' not in dict(profile_pragmas(settings))
+
+    @pytest.mark.parametrize('url, expected', [
+        ('sqlite:///todo.db', True),
+        ('sqlite://', False),
+        ('sqlite:///:memory:', False),
+        ('sqlite:///file::memory:?uri=true', False),
+        ('postgresql://localhost/todo', False),
+    ])
+    def test_is_file_database(self, url, expected):
+        """Only SQLite database files get the profile"""
+        assert is_file_database(url) is expected
@@ -0,0 +1,138 @@
+"""
+Tests for the task statistics and the counters behind them
+"""
+
+import json
+
+import pytest
+from sqlalchemy import event, text, update
+from app import db
+from app.models import Task, TaskCounter
+from app.stats import (
+    build_task_stats, count_by_state, read_counters, rebuild_counters, verify_counters
+)
+
+
+@pytest.fixture
+def mixed_tasks(app):
+    """Tasks spread over every priority and completion state"""
+    layout = [
+        ('High', True), ('High', False), ('High', False),
+        ('Medium', True), ('Medium', True),
+        ('Low', False),
+    ]
+    for i, (priority, completed) in enumerate(layout):
+        db.session.add(Task(title=f'Task {i}', priority=priority, completed=completed))
+    db.session.commit()
+
+
+@pytest.fixture
+def task_queries(app):
+    """Capture statements that read the tasks table"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM tasks ' in statement or statement.rstrip().endswith('FROM tasks'):
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', capture)
+
+
+class TestTaskStats:
+    """Test GET /api/tasks/stats"""
+
+    def test_cross_tab(self, client, mixed_tasks):
+        """Totals and per-priority splits agree with the data"""
+        stats = json.loads(client.get('/api/tasks/stats').data)['stats']
+
+        assert stats['total_tasks'] == 6
+        assert stats['completed_tasks'] == 3
+        assert stats['pending_tasks'] == 3
+        assert stats['completion_rate'] == 50.0
+        assert stats['priority_breakdown'] == {'high': 3, 'medium': 2, 'low': 1}
+        assert stats['pending_by_priority'] == {'high': 2, 'medium': 0, 'low': 1}
+        assert stats['completed_by_priority'] == {'high': 1, 'medium': 2, 'low': 0}
+
+    def test_constant_time_read(self, client, mixed_tasks, task_queries):
+        """Stats come from task_counters, never from the tasks table"""
+        client.get('/api/tasks/stats')
+        assert task_queries == []
+
+    def test_empty(self, client):
+        """No tasks gives zeros rather than a division error"""
+        stats = json.loads(client.get('/api/tasks/stats').data)['stats']
+        assert stats['total_tasks'] == 0
+        assert stats['completion_rate'] == 0
+        assert stats['pending_by_priority'] == {'high': 0, 'medium': 0, 'low': 0}
+
+
+class TestBuildTaskStats:
+    """Test deriving stats from per-state counts"""
+
+    def test_unknown_states(self):
+        """Missing priorities and completion flags count toward totals only"""
+        stats = build_task_stats({
+            (None, 'High'): 2,
+            (False, None): 1,
+            (True, 'Urgent'): 1,
+        })
+        assert stats['total_tasks'] == 4
+        assert stats['completed_tasks'] == 1
+        assert stats['pending_tasks'] == 3
+        assert stats['priority_breakdown'] == {'high': 2, 'medium': 0, 'low': 0}
+        assert stats['pending_by_priority']['high'] == 2
+
+    def test_count_by_state(self, mixed_tasks):
+        """Counts are keyed by (completed, priority)"""
+        counts = count_by_state(db.session)
+        assert counts[(False, 'High')] == 2
+        assert counts[(True, 'Medium')] == 2
+        assert (True, 'Low') not in counts
+
+
+class TestTaskCounters:
+    """Test the trigger-maintained task_counters table"""
+
+    def test_follow_api_writes(self, client, mixed_tasks):
+        """Create, update, bulk update and delete keep the counters exact"""
+        client.post('/api/tasks', json={'title': 'New', 'priority': 'Low'})
+        task = Task.query.filter_by(title='Task 1').one()
+        client.put(f'/api/tasks/{task.id}', json={'completed': True, 'priority': 'Low'})
+        ids = [t.id for t in Task.query.filter_by(priority='Medium')]
+        client.put('/api/tasks/bulk', json={'task_ids': ids, 'updates': {'completed': False}})
+        client.delete(f'/api/tasks/{Task.query.filter_by(title="Task 0").one().id}')
+
+        assert verify_counters(db.session) == {}
+        assert read_counters(db.session)[(True, 'Low')] == 1
+
+    def test_follow_set_based_and_raw_writes(self, app, mixed_tasks):
+        """Writes that bypass the ORM unit of work are counted too"""
+        db.session.execute(update(Task).values(completed=True))
+        db.session.execute(text("UPDATE tasks SET priority = NULL WHERE priority = 'Low'"))
+        db.session.execute(text("DELETE FROM tasks WHERE priority = 'Medium'"))
+        db.session.commit()
+
+        assert verify_counters(db.session) == {}
+        assert read_counters(db.session) == {(True, 'High'): 3, (True, ''): 1}
+
+    def test_rollback_discards_changes(self, app, mixed_tasks):
+        """Counter updates share the writing transaction"""
+        db.session.add(Task(title='Uncommitted', priority='Low'))
+        db.session.flush()
+        db.session.rollback()
+        assert read_counters(db.session)[(False, 'Low')] == 1
+
+    def test_verify_and_rebuild(self, app, mixed_tasks):
+        """Drift is reported per state and repaired by a rebuild"""
+        db.session.execute(update(TaskCounter).values(task_count=TaskCounter.task_count + 5))
+        db.session.commit()
+
+        drift = verify_counters(db.session)
+        assert drift[(False, 'High')] == (7, 2)
+        assert len(drift) == 4
+
+        rebuild_counters(db.session)
+        db.session.commit()
+        assert verify_counters(db.session) == {}
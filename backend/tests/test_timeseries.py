@@ -0,0 +1,155 @@
+"""
+Tests for the task throughput time series and its hourly rollups
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, select, update
+from app import db
+from app.models import Task, TaskActivity
+from app.timeseries import bucket_start, parse_timestamp, rebuild_activity
+
+
+@pytest.fixture
+def dated_tasks(app):
+    """Tasks created and completed at known times"""
+    layout = [
+        (datetime(2026, 10, 5, 9, 15), datetime(2026, 10, 6, 14, 0)),
+        (datetime(2026, 10, 5, 9, 45), None),
+        (datetime(2026, 10, 5, 23, 59), datetime(2026, 10, 13, 8, 30)),
+        (datetime(2026, 10, 12, 0, 0), None),
+    ]
+    for i, (created_at, completed_at) in enumerate(layout):
+        db.session.add(Task(
+            title=f'Task {i}', created_at=created_at,
+            completed=completed_at is not None, completed_at=completed_at
+        ))
+    db.session.commit()
+
+
+def _activity(session):
+    """Non-empty rollup rows as {hour: (created, completed)}"""
+    rows = session.execute(select(TaskActivity)).scalars()
+    return {
+        row.bucket_start: (row.created_count, row.completed_count)
+        for row in rows if row.created_count or row.completed_count
+    }
+
+
+def _series(client, query):
+    response = client.get(f'/api/tasks/stats/timeseries?{query}')
+    assert response.status_code == 200
+    return json.loads(response.data)['timeseries']
+
+
+class TestTimeseriesEndpoint:
+    """Test GET /api/tasks/stats/timeseries"""
+
+    def test_daily(self, client, dated_tasks):
+        """Days are dense and inclusive of 'to'"""
+        series = _series(client, 'bucket=day&from=2026-10-05&to=2026-10-07')
+
+        assert series['from'] == '2026-10-05T00:00:00'
+        assert series['to'] == '2026-10-08T00:00:00'
+        assert series['points'] == [
+            {'start': '2026-10-05T00:00:00', 'created': 3, 'completed': 0},
+            {'start': '2026-10-06T00:00:00', 'created': 0, 'completed': 1},
+            {'start': '2026-10-07T00:00:00', 'created': 0, 'completed': 0},
+        ]
+        assert series['totals'] == {'created': 3, 'completed': 1}
+
+    def test_hourly_and_weekly(self, client, dated_tasks):
+        """Hour and Monday-based week buckets sum the same rollups"""
+        hours = _series(client, 'bucket=hour&from=2026-10-05T09:00&to=2026-10-05T10:00')
+        assert [p['created'] for p in hours['points']] == [2, 0]
+
+        weeks = _series(client, 'bucket=week&from=2026-10-07&to=2026-10-14')
+        assert [(p['start'], p['created'], p['completed']) for p in weeks['points']] == [
+            ('2026-10-05T00:00:00', 3, 1),
+            ('2026-10-12T00:00:00', 1, 1),
+        ]
+
+    def test_default_range(self, client, app):
+        """Without 'from', the last 30 buckets up to now are returned"""
+        series = _series(client, '')
+        assert series['bucket'] == 'day'
+        assert len(series['points']) == 30
+
+    @pytest.mark.parametrize('query, code', [
+        ('bucket=month', 'INVALID_BUCKET'),
+        ('from=yesterday', 'INVALID_RANGE'),
+        ('from=2026-10-05&to=2026-10-01', 'INVALID_RANGE'),
+        ('bucket=hour&from=2020-01-01&to=2026-01-01', 'INVALID_RANGE'),
+    ])
+    def test_invalid(self, client, query, code):
+        """Bad buckets and ranges are rejected"""
+        response = client.get(f'/api/tasks/stats/timeseries?{query}')
+        assert response.status_code == 400
+        assert json.loads(response.data)['error']['code'] == code
+
+    def test_independent_of_task_count(self, client, dated_tasks):
+        """The series is read from rollups only"""
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            _series(client, 'bucket=week&from=2026-10-01&to=2026-10-31')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+        assert statements
+        assert not [s for s in statements if 'FROM tasks' in s]
+
+
+class TestActivityRollups:
+    """Test the trigger-maintained task_activity table"""
+
+    def test_follow_writes(self, client, dated_tasks):
+        """Completing, uncompleting and deleting move tasks between hours"""
+        pending = Task.query.filter_by(title='Task 1').one()
+        done = Task.query.filter_by(title='Task 0').one()
+        client.put(f'/api/tasks/{pending.id}', json={'completed': True})
+        client.put(f'/api/tasks/{done.id}', json={'completed': False})
+        client.delete(f'/api/tasks/{Task.query.filter_by(title="Task 3").one().id}')
+
+        activity = _activity(db.session)
+        assert activity[datetime(2026, 10, 5, 9)] == (2, 0)
+        assert datetime(2026, 10, 6, 14) not in activity
+        assert datetime(2026, 10, 12, 0) not in activity
+        assert sum(completed for _, completed in activity.values()) == 2
+
+    def test_set_based_update(self, app, dated_tasks):
+        """Writes that bypass the ORM unit of work are rolled up too"""
+        db.session.execute(update(Task).values(created_at=datetime(2026, 10, 20, 7, 5)))
+        db.session.commit()
+        assert _activity(db.session)[datetime(2026, 10, 20, 7)] == (4, 0)
+
+    def test_rebuild_matches_triggers(self, app, dated_tasks):
+        """A backfill from tasks reproduces the maintained rollups"""
+        maintained = _activity(db.session)
+        db.session.execute(update(TaskActivity).values(created_count=99))
+
+        assert rebuild_activity(db.session) == len(maintained)
+        db.session.commit()
+        assert _activity(db.session) == maintained
+
+
+class TestBuckets:
+    """Test bucket helpers"""
+
+    def test_bucket_start(self):
+        """Timestamps truncate to their hour, day or Monday"""
+        moment = datetime(2026, 10, 18, 13, 45, 12)
+        assert bucket_start(moment, 'hour') == datetime(2026, 10, 18, 13)
+        assert bucket_start(moment, 'day') == datetime(2026, 10, 18)
+        assert bucket_start(moment, 'week') == datetime(2026, 10, 12)
+
+    def test_parse_timestamp(self):
+        """Aware timestamps are converted to naive UTC"""
+        assert parse_timestamp('2026-10-18T12:00:00+02:00') == datetime(2026, 10, 18, 10)
+        assert parse_timestamp('') is None
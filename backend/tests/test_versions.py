@@ -0,0 +1,108 @@
+"""
+Tests for optimistic concurrency control with the task version column
+"""
+
+import json
+
+import pytest
+from app import db
+from app.models import Task
+from app.stats import verify_counters
+
+
+@pytest.fixture
+def task_ids(app):
+    """Ids of three fresh tasks"""
+    db.session.add_all(Task(title=f'Task {i}') for i in range(3))
+    db.session.commit()
+    return [task.id for task in Task.query.order_by(Task.id)]
+
+
+def _task(response):
+    return json.loads(response.data)['task']
+
+
+class TestTaskVersion:
+    """Test version on single-task updates"""
+
+    def test_every_update_increments(self, client, task_ids):
+        """New tasks start at 1 and PUT, PATCH and bulk updates bump it"""
+        task_id = task_ids[0]
+        assert _task(client.get(f'/api/tasks/{task_id}'))['version'] == 1
+        assert _task(client.put(f'/api/tasks/{task_id}', json={'title': 'A'}))['version'] == 2
+        assert _task(client.patch(f'/api/tasks/{task_id}', json={'title': 'B'}))['version'] == 3
+
+        client.put('/api/tasks/bulk', json={'task_ids': [task_id], 'updates': {'priority': 'Low'}})
+        assert Task.query.get(task_id).version == 4
+
+    @pytest.mark.parametrize('method', ['put', 'patch'])
+    def test_conflict(self, client, task_ids, method):
+        """Two editors starting from one version: the second gets a 409"""
+        send = getattr(client, method)
+        task_id = task_ids[0]
+        first = send(f'/api/tasks/{task_id}', json={'title': 'Mine', 'version': 1})
+        assert first.status_code == 200
+
+        second = send(f'/api/tasks/{task_id}', json={'title': 'Theirs', 'version': 1})
+        assert second.status_code == 409
+        error = json.loads(second.data)['error']
+        assert error['code'] == 'VERSION_CONFLICT'
+        assert error['details']['task'] == _task(first)
+        assert second.headers['ETag'] == first.headers['ETag']
+        assert Task.query.get(task_id).title == 'Mine'
+
+    def test_versioned_completion(self, client, task_ids):
+        """A versioned PATCH applies the completion transition"""
+        task = _task(client.patch(f'/api/tasks/{task_ids[0]}', json={'completed': True, 'version': 1}))
+        assert task['version'] == 2 and task['completed_at'] is not None
+        assert verify_counters(db.session) == {}
+
+    def test_missing_task_is_not_a_conflict(self, client, task_ids):
+        """A versioned update of a missing task is still a 404"""
+        response = client.patch('/api/tasks/9999', json={'title': 'X', 'version': 1})
+        assert response.status_code == 404
+
+    @pytest.mark.parametrize('version', [0, '1', True, 1.5])
+    def test_invalid_version(self, client, task_ids, version):
+        """Versions must be positive integers"""
+        response = client.put(f'/api/tasks/{task_ids[0]}', json={'version': version})
+        assert response.status_code == 422
+        assert 'version' in json.loads(response.data)['error']['details']
+
+
+class TestBulkVersions:
+    """Test versions on PUT /api/tasks/bulk"""
+
+    def test_partial_conflict(self, client, task_ids):
+        """Tasks whose version moved on are reported; the rest are updated"""
+        client.put(f'/api/tasks/{task_ids[1]}', json={'title': 'Edited'})
+
+        response = client.put('/api/tasks/bulk', json={
+            'task_ids': task_ids,
+            'updates': {'priority': 'High'},
+            'versions': {str(task_ids[0]): 1, str(task_ids[1]): 1}
+        })
+        assert response.status_code == 409
+        details = json.loads(response.data)['error']['details']
+        assert details['updated'] == [task_ids[0], task_ids[2]]
+        assert [task['id'] for task in details['conflicts']] == [task_ids[1]]
+        assert details['conflicts'][0]['version'] == 2
+
+        priorities = [Task.query.get(task_id).priority for task_id in task_ids]
+        assert priorities == ['High', 'Medium', 'High']
+
+    def test_matching_versions(self, client, task_ids):
+        """Matching versions update normally"""
+        response = client.put('/api/tasks/bulk', json={
+            'task_ids': task_ids, 'updates': {'completed': True},
+            'versions': {str(task_id): 1 for task_id in task_ids}
+        })
+        assert response.status_code == 200
+        assert [task['version'] for task in json.loads(response.data)['tasks']] == [2, 2, 2]
+
+    def test_invalid_versions(self, client, task_ids):
+        """versions must map ids to integers"""
+        response = client.put('/api/tasks/bulk', json={
+            'task_ids': task_ids, 'updates': {'completed': True}, 'versions': {'one': 1}
+        })
+        assert response.status_code == 400
@@ -0,0 +1,98 @@
+"""
+Tests for the group-commit write pipeline
+"""
+
+import json
+import threading
+
+import pytest
+from app import db
+from app.models import Task
+from app.stats import verify_counters
+
+
+@pytest.fixture
+def pipeline_app(make_app, tmp_path):
+    """Application on a SQLite file with the write pipeline enabled"""
+    app = make_app(
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path / "pipeline.db"}',
+        WRITE_PIPELINE_ENABLED=True,
+        WRITE_PIPELINE_MAX_DELAY=0.05
+    )
+    with app.app_context():
+        db.create_all()
+        yield app
+        app.extensions['task_writer'].stop()
+        db.drop_all()
+
+
+@pytest.fixture
+def writer(pipeline_app):
+    return pipeline_app.extensions['task_writer']
+
+
+def _create(title):
+    """A write that inserts one task and returns its id"""
+    def write(session):
+        task = Task(title=title)
+        session.add(task)
+        session.flush()
+        return task.id
+    return write
+
+
+class TestGroupCommitWriter:
+    """Test GroupCommitWriter"""
+
+    def test_merges_concurrent_writes(self, writer):
+        """Writes arriving together share one transaction"""
+        results = []
+        threads = [
+            threading.Thread(target=lambda i=i: results.append(writer.run(_create(f'Task {i}'))))
+            for i in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(results) == list(range(1, 21))
+        assert writer.writes == 20
+        assert writer.batches < 20
+        assert Task.query.count() == 20
+        assert verify_counters(db.session) == {}
+
+    def test_failure_is_isolated(self, writer):
+        """A failing write is reported to its caller only"""
+        def fail(session):
+            raise ValueError('bad write')
+
+        futures = [writer.submit(_create('Before')), writer.submit(fail),
+                   writer.submit(_create('After'))]
+
+        with pytest.raises(ValueError):
+            futures[1].result(5)
+        assert futures[0].result(5) and futures[2].result(5)
+        assert {task.title for task in Task.query} == {'Before', 'After'}
+
+
+class TestPipelinedEndpoints:
+    """Test the task endpoints with WRITE_PIPELINE_ENABLED"""
+
+    def test_create_update_delete(self, pipeline_app, writer):
+        """Single-task writes go through the writer thread"""
+        client = pipeline_app.test_client()
+
+        response = client.post('/api/tasks', json={'title': 'Piped', 'completed': True})
+        assert response.status_code == 201
+        task = json.loads(response.data)['task']
+        assert task['completed_at'] is not None
+
+        response = client.put(f'/api/tasks/{task["id"]}', json={'completed': False})
+        assert json.loads(response.data)['task']['completed_at'] is None
+        assert response.headers['ETag']
+
+        assert client.delete(f'/api/tasks/{task["id"]}').status_code == 204
+        assert client.delete(f'/api/tasks/{task["id"]}').status_code == 404
+        # The second DELETE finds out the task is gone in the writer too
+        assert writer.writes == 4